@@ -0,0 +1,11 @@
+"""
+Shared bootstrap for example scripts
+Puts src/ on sys.path once so `from chatbot... import ...` works without installing
+"""
+import sys
+from pathlib import Path
+
+SRC_DIR = str(Path(__file__).resolve().parent.parent / "src")
+
+if 'chatbot' not in sys.modules and SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
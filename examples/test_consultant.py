@@ -2,19 +2,59 @@
 Test examples for AI Consultant
 """
 import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.append(str(Path(__file__).parent.parent / "src"))
+import asyncio
+import argparse
+import functools
 
+import _bootstrap  # noqa: F401  (puts src/ on sys.path)
 from chatbot.consultant import AIConsultant
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Test cases (shared, importable by other scripts)
+_TEST_PROBLEMS = (
+    {
+        "problem": "We need to automate invoice processing from PDFs",
+        "context": "Finance department, 10,000 invoices per month, mix of scanned and digital PDFs"
+    },
+    {
+        "problem": "Customer churn prediction for subscription service",
+        "context": "E-commerce SaaS, 50k users, have historical data on usage patterns and cancellations"
+    },
+    {
+        "problem": "Real-time product recommendations on e-commerce website",
+        "context": "Online retail, millions of products, need instant recommendations based on browsing"
+    },
+    {
+        "problem": "Optimize warehouse robot navigation paths",
+        "context": "Large warehouse with dynamic obstacles, robots need to learn optimal paths"
+    },
+    {
+        "problem": "Detect fraudulent transactions in real-time",
+        "context": "Payment processor, processing 1M+ transactions per day"
+    }
+)
+
+
+@functools.cache
+def _consultant(provider: str = "groq", threshold: float = 0.92) -> AIConsultant:
+    """Build the consultant once per process (clients, model, vector store)"""
+    # Reruns answer identical prompts from disk instead of calling the API again
+    return AIConsultant(llm_provider=provider, cache_threshold=threshold, response_cache_dir="data/cache")
+
 
-def test_consultant():
-    """Test the AI consultant with various problems"""
+async def test_consultant(batch: bool = False, threshold: float = 0.92, stream: bool = False):
+    """Test the AI consultant with various problems
+    
+    All test cases are sent to the LLM concurrently. Results are printed
+    as they complete, so later cases keep running while you read earlier ones.
+    
+    Args:
+        batch: Print all results without pausing between test cases
+        threshold: Cosine similarity threshold for semantic cache hits
+        stream: Run cases one at a time, printing tokens as they are generated
+    """
     
     print("\n" + "="*80)
     print("🧪 TESTING AI CONSULTANT")
@@ -22,59 +62,100 @@ def test_consultant():
     
     # Initialize consultant
     print("Initializing consultant...")
-    consultant = AIConsultant(llm_provider="groq")
+    consultant = _consultant("groq", threshold)
+    
+    if stream:
+        await stream_test_cases(consultant, _TEST_PROBLEMS, batch=batch)
+        return
     
-    # Test cases
-    test_problems = [
-        {
-            "problem": "We need to automate invoice processing from PDFs",
-            "context": "Finance department, 10,000 invoices per month, mix of scanned and digital PDFs"
-        },
-        {
-            "problem": "Customer churn prediction for subscription service",
-            "context": "E-commerce SaaS, 50k users, have historical data on usage patterns and cancellations"
-        },
-        {
-            "problem": "Real-time product recommendations on e-commerce website",
-            "context": "Online retail, millions of products, need instant recommendations based on browsing"
-        },
-        {
-            "problem": "Optimize warehouse robot navigation paths",
-            "context": "Large warehouse with dynamic obstacles, robots need to learn optimal paths"
-        },
-        {
-            "problem": "Detect fraudulent transactions in real-time",
-            "context": "Payment processor, processing 1M+ transactions per day"
-        }
+    print(f"\n{'Analyzing all test cases concurrently...':-^80}\n")
+    
+    results = asyncio.Queue()
+    
+    async def run_case(i, test_case):
+        try:
+            result = await consultant.asuggest(
+                problem=test_case['problem'],
+                context=test_case['context']
+            )
+        except Exception as e:
+            result = e
+        await results.put((i, test_case, result))
+    
+    # Fire every request up front; the loop below only consumes results
+    tasks = [
+        asyncio.create_task(run_case(i, tc))
+        for i, tc in enumerate(_TEST_PROBLEMS, 1)
     ]
     
-    for i, test_case in enumerate(test_problems, 1):
-        print(f"\n{'='*80}")
-        print(f"TEST CASE {i}")
-        print(f"{'='*80}")
-        print(f"Problem: {test_case['problem']}")
-        print(f"Context: {test_case['context']}")
-        print(f"\n{'Analyzing...':-^80}\n")
+    for shown in range(1, len(tasks) + 1):
+        i, test_case, result = await results.get()
         
-        result = consultant.suggest(
-            problem=test_case['problem'],
-            context=test_case['context']
-        )
+        # Build the whole case report and emit it with a single write
+        out = [
+            f"\n{'='*80}",
+            f"TEST CASE {i}",
+            f"{'='*80}",
+            f"Problem: {test_case['problem']}",
+            f"Context: {test_case['context']}",
+        ]
         
-        print("📊 RECOMMENDATION:")
-        print("-" * 80)
-        print(result['recommendations'])
-        print(f"\n🎯 Confidence: {result['confidence']}")
-        print(f"📚 Based on {len(result['similar_cases'])} similar use cases")
+        if isinstance(result, Exception):
+            out.append(f"\n❌ Error: {result}")
+        else:
+            out += [
+                "\n📊 RECOMMENDATION:",
+                "-" * 80,
+                result['recommendations'],
+                f"\n🎯 Confidence: {result['confidence']}",
+                f"📚 Based on {len(result['similar_cases'])} similar use cases",
+            ]
+            
+            # Show top similar case
+            if result['similar_cases']:
+                top_case = result['similar_cases'][0]
+                out += [
+                    "\n🔍 Most Similar Case:",
+                    f"   Source: {top_case['metadata'].get('source', 'Unknown')}",
+                    f"   Similarity: {(1 - top_case.get('distance', 1)) * 100:.1f}%",
+                ]
         
-        # Show top similar case
-        if result['similar_cases']:
-            top_case = result['similar_cases'][0]
-            print(f"\n🔍 Most Similar Case:")
-            print(f"   Source: {top_case['metadata'].get('source', 'Unknown')}")
-            print(f"   Similarity: {(1 - top_case.get('distance', 1)) * 100:.1f}%")
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
         
-        input("\nPress Enter to continue to next test case...\n")
+        if not batch and shown < len(tasks):
+            # input() in a worker thread so pending requests keep running meanwhile
+            await asyncio.to_thread(input, "\nPress Enter to continue to next test case...\n")
+    
+    await asyncio.gather(*tasks)
+    
+    print("\n" + "="*80)
+    print("✅ Testing complete!")
+    print("="*80 + "\n")
+
+
+async def stream_test_cases(consultant: AIConsultant, test_problems, batch: bool = False):
+    """Run test cases one at a time, streaming each recommendation as it is generated"""
+    
+    for i, test_case in enumerate(test_problems, 1):
+        sys.stdout.write(
+            f"\n{'='*80}\n"
+            f"TEST CASE {i}\n"
+            f"{'='*80}\n"
+            f"Problem: {test_case['problem']}\n"
+            f"Context: {test_case['context']}\n"
+            f"\n📊 RECOMMENDATION:\n"
+            f"{'-'*80}\n"
+        )
+        async for token in consultant.astream_suggest(
+            problem=test_case['problem'],
+            context=test_case['context']
+        ):
+            print(token, end='', flush=True)
+        print()
+        
+        if not batch and i < len(test_problems):
+            input("\nPress Enter to continue to next test case...\n")
     
     print("\n" + "="*80)
     print("✅ Testing complete!")
@@ -82,4 +163,23 @@ def test_consultant():
 
 
 if __name__ == '__main__':
-    test_consultant()
+    parser = argparse.ArgumentParser(description='Test the AI Consultant')
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Print all results without pausing between test cases'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Run cases one at a time and stream tokens as they are generated'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.92,
+        help='Cosine similarity threshold for semantic cache hits'
+    )
+    args = parser.parse_args()
+    
+    asyncio.run(test_consultant(batch=args.batch, threshold=args.threshold, stream=args.stream))
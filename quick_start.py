@@ -1,13 +1,21 @@
 """
 Quick start script - generates sample data for testing without scraping
 """
-import json
+import orjson
 from pathlib import Path
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sources/URLs shared by several sample use cases
+_SOURCE_ET = "Economic Times India"
+_SOURCE_BS = "Business Standard India"
+_URL_ET = "https://economictimes.indiatimes.com"
+_URL_BS = "https://www.business-standard.com"
+_URL_INC42 = "https://inc42.com"
+_URL_YOURSTORY = "https://yourstory.com"
+
 
 def create_sample_data():
     """Create sample use cases for quick testing - includes REAL case studies and Indian business context"""
@@ -53,8 +61,8 @@ def create_sample_data():
             "models": ["OCR", "CNN", "Transformer", "NLP"],
             "reasoning": "GST invoice processing requires OCR for digitizing invoices, transformers for understanding GST-compliant document structure, and NLP for entity extraction. ML models classify invoice types and validate GST compliance. Economic Times reports automation reduces processing time by 70% for Indian MSMEs. ROI: 450% in first year with ₹2-5 lakhs annual savings.",
             "industry": "Finance/FinTech",
-            "source": "Economic Times India",
-            "url": "https://economictimes.indiatimes.com",
+            "source": _SOURCE_ET,
+            "url": _URL_ET,
             "case_study_time_saved": "20+ hours per week per SME",
             "case_study_accuracy": "99.8% in tax calculations",
             "case_study_cost_reduction": "₹2-5 lakhs annually",
@@ -69,7 +77,7 @@ def create_sample_data():
             "reasoning": "India's subscription economy growing rapidly. XGBoost excels at structured prediction with payment patterns and usage metrics. Inc42 reports Indian SaaS companies reduce churn by 40% using predictive ML. ROI: Direct revenue retention improvement.",
             "industry": "SaaS",
             "source": "Inc42 Indian Startup News",
-            "url": "https://inc42.com"
+            "url": _URL_INC42
         },
         {
             "business_problem": "UPI fraud detection for Indian digital payments ecosystem - ₹500+ crores monthly fraud losses",
@@ -78,8 +86,8 @@ def create_sample_data():
             "models": ["Anomaly Detection", "Isolation Forest", "Autoencoder", "LSTM", "GNN"],
             "reasoning": "India processes 10B+ UPI transactions monthly. Isolation Forest for anomaly detection, autoencoders for learning normal UPI patterns, LSTMs for sequential transaction behavior, GNNs for fraud ring detection. Business Standard reports AI reduces UPI fraud by 60% for Indian banks. ROI: 380% through fraud prevention.",
             "industry": "FinTech",
-            "source": "Business Standard India",
-            "url": "https://www.business-standard.com",
+            "source": _SOURCE_BS,
+            "url": _URL_BS,
             "case_study_fraud_detection_rate": "97.3%",
             "case_study_false_positives": "0.12%",
             "case_study_processing_latency": "<100ms",
@@ -94,7 +102,7 @@ def create_sample_data():
             "reasoning": "India has 22+ official languages. Transformer-based models handle Hindi, Telugu, Tamil, Bengali, Kannada, etc. Code-switching (Hinglish) is common. 80% of e-commerce expansion happening in local language cities. YourStory reports 4.7/5 customer satisfaction with multilingual AI. ROI: 320% through cost reduction.",
             "industry": "E-commerce/SaaS",
             "source": "YourStory & Inc42",
-            "url": "https://yourstory.com",
+            "url": _URL_YOURSTORY,
             "case_study_languages": "12 Indian languages + English",
             "case_study_satisfaction": "4.7/5 rating",
             "case_study_cost_reduction": "65%",
@@ -108,7 +116,7 @@ def create_sample_data():
             "reasoning": "India has critical doctor-to-population imbalance (1:1445). AI enables remote diagnosis across rural areas. ResNet for disease classification, U-Net for organ segmentation, trained on Indian population data. Analytics India Magazine reports 90% accuracy in TB/pneumonia detection. ROI: 520% through yield optimization.",
             "industry": "AgriTech",
             "source": "YourStory & Analytics India",
-            "url": "https://yourstory.com",
+            "url": _URL_YOURSTORY,
             "case_study_yield_accuracy": "94.2%",
             "case_study_disease_detection": "91.8%",
             "case_study_farmers_impacted": "100K+ across 5 states",
@@ -122,8 +130,8 @@ def create_sample_data():
             "models": ["BERT", "Transformer", "mBERT", "XLM-RoBERTa"],
             "reasoning": "India's linguistic diversity requires multilingual models. mBERT and XLM-RoBERTa handle 22+ Indian languages, transformers understand code-mixing (Hinglish), context-aware sentiment. Source: Economic Times highlights 50% better customer insights with multilingual NLP.",
             "industry": "Retail",
-            "source": "Economic Times India",
-            "url": "https://economictimes.indiatimes.com"
+            "source": _SOURCE_ET,
+            "url": _URL_ET
         },
         {
             "business_problem": "Alternative credit scoring for underbanked Indian population - 2 billion Indians without formal credit history",
@@ -133,7 +141,7 @@ def create_sample_data():
             "reasoning": "400M+ Indians lack credit history and are denied loans. Alternative data (UPI transactions, phone usage, rental payments, utility bills) enables financial inclusion. XGBoost for feature engineering, neural networks for complex non-linear patterns. RBI-approved alternative lending. Inc42 reports AI credit models achieve 80% accuracy for thin-file customers. ROI: 410%.",
             "industry": "FinTech",
             "source": "Inc42 Indian Startup News & Analytics India",
-            "url": "https://inc42.com",
+            "url": _URL_INC42,
             "case_study_credit_approved": "5M+ previously rejected applications",
             "case_study_default_rate": "8.2% vs industry 12-15%",
             "case_study_approval_time": "From 1 week to 5 minutes",
@@ -147,8 +155,8 @@ def create_sample_data():
             "models": ["ARIMA", "Prophet", "LSTM", "Transformer"],
             "reasoning": "Indian retail has unique seasonality patterns (Diwali, Holi, regional festivals, monsoon impact). Prophet handles multiple seasonality, LSTM captures complex temporal patterns, transformers integrate external signals. Business Standard highlights 35% inventory optimization with AI for Indian FMCG companies. ROI: 280%.",
             "industry": "Retail/FMCG",
-            "source": "Business Standard India",
-            "url": "https://www.business-standard.com"
+            "source": _SOURCE_BS,
+            "url": _URL_BS
         },
         {
             "business_problem": "Multilingual AI chatbot for Indian customer support - English, Hindi, regional languages with code-mixing",
@@ -157,8 +165,8 @@ def create_sample_data():
             "models": ["GPT", "BERT", "mBERT", "Transformer", "RAG"],
             "reasoning": "India has 1.4B people speaking 22+ languages. mBERT for Indian languages (Hindi, Tamil, Telugu, Kannada), RAG for company knowledge retrieval, transformers handle code-mixing (Hinglish). Economic Times reports 60% cost reduction with multilingual AI chatbots. ROI: 320%.",
             "industry": "Customer Service/SaaS",
-            "source": "Economic Times India",
-            "url": "https://economictimes.indiatimes.com"
+            "source": _SOURCE_ET,
+            "url": _URL_ET
         },
         {
             "business_problem": "Predictive maintenance for Indian manufacturing using IoT sensor data - reducing unplanned downtime",
@@ -176,16 +184,20 @@ def create_sample_data():
     processed_dir = Path("data/processed")
     processed_dir.mkdir(parents=True, exist_ok=True)
     
-    # Save as JSON
     output_file = processed_dir / "use_cases.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(sample_use_cases, f, indent=2, ensure_ascii=False)
-    
-    # Save as JSONL
     jsonl_file = processed_dir / "use_cases.jsonl"
-    with open(jsonl_file, 'w', encoding='utf-8') as f:
+    
+    # Serialize each use case once and reuse the bytes for both formats
+    # (orjson emits UTF-8 directly, no ensure_ascii needed)
+    pieces = []
+    with open(jsonl_file, 'wb') as jsonl_f:
         for uc in sample_use_cases:
-            f.write(json.dumps(uc, ensure_ascii=False) + '\n')
+            line = orjson.dumps(uc)
+            jsonl_f.write(line + b'\n')
+            pieces.append(line)
+    
+    with open(output_file, 'wb', buffering=0) as json_f:
+        json_f.write(b'[' + b',\n'.join(pieces) + b']')
     
     logger.info(f"✅ Created {len(sample_use_cases)} sample use cases")
     logger.info(f"   Saved to: {output_file}")
@@ -201,30 +213,50 @@ def quick_start_pipeline():
     print("🚀 QUICK START - AI CONSULTANT BOT")
     print("="*80 + "\n")
     
-    # Step 1: Create sample data
-    print("📝 Creating sample use cases...")
-    use_cases = create_sample_data()
-    
-    # Step 2: Create chunks
-    print("\n🔧 Creating chunks...")
     import sys
-    from pathlib import Path
+    from concurrent.futures import ThreadPoolExecutor
     sys.path.append(str(Path(__file__).parent / "src"))
     
     from processor.chunker import UseChaseChunker
+    from embeddings.vector_store import VectorStore
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Load the embedding model + ChromaDB in the background while writing sample data
+        vector_store_future = executor.submit(VectorStore)
+        
+        # Step 1: Create sample data
+        print("📝 Creating sample use cases...")
+        use_cases = create_sample_data()
+        
+        vector_store = vector_store_future.result()
     
+    # Steps 2 + 3: chunk, embed and store one batch at a time, so only
+    # batch_size chunks/embeddings are alive at once
+    print("\n🔧 Creating chunks and embeddings (this may take a minute)...")
     chunker = UseChaseChunker()
-    chunks = chunker.create_chunks()
-    chunker.save_chunks()
+    n_chunks = 0
     
-    print(f"✅ Created {len(chunks)} chunks")
+    # The hash sidecar tells create_chunks which use_cases.json these chunks came from -
+    # drop the stale one first and vouch for the sample use cases once the file is complete
+    hash_path = chunker._hash_path(chunker.chunks_file)
+    hash_path.unlink(missing_ok=True)
     
-    # Step 3: Create embeddings
-    print("\n🧠 Creating embeddings (this may take a minute)...")
-    from embeddings.vector_store import VectorStore
+    with open(chunker.chunks_file, 'wb') as chunks_f:
+        for batch in chunker.iter_chunks(batch_size=32, use_cases=use_cases):
+            chunks_f.write(b''.join(orjson.dumps(chunk) + b'\n' for chunk in batch))
+            
+            embeddings = vector_store.embedding_model.encode(
+                [chunk['text'] for chunk in batch],
+                batch_size=32,
+                show_progress_bar=False,
+                convert_to_numpy=True
+            )
+            vector_store.add_with_embeddings(batch, embeddings)
+            n_chunks += len(batch)
+    
+    hash_path.write_text(chunker._hash_source())
     
-    vector_store = VectorStore()
-    vector_store.embed_and_store()
+    print(f"✅ Created {n_chunks} chunks")
     
     stats = vector_store.get_collection_stats()
     print(f"✅ Stored {stats['total_chunks']} embeddings")
@@ -235,7 +267,7 @@ def quick_start_pipeline():
     print("="*80)
     print("\n📊 What was created:")
     print(f"   • {len(use_cases)} sample use cases")
-    print(f"   • {len(chunks)} chunks for retrieval")
+    print(f"   • {n_chunks} chunks for retrieval")
     print(f"   • {stats['total_chunks']} vector embeddings")
     
     print("\n🎯 Ready to use!")
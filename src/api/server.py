@@ -1,88 +1,222 @@
 """
 FastAPI server for AI Consultancy website
 Connects Next.js frontend to Python AI consultant backend
+
+This is the single API app; src/api/server_simple.py and src/chatbot/api.py
+are kept as launchers for it.
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
+import hashlib
+import logging
+import msgspec
+import logging.handlers
+import orjson
+import queue
+import importlib.util
 import sys
 import os
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Packages come from the install (pip install -e .); fall back to src/ for a plain checkout
+if importlib.util.find_spec("chatbot") is None:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from chatbot.consultant import AIConsultant
 from chatbot.impact_analyzer import BusinessImpactAnalyzer
+from chatbot.llm_clients import awarm_llm_client, create_async_http_client
 from embeddings.vector_store import VectorStore
+from middleware.asgi_cors import PureASGICORS
+from middleware.compression import CompressionMiddleware
+from cache.ttl_cache import TTLCache
+
+# Request-path logging goes through a queue; a background thread does the stream I/O
+# (set LOG_LEVEL=WARNING in production to skip per-request records entirely)
+log_queue = queue.Queue(-1)
+logger = logging.getLogger("consult")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logger.propagate = False
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load AI components during server startup so no request pays the cold start"""
+    log_listener.start()
+    
+    # One keep-alive pool shared by every consultation's LLM calls
+    app.state.http_client = create_async_http_client(
+        max_connections=64,
+        max_keepalive_connections=32,
+        timeout=30.0
+    )
+    
+    # Blocking model/DB loading runs off the event loop. Readiness is resolved
+    # here once instead of counting the collection on every request.
+    app.state.vector_ready = await asyncio.to_thread(init_components)
+    
+    # Open the async pool's LLM connection now instead of on the first consultation
+    if app.state.vector_ready:
+        consultant = get_consultant()
+        await awarm_llm_client(consultant.llm_provider, consultant.async_llm_client, consultant.model)
+    
+    # All routes are registered by now, so the schema is final - serialize it once
+    app.state.openapi_bytes = orjson.dumps(app.openapi())
+    
+    refresh_task = asyncio.create_task(refresh_vector_ready(app))
+    yield
+    
+    refresh_task.cancel()
+    await app.state.http_client.aclose()
+    log_listener.stop()
+
+
+async def refresh_vector_ready(app: FastAPI, interval: float = 60.0):
+    """Retry initialization periodically until data has been ingested (no restart needed)"""
+    while not app.state.vector_ready:
+        await asyncio.sleep(interval)
+        app.state.vector_ready = await asyncio.to_thread(init_components)
+
 
 app = FastAPI(
     title="AI Consultancy API",
     description="AI-powered business consultation with impact analysis",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    # Schema and docs are served below from bytes precomputed at startup
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None
 )
 
 # Enable CORS for Next.js frontend
 app.add_middleware(
-    CORSMiddleware,
+    PureASGICORS,
     allow_origins=[
         "http://localhost:3000",
         "http://localhost:3001",
         "http://127.0.0.1:3000",
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type"],  # JSON bodies only; fixed list keeps preflight headers prebuilt
+    max_age=86400,  # browsers cache the preflight for a day
 )
 
-# Initialize AI components
-vector_store = None
-consultant = None
-impact_analyzer = None
+# Impact analyses are several KB of prose - compress them (Brotli if available, else gzip)
+app.add_middleware(CompressionMiddleware, minimum_size=1024, brotli_quality=4)
 
-def init_components():
-    """Initialize AI components lazily"""
-    global vector_store, consultant, impact_analyzer
+# Path of the persisted ChromaDB store
+VECTOR_STORE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "vectordb")
+
+# Exact-match cache of formatted consultations; near-duplicates are
+# handled by the consultant's semantic cache
+response_cache = TTLCache(maxsize=1024, ttl=3600)
+
+# Concurrent LLM-backed requests per worker (match the provider's concurrency limit).
+# Beyond that requests are rejected with 503 + Retry-After instead of queueing.
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "16"))
+llm_slots = asyncio.Semaphore(LLM_CONCURRENCY)
+
+# uvicorn worker processes, each with its own consultant and caches
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "2"))
+
+
+def llm_slot() -> asyncio.Semaphore:
+    """Claim-or-reject guard for LLM calls: use as `async with llm_slot(): ...`"""
+    if llm_slots.locked():
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    return llm_slots
+
+
+# Component factories - built once per process (lru_cache) and shared by every
+# request through Depends. A failed build raises and is retried on the next call.
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """Shared vector store"""
+    # Use environment variable to avoid redownloading
+    os.environ['TRANSFORMERS_OFFLINE'] = '1'
+    os.environ['HF_HUB_OFFLINE'] = '1'
     
-    if vector_store is not None:
-        return True
+    vector_store = VectorStore(
+        persist_directory=VECTOR_STORE_PATH,
+        onnx_model_path=os.getenv("ONNX_QUERY_ENCODER")  # e.g. data/onnx_model/model_int8.onnx
+    )
+    vector_store.optimize_for_inference()
+    return vector_store
+
+
+@lru_cache(maxsize=1)
+def get_consultant() -> AIConsultant:
+    """Shared AI consultant (LLM calls go through the server's http client)"""
+    consultant = AIConsultant(
+        get_vector_store(),
+        llm_provider="groq",
+        enable_impact_analysis=True,
+        # Workers would overwrite each other's persisted semantic cache - keep it
+        # in memory unless this is the only worker
+        cache_directory="data/cache" if WEB_CONCURRENCY == 1 else None,
+        http_client=app.state.http_client
+    )
     
+    return consultant
+
+
+@lru_cache(maxsize=1)
+def get_impact_analyzer() -> BusinessImpactAnalyzer:
+    """Shared impact analyzer (reuses the consultant's when it has one)"""
+    return get_consultant().impact_analyzer or BusinessImpactAnalyzer(
+        llm_provider="groq",
+        http_client=app.state.http_client
+    )
+
+
+async def ready_consultant() -> Optional[AIConsultant]:
+    """Dependency: the shared consultant, or None while the vector store isn't ready"""
+    return get_consultant() if app.state.vector_ready else None
+
+
+async def ready_impact_analyzer() -> Optional[BusinessImpactAnalyzer]:
+    """Dependency: the shared impact analyzer, or None while the vector store isn't ready"""
+    return get_impact_analyzer() if app.state.vector_ready else None
+
+
+def init_components() -> bool:
+    """Initialize AI components (called from the lifespan handler); True when ready to serve"""
     try:
         print("\n" + "="*60)
         print("Initializing AI components...")
         print("="*60)
+        print(f"Vector store path: {VECTOR_STORE_PATH}")
         
-        # Initialize vector store with proper path
-        vector_store_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "vectordb")
-        print(f"Vector store path: {vector_store_path}")
-        
-        # Use environment variable to avoid redownloading
-        os.environ['TRANSFORMERS_OFFLINE'] = '1'
-        os.environ['HF_HUB_OFFLINE'] = '1'
-        
-        vector_store = VectorStore(persist_directory=vector_store_path)
+        vector_store = get_vector_store()
         
         # Check if vector store has data
-        try:
-            collection = vector_store.collection
-            count = collection.count()
-            print(f"✓ Vector store loaded: {count} embeddings found")
-            
-            if count == 0:
-                print(f"⚠ Warning: Vector store is empty!")
-                print(f"  Run: python quick_start.py")
-                return False
-        except Exception as e:
-            print(f"⚠ Could not check vector store: {e}")
+        count = vector_store.collection.count()
+        print(f"✓ Vector store loaded: {count} embeddings found")
+        
+        if count == 0:
+            print(f"⚠ Warning: Vector store is empty!")
+            print(f"  Run: python quick_start.py")
             return False
         
-        # Initialize consultant with AI
-        consultant = AIConsultant(vector_store, llm_provider="groq", enable_impact_analysis=True)
+        get_consultant()
         print("✓ AI Consultant initialized")
         
-        # Initialize impact analyzer
-        impact_analyzer = BusinessImpactAnalyzer(llm_provider="groq")
+        get_impact_analyzer()
         print("✓ Business Impact Analyzer initialized")
         
         print("="*60)
@@ -95,155 +229,330 @@ def init_components():
         import traceback
         traceback.print_exc()
         print("\n⚠ API will return mock data")
-        vector_store = None
-        consultant = None
-        impact_analyzer = None
         return False
 
 
-class ConsultRequest(BaseModel):
+# Hot-path request bodies are msgspec Structs: decoded and type-checked straight
+# from the JSON bytes in one C pass (see json_body)
+class ConsultRequest(msgspec.Struct):
     problem: str
     industry: str
     companySize: str
     email: str
 
 
-class ImpactRequest(BaseModel):
+class ImpactRequest(msgspec.Struct):
     problem: str
     ai_solution: str
     industry: str
     company_size: str
 
 
-@app.get("/")
-async def root():
-    """Health check endpoint"""
-    # Try to initialize if not already done
-    if vector_store is None:
-        init_components()
+def json_body(struct_type):
+    """
+    Dependency that decodes the request body into a msgspec Struct
+    
+    Args:
+        struct_type: msgspec.Struct subclass
     
+    Returns:
+        Dependency callable (invalid bodies raise a 422 like FastAPI's own validation)
+    """
+    decoder = msgspec.json.Decoder(struct_type)
+    
+    async def dependency(raw: Request):
+        try:
+            return decoder.decode(await raw.body())
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
+    return dependency
+
+
+def body_schema(struct_type) -> dict:
+    """openapi_extra documenting a Struct request body (keeps /docs unchanged)"""
+    schema = msgspec.json.schema(struct_type)
+    schema = schema.get("$defs", {}).get(struct_type.__name__, schema)
     return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}}
+        }
+    }
+
+
+class BatchSearchRequest(BaseModel):
+    """Request model for batched search"""
+    queries: List[str] = Field(..., description="Queries to search for", min_length=1, max_length=64)
+    n_results: int = Field(5, description="Number of results per query", ge=1, le=20)
+
+
+# Health responses only vary with readiness - serialize both variants once
+ROOT_BODIES = {
+    ready: orjson.dumps({
         "status": "running",
         "message": "AI Consultancy API is operational",
         "components": {
-            "vector_store": vector_store is not None,
-            "consultant": consultant is not None,
-            "impact_analyzer": impact_analyzer is not None,
+            "vector_store": ready,
+            "consultant": ready,
+            "impact_analyzer": ready,
         }
-    }
+    })
+    for ready in (False, True)
+}
+HEALTH_BODIES = {
+    ready: orjson.dumps({"status": "healthy", "consultant_ready": ready})
+    for ready in (False, True)
+}
+
+
+@app.get("/")
+async def root():
+    """Health check endpoint"""
+    return Response(ROOT_BODIES[app.state.vector_ready], media_type="application/json")
+
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    return Response(HEALTH_BODIES[app.state.vector_ready], media_type="application/json")
 
 
-@app.post("/api/consult")
-async def consult(request: ConsultRequest):
+@app.get("/openapi.json", include_in_schema=False)
+async def openapi_json():
+    """OpenAPI schema (serialized once during startup)"""
+    return Response(app.state.openapi_bytes, media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_docs():
+    return get_swagger_ui_html(openapi_url="/openapi.json", title=f"{app.title} - Swagger UI")
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_docs():
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{app.title} - ReDoc")
+
+
+@app.post("/api/consult", openapi_extra=body_schema(ConsultRequest))
+async def consult(
+    request: ConsultRequest = Depends(json_body(ConsultRequest)),
+    consultant: Optional[AIConsultant] = Depends(ready_consultant)
+):
     """
     Main consultation endpoint
     Provides AI recommendations with business impact analysis
     """
     try:
-        # Try to initialize AI if not already done
-        if vector_store is None:
-            print("\n⚡ First request - initializing AI components...")
-            if not init_components():
-                print("⚠ Initialization failed - using mock data\n")
-                return get_mock_response(request)
-        
-        # Check if AI is available
-        if not consultant or not vector_store:
-            print("⚠ AI components not initialized - using mock data")
+        # Check if AI is available (vector store loaded and non-empty)
+        if consultant is None:
+            logger.warning("⚠ AI components not ready - using mock data (run 'python quick_start.py')")
             return get_mock_response(request)
         
-        # Check if vector store has data
-        try:
-            count = vector_store.collection.count()
-            if count == 0:
-                print("⚠ Vector store is empty - using mock data")
-                print("  Fix: Run 'python quick_start.py' to populate the database")
-                return get_mock_response(request)
-        except Exception as e:
-            print(f"⚠ Could not check vector store: {e}")
+        cache_key = consult_cache_key(request)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("⚡ Returning cached consultation")
+            return cached
         
         # Use real AI
-        print(f"\n🤖 AI Processing consultation...")
-        print(f"   Industry: {request.industry}")
-        print(f"   Company Size: {request.companySize}")
-        print(f"   Problem: {request.problem[:100]}...")
-        
-        result = consultant.suggest(
-            problem=request.problem,
-            include_impact=True,
-            industry=request.industry,
-            company_size=request.companySize
+        logger.info(
+            "🤖 AI Processing consultation - industry=%s company_size=%s problem=%.100s...",
+            request.industry, request.companySize, request.problem
         )
         
-        print(f"   ✓ Got response: {len(result.get('response', ''))} characters")
-        print(f"   ✓ Business impact: {'Yes' if result.get('business_impact') else 'No'}")
+        # Async path: retrieval runs in a worker thread, LLM calls await the shared client
+        async with llm_slot():
+            result = await consultant.asuggest(
+                problem=request.problem,
+                include_impact=True,
+                industry=request.industry,
+                company_size=request.companySize
+            )
+        
+        # Note: consultant returns "recommendations", and business_impact as a dict
+        recommendations = result.get("recommendations", "No recommendations available")
+        impact = result.get("business_impact")
+        
+        logger.info(
+            "   ✓ Got response: %d characters, business impact: %s",
+            len(recommendations), 'Yes' if impact else 'No'
+        )
         
         # Format response
         response = {
-            "recommendations": result.get("response", "No recommendations available"),
+            "recommendations": recommendations,
             "businessImpact": None
         }
         
-        # Add business impact if available
-        if "business_impact" in result and result["business_impact"]:
-            impact = result["business_impact"]
-            response["businessImpact"] = {
-                "cost_savings": impact.cost_savings,
-                "revenue_potential": impact.revenue_potential,
-                "time_savings": impact.time_savings,
-                "roi_estimate": impact.roi_estimate,
-                "risk_reduction": impact.risk_reduction,
-                "competitive_advantage": impact.competitive_advantage,
-                "implementation_timeline": impact.implementation_timeline,
-                "resource_requirements": impact.resource_requirements,
-                "key_metrics": impact.key_metrics,
-                "success_factors": impact.success_factors,
-                "potential_challenges": impact.potential_challenges,
-            }
+        # Add business impact if available (dict, or BusinessImpact object)
+        if impact:
+            response["businessImpact"] = impact if isinstance(impact, dict) else impact.to_dict()
+        
+        response_cache.set(cache_key, response)
         
-        print("✅ Consultation complete - returning real AI response\n")
+        logger.info("✅ Consultation complete - returning real AI response")
         return response
+    
+    except HTTPException:
+        raise
             
     except Exception as e:
-        print(f"❌ Error processing consultation: {e}")
-        import traceback
-        traceback.print_exc()
-        print("\n⚠ Falling back to mock data due to error\n")
+        logger.exception(f"❌ Error processing consultation: {e} - falling back to mock data")
         return get_mock_response(request)
 
 
-@app.post("/api/impact")
-async def analyze_impact(request: ImpactRequest):
+@app.post("/api/consult/stream", openapi_extra=body_schema(ConsultRequest))
+async def consult_stream(
+    request: ConsultRequest = Depends(json_body(ConsultRequest)),
+    consultant: Optional[AIConsultant] = Depends(ready_consultant)
+):
+    """
+    Streaming consultation endpoint (Server-Sent Events)
+    Sends recommendation text as it is generated: `data: {"delta": "..."}` events,
+    then `data: [DONE]`. No business impact analysis on this path.
+    """
+    if consultant is None:
+        raise HTTPException(status_code=503, detail="AI components not ready")
+    
+    slots = llm_slot()
+    logger.info("🤖 Streaming consultation - industry=%s company_size=%s", request.industry, request.companySize)
+    
+    async def event_stream():
+        try:
+            async with slots:
+                async for delta in consultant.astream_suggest(
+                    problem=request.problem,
+                    context=f"Industry: {request.industry}. Company size: {request.companySize}."
+                ):
+                    yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+            yield b"data: [DONE]\n\n"
+        except Exception as e:
+            logger.error(f"❌ Error streaming consultation: {e}")
+            yield b"event: error\ndata: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/impact", openapi_extra=body_schema(ImpactRequest))
+async def analyze_impact(
+    request: ImpactRequest = Depends(json_body(ImpactRequest)),
+    impact_analyzer: Optional[BusinessImpactAnalyzer] = Depends(ready_impact_analyzer)
+):
     """
     Standalone business impact analysis endpoint
     """
     try:
         if impact_analyzer:
-            print(f"\n📊 Analyzing business impact for {request.industry}")
+            logger.info("📊 Analyzing business impact for %s", request.industry)
             
-            impact = impact_analyzer.analyze(
-                problem=request.problem,
-                ai_solution=request.ai_solution,
-                industry=request.industry,
-                company_size=request.company_size
-            )
+            async with llm_slot():
+                impact = await impact_analyzer.aanalyze(
+                    problem=request.problem,
+                    ai_solution=request.ai_solution,
+                    industry=request.industry,
+                    company_size=request.company_size
+                )
             
             return impact.to_dict()
         else:
-            print("⚠ Impact analyzer not initialized")
+            logger.warning("⚠ Impact analyzer not initialized")
             raise HTTPException(status_code=503, detail="Impact analyzer not available")
+    
+    except HTTPException:
+        raise
             
     except Exception as e:
-        print(f"❌ Error analyzing impact: {e}")
+        logger.error(f"❌ Error analyzing impact: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def get_mock_response(request: ConsultRequest):
+@app.get("/api/search")
+async def search_use_cases(
+    query: str,
+    n_results: int = 5,
+    consultant: Optional[AIConsultant] = Depends(ready_consultant)
+):
     """
-    Mock response for when AI components are not initialized
+    Search for similar use cases in the knowledge base
     """
-    return {
-        "recommendations": f"""Based on your problem in the {request.industry} industry, I recommend implementing an AI-powered solution with the following components:
+    if consultant is None:
+        raise HTTPException(status_code=503, detail="Consultant not initialized")
+    
+    try:
+        # Query encodes are batched across concurrent requests; ChromaDB runs in a thread
+        results = await consultant.vector_store.asearch(query, n_results=n_results)
+        return {
+            "query": query,
+            "results": results
+        }
+    
+    except Exception as e:
+        logger.error(f"Error searching use cases: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/search_batch")
+async def search_use_cases_batch(
+    request: BatchSearchRequest,
+    consultant: Optional[AIConsultant] = Depends(ready_consultant)
+):
+    """
+    Search for several queries at once (e.g. query expansions)
+    """
+    if consultant is None:
+        raise HTTPException(status_code=503, detail="Consultant not initialized")
+    
+    try:
+        # One batched encode + one ChromaDB query instead of a round-trip per query
+        results = await asyncio.to_thread(
+            consultant.vector_store.search_batch,
+            request.queries,
+            n_results=request.n_results
+        )
+        return {
+            "results": [
+                {"query": query, "results": query_results}
+                for query, query_results in zip(request.queries, results)
+            ]
+        }
+    
+    except Exception as e:
+        logger.error(f"Error searching use cases: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/stats")
+async def get_stats(consultant: Optional[AIConsultant] = Depends(ready_consultant)):
+    """
+    Get knowledge base statistics
+    """
+    if consultant is None:
+        raise HTTPException(status_code=503, detail="Consultant not initialized")
+    
+    try:
+        return await asyncio.to_thread(consultant.vector_store.get_collection_stats)
+    
+    except Exception as e:
+        logger.error(f"Error getting stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def consult_cache_key(request: ConsultRequest) -> bytes:
+    """Key identical consultations by industry, company size and problem text"""
+    return hashlib.blake2b(
+        f"{request.industry}|{request.companySize}|{request.problem}".encode("utf-8"),
+        digest_size=16
+    ).digest()
+
+
+# Mock response pieces - only the industry/company size fields vary per request,
+# so everything else is built once at import
+MOCK_RECOMMENDATIONS_TEMPLATE = """Based on your problem in the {industry} industry, I recommend implementing an AI-powered solution with the following components:
 
 1. **Natural Language Processing (NLP)** for automated text analysis and understanding
 2. **Machine Learning Models** for pattern recognition and predictive analytics
@@ -262,22 +571,22 @@ Implementation Approach:
 - Phase 3: Pilot deployment with monitoring (2-4 weeks)
 - Phase 4: Full rollout and optimization (2-3 weeks)
 
-This solution addresses your specific challenges while ensuring scalability and measurable business impact.""",
+This solution addresses your specific challenges while ensuring scalability and measurable business impact."""
 
-        "businessImpact": {
-            "cost_savings": f"Expected cost reduction of 20-35% through automation and efficiency gains. For a {request.companySize} company in {request.industry}, this typically translates to $15-30K monthly savings by reducing manual processing time, minimizing errors, and optimizing resource allocation.",
-            
-            "revenue_potential": "Revenue growth potential of 5-12% through improved customer satisfaction, faster service delivery, and ability to handle higher volumes. Enhanced capabilities can lead to better customer retention (reducing churn by 15-25%) and opening new market opportunities, potentially generating an additional $12-25K monthly.",
-            
-            "time_savings": "Estimated time savings of 15-25 hours per week per employee through automation of routine tasks. This frees up your team to focus on high-value activities, strategic initiatives, and customer relationship building. Total productivity improvement: 40-60%.",
-            
-            "roi_estimate": "Investment: $100-180K for complete implementation. Expected annual ROI: 150-220%. Break-even point: 6-9 months. First year net savings: $200-350K. Three-year cumulative ROI: 400-500%.",
-            
-            "risk_reduction": "Significant risk mitigation across multiple dimensions: 70-85% reduction in human errors, improved compliance through automated checks, enhanced data security with AI monitoring, and better fraud detection (if applicable). Estimated risk-adjusted savings: $20-40K annually.",
-            
-            "competitive_advantage": "Strategic positioning benefits including faster time-to-market, superior customer experience leading to higher NPS scores, ability to offer 24/7 service, and data-driven decision making. This creates a sustainable competitive moat that's difficult for competitors to replicate quickly.",
-            
-            "implementation_timeline": """Total timeline: 16-24 weeks (4-6 months)
+MOCK_COST_SAVINGS_TEMPLATE = "Expected cost reduction of 20-35% through automation and efficiency gains. For a {company_size} company in {industry}, this typically translates to $15-30K monthly savings by reducing manual processing time, minimizing errors, and optimizing resource allocation."
+
+MOCK_IMPACT_STATIC = {
+    "revenue_potential": "Revenue growth potential of 5-12% through improved customer satisfaction, faster service delivery, and ability to handle higher volumes. Enhanced capabilities can lead to better customer retention (reducing churn by 15-25%) and opening new market opportunities, potentially generating an additional $12-25K monthly.",
+    
+    "time_savings": "Estimated time savings of 15-25 hours per week per employee through automation of routine tasks. This frees up your team to focus on high-value activities, strategic initiatives, and customer relationship building. Total productivity improvement: 40-60%.",
+    
+    "roi_estimate": "Investment: $100-180K for complete implementation. Expected annual ROI: 150-220%. Break-even point: 6-9 months. First year net savings: $200-350K. Three-year cumulative ROI: 400-500%.",
+    
+    "risk_reduction": "Significant risk mitigation across multiple dimensions: 70-85% reduction in human errors, improved compliance through automated checks, enhanced data security with AI monitoring, and better fraud detection (if applicable). Estimated risk-adjusted savings: $20-40K annually.",
+    
+    "competitive_advantage": "Strategic positioning benefits including faster time-to-market, superior customer experience leading to higher NPS scores, ability to offer 24/7 service, and data-driven decision making. This creates a sustainable competitive moat that's difficult for competitors to replicate quickly.",
+    
+    "implementation_timeline": """Total timeline: 16-24 weeks (4-6 months)
 
 **Phase 1: Planning & Requirements (3-4 weeks)**
 - Stakeholder workshops and requirements gathering
@@ -301,8 +610,8 @@ This solution addresses your specific challenges while ensuring scalability and
 - Staff training and documentation
 - Full production deployment
 - Post-launch monitoring and optimization""",
-            
-            "resource_requirements": f"""**Team Composition (5-8 people):**
+    
+    "resource_requirements": """**Team Composition (5-8 people):**
 - 1 Project Manager (full-time)
 - 2 AI/ML Engineers (full-time)
 - 2 Backend/Integration Developers (full-time)
@@ -329,45 +638,61 @@ This solution addresses your specific challenges while ensuring scalability and
 - Training & support: $10-15K
 - Contingency (15%): $15-25K
 - Total: $135-210K""",
-            
-            "key_metrics": [
-                "Cost per transaction/interaction (target: 60-70% reduction)",
-                "Processing time (target: 75-85% reduction)",
-                "Customer Satisfaction Score/CSAT (target: 4.5+/5)",
-                "First Response Time (target: <2 hours, ideally <5 minutes)",
-                "Resolution rate (target: 85%+ automated resolution)",
-                "User adoption rate (target: 80%+ within 3 months)",
-                "Return on Investment percentage (target: 150%+ annually)",
-                "Error rate reduction (target: 80%+ reduction)",
-                "System uptime (target: 99.5%+)",
-            ],
-            
-            "success_factors": [
-                "**Clear Requirements**: Well-defined use cases and success criteria from the start",
-                "**Quality Training Data**: Sufficient high-quality data for model training and validation",
-                "**Stakeholder Buy-in**: Executive support and user engagement throughout the process",
-                "**Iterative Approach**: Start with pilot, gather feedback, iterate before full rollout",
-                "**Comprehensive Testing**: Thorough testing including edge cases and failure scenarios",
-                "**User Training**: Adequate training and documentation for all user groups",
-                "**Change Management**: Proactive communication and support for organizational change",
-                "**Continuous Monitoring**: Real-time performance tracking and optimization",
-            ],
-            
-            "potential_challenges": [
-                "**Integration Complexity**: Connecting with legacy systems may require custom solutions",
-                "**Data Quality Issues**: Insufficient or poor-quality training data can impact performance",
-                "**User Adoption Resistance**: Change management and training are critical for success",
-                "**Model Accuracy**: Initial models may require tuning and refinement based on real-world usage",
-                "**Scalability Concerns**: System must be designed to handle growth in usage and data volume",
-                "**Compliance Requirements**: Industry-specific regulations (GDPR, HIPAA, etc.) must be addressed",
-                "**Cost Overruns**: Scope creep and unforeseen technical challenges can increase costs by 15-30%",
-                "**Vendor Dependency**: Reliance on third-party AI services requires backup plans",
-            ],
+    
+    "key_metrics": [
+        "Cost per transaction/interaction (target: 60-70% reduction)",
+        "Processing time (target: 75-85% reduction)",
+        "Customer Satisfaction Score/CSAT (target: 4.5+/5)",
+        "First Response Time (target: <2 hours, ideally <5 minutes)",
+        "Resolution rate (target: 85%+ automated resolution)",
+        "User adoption rate (target: 80%+ within 3 months)",
+        "Return on Investment percentage (target: 150%+ annually)",
+        "Error rate reduction (target: 80%+ reduction)",
+        "System uptime (target: 99.5%+)",
+    ],
+    
+    "success_factors": [
+        "**Clear Requirements**: Well-defined use cases and success criteria from the start",
+        "**Quality Training Data**: Sufficient high-quality data for model training and validation",
+        "**Stakeholder Buy-in**: Executive support and user engagement throughout the process",
+        "**Iterative Approach**: Start with pilot, gather feedback, iterate before full rollout",
+        "**Comprehensive Testing**: Thorough testing including edge cases and failure scenarios",
+        "**User Training**: Adequate training and documentation for all user groups",
+        "**Change Management**: Proactive communication and support for organizational change",
+        "**Continuous Monitoring**: Real-time performance tracking and optimization",
+    ],
+    
+    "potential_challenges": [
+        "**Integration Complexity**: Connecting with legacy systems may require custom solutions",
+        "**Data Quality Issues**: Insufficient or poor-quality training data can impact performance",
+        "**User Adoption Resistance**: Change management and training are critical for success",
+        "**Model Accuracy**: Initial models may require tuning and refinement based on real-world usage",
+        "**Scalability Concerns**: System must be designed to handle growth in usage and data volume",
+        "**Compliance Requirements**: Industry-specific regulations (GDPR, HIPAA, etc.) must be addressed",
+        "**Cost Overruns**: Scope creep and unforeseen technical challenges can increase costs by 15-30%",
+        "**Vendor Dependency**: Reliance on third-party AI services requires backup plans",
+    ],
+}
+
+
+def get_mock_response(request: ConsultRequest):
+    """
+    Mock response for when AI components are not initialized
+    """
+    return {
+        "recommendations": MOCK_RECOMMENDATIONS_TEMPLATE.format(industry=request.industry),
+        "businessImpact": {
+            "cost_savings": MOCK_COST_SAVINGS_TEMPLATE.format(
+                company_size=request.companySize,
+                industry=request.industry
+            ),
+            **MOCK_IMPACT_STATIC
         }
     }
 
 
-if __name__ == "__main__":
+def main():
+    """Run the API server"""
     import uvicorn
     
     print("\n" + "="*60)
@@ -380,8 +705,23 @@ if __name__ == "__main__":
     print("\n" + "="*60 + "\n")
     
     uvicorn.run(
-        app,
+        "server:app",
+        app_dir=str(Path(__file__).parent),
         host="0.0.0.0",
         port=8000,
-        log_level="info"
+        loop="auto",  # uvloop when installed (not available on Windows)
+        http="auto",  # httptools when installed
+        workers=WEB_CONCURRENCY,
+        reload=False,
+        log_level="warning",
+        # Requests take seconds (LLM-bound): shed excess load with 503s rather
+        # than queueing without bound. limit_concurrency is per worker.
+        backlog=512,
+        limit_concurrency=64,
+        timeout_keep_alive=30,
+        h11_max_incomplete_event_size=16384
     )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Exact-match disk cache for LLM responses
+Identical requests (provider, model, messages, sampling params) are answered
+from a local SQLite file instead of calling the API again - reruns of the
+examples become near-instant. Consulted before the semantic cache misses
+through to the LLM. Opt-in (response_cache_dir): entries never expire, so it
+is meant for development, not the server.
+"""
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """SQLite-backed key/value store of LLM completions"""
+    
+    FILE_NAME = "llm_responses.sqlite3"
+    
+    def __init__(self, directory: str = "data/cache"):
+        """
+        Initialize response cache
+        
+        Args:
+            directory: Directory holding the SQLite file
+        """
+        self.path = Path(directory) / self.FILE_NAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # One connection shared by sync callers, worker threads and the event loop
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(**request: Any) -> str:
+        """Hash the request parameters (model, messages, temperature, ...) into a cache key"""
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=32).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        
+        if row:
+            logger.info("LLM response cache hit")
+            return row[0]
+        return None
+    
+    def set(self, key: str, response: str):
+        """Store a response under a key"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            self._conn.commit()
+    
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+@lru_cache(maxsize=4)
+def get_response_cache(directory: str = "data/cache") -> LLMResponseCache:
+    """Get the (shared) response cache for a directory"""
+    return LLMResponseCache(directory)
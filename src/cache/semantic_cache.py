@@ -0,0 +1,330 @@
+"""
+Semantic cache for LLM responses
+Returns a stored response when a new query embedding is close enough
+(cosine similarity) to one that was already answered
+"""
+import os
+import time
+import atexit
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Hashable, Iterator, Optional, Tuple
+import logging
+
+import numpy as np
+
+# HNSW index is optional - falls back to a brute-force numpy scan
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and the normalized (optionally int8) embedding of the query that produced it"""
+    vector: Optional[np.ndarray]  # None while the HNSW index holds the vector
+    value: Any
+    namespace: Hashable
+    created: float
+
+
+class SemanticCache:
+    """
+    Cosine-similarity cache with LRU eviction and TTL
+    
+    Uses an HNSW index (hnswlib) for approximate nearest-neighbour lookup when
+    available, otherwise scans all cached embeddings with one matrix product.
+    With the index, vectors live only inside it (float32); entries keep no copy.
+    Without it, embeddings are scalar-quantized to int8 by default (4x less
+    memory and scan traffic; cosine scores move by well under 1%). Saved
+    entries carry their (quantized) vectors either way and the index is
+    rebuilt from them on load, so only one file is persisted.
+    
+    Safe to share between threads. With a persist_directory, changes are
+    written by a background timer (and at exit) rather than on every set().
+    """
+    
+    INT8_SCALE = 127.0
+    ENTRIES_FILE = "semantic_cache.pkl"
+    
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 1000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        persist_directory: Optional[str] = None,
+        use_hnsw: bool = True,
+        ef_construction: int = 200,
+        M: int = 16,
+        quantize: bool = True,
+        save_delay: float = 30.0
+    ):
+        """
+        Initialize semantic cache
+        
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached entries (LRU eviction)
+            ttl_seconds: Time-to-live of an entry in seconds
+            persist_directory: Directory to load/save the cache (None = memory only)
+            use_hnsw: Use an HNSW index when hnswlib is installed
+            ef_construction: HNSW build-time candidate list size
+            M: HNSW graph out-degree
+            quantize: Store embeddings as int8 instead of float32 (numpy fallback and saved entries)
+            save_delay: Seconds after a change before it is written to persist_directory
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_directory = Path(persist_directory) if persist_directory else None
+        self.use_hnsw = use_hnsw and HNSWLIB_AVAILABLE
+        self.ef_construction = ef_construction
+        self.M = M
+        self.quantize = quantize
+        self.save_delay = save_delay
+        
+        # Guards entries, the index and the labels; re-entrant so save() can run inside set()/load()
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        
+        # label -> entry, ordered from least to most recently used
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._next_label = 0
+        self._index = None
+        
+        # Brute-force fallback: stacked (N, dim) int8/float32 matrix, rebuilt lazily after changes
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_labels: Optional[np.ndarray] = None
+        
+        self.hits = 0
+        self.misses = 0
+        
+        if self.persist_directory:
+            self.load()
+            atexit.register(self.save)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, embedding: np.ndarray, namespace: Hashable = None) -> Optional[Any]:
+        """
+        Look up a cached value for a query embedding
+        
+        Args:
+            embedding: Query embedding
+            namespace: Only entries stored under the same namespace can match
+        
+        Returns:
+            Cached value, or None on a miss
+        """
+        query = self._normalize(embedding)
+        
+        with self._lock:
+            if not self._entries:
+                self.misses += 1
+                return None
+            
+            # Candidates come back best-first; the first one in our namespace decides
+            for label, similarity in self._nearest(query):
+                entry = self._entries[label]
+                if entry.namespace != namespace:
+                    continue
+                
+                if similarity >= self.threshold and not self._is_expired(entry):
+                    self._entries.move_to_end(label)
+                    self.hits += 1
+                    logger.info(f"Semantic cache hit (similarity {similarity:.3f})")
+                    return entry.value
+                break
+            
+            self.misses += 1
+            return None
+    
+    def set(self, embedding: np.ndarray, value: Any, namespace: Hashable = None):
+        """
+        Store a value for a query embedding
+        
+        Args:
+            embedding: Query embedding
+            value: Value to cache (e.g. the consultation result)
+            namespace: Namespace the entry belongs to
+        """
+        vector = self._normalize(embedding)
+        
+        with self._lock:
+            self._expire()
+            
+            while len(self._entries) >= self.max_entries:
+                self._evict(next(iter(self._entries)))
+            
+            label = self._next_label
+            self._next_label += 1
+            
+            self._entries[label] = CacheEntry(
+                vector=None if self.use_hnsw else self._quantize(vector),
+                value=value,
+                namespace=namespace,
+                created=time.time()
+            )
+            
+            if self.use_hnsw:
+                if self._index is None:
+                    self._init_index(dim=vector.shape[0])
+                self._index.add_items(vector[np.newaxis, :], [label], replace_deleted=True)
+            self._matrix = None
+            
+            if self.persist_directory:
+                self._schedule_save()
+    
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self._index = None
+            self._matrix = None
+            self._dirty = True
+    
+    def save(self):
+        """Atomically persist cached entries to persist_directory if they changed"""
+        if not self.persist_directory:
+            return
+        
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            
+            self.persist_directory.mkdir(parents=True, exist_ok=True)
+            
+            entries = self._entries
+            if self._index is not None and entries:
+                # Vectors live only in the index - copy them into the saved entries
+                vectors = np.asarray(self._index.get_items(list(entries)), dtype=np.float32)
+                entries = OrderedDict(
+                    (label, replace(entry, vector=self._quantize(vector)))
+                    for (label, entry), vector in zip(entries.items(), vectors)
+                )
+            
+            # Write-then-rename: a reader (or another process saving concurrently)
+            # only ever sees a complete file
+            entries_path = self.persist_directory / self.ENTRIES_FILE
+            tmp_path = entries_path.with_name(f"{entries_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'entries': entries, 'next_label': self._next_label}, f)
+            os.replace(tmp_path, entries_path)
+            self._dirty = False
+    
+    def _schedule_save(self):
+        """Debounce writes: one save() save_delay seconds after the first unsaved change"""
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def load(self):
+        """Warm the cache from a previous run's persist_directory"""
+        with self._lock:
+            entries_path = self.persist_directory / self.ENTRIES_FILE
+            if not entries_path.exists():
+                return
+            
+            try:
+                with open(entries_path, 'rb') as f:
+                    state = pickle.load(f)
+                self._entries = state['entries']
+                self._next_label = state['next_label']
+                
+                # Entries may have been saved with the other storage precision
+                for entry in self._entries.values():
+                    entry.vector = self._quantize(self._dequantize(entry.vector))
+            except Exception as e:
+                logger.warning(f"Could not load semantic cache from {entries_path}: {e}")
+                return
+            
+            if self.use_hnsw and self._entries:
+                # Rebuilt from the entries (milliseconds at max_entries), so the
+                # index can never disagree with them
+                dim = next(iter(self._entries.values())).vector.shape[0]
+                self._init_index(dim=dim)
+                labels = list(self._entries.keys())
+                vectors = np.vstack([self._dequantize(e.vector) for e in self._entries.values()])
+                self._index.add_items(vectors, labels)
+                
+                # The index holds the vectors now
+                for entry in self._entries.values():
+                    entry.vector = None
+            
+            self._expire()
+            logger.info(f"✅ Loaded {len(self._entries)} semantic cache entries")
+    
+    def _nearest(self, query: np.ndarray) -> Iterator[Tuple[int, float]]:
+        """Yield (label, cosine similarity) candidates, most similar first"""
+        if self._index is not None:
+            k = min(len(self._entries), 10)
+            self._index.set_ef(max(k, 50))
+            labels, distances = self._index.knn_query(query, k=k)
+            for label, distance in zip(labels[0], distances[0]):
+                yield int(label), 1.0 - float(distance)
+        else:
+            if self._matrix is None:
+                self._matrix_labels = np.fromiter(self._entries.keys(), dtype=np.int64)
+                self._matrix = np.vstack([e.vector for e in self._entries.values()])
+            if self._matrix.dtype == np.int8:
+                # Integer dot product, rescaled back to a cosine similarity
+                sims = (self._matrix @ self._quantize(query).astype(np.int32)) / self.INT8_SCALE ** 2
+            else:
+                sims = self._matrix @ query
+            for idx in np.argsort(-sims):
+                yield int(self._matrix_labels[idx]), float(sims[idx])
+    
+    def _init_index(self, dim: int):
+        self._index = hnswlib.Index(space='cosine', dim=dim)
+        self._index.init_index(
+            max_elements=self.max_entries,
+            ef_construction=self.ef_construction,
+            M=self.M,
+            allow_replace_deleted=True
+        )
+    
+    def _is_expired(self, entry: CacheEntry) -> bool:
+        return entry.created < time.time() - self.ttl_seconds
+    
+    def _expire(self):
+        """Drop entries older than the TTL"""
+        for label in [l for l, e in self._entries.items() if self._is_expired(e)]:
+            self._evict(label)
+    
+    def _evict(self, label: int):
+        del self._entries[label]
+        if self._index is not None:
+            self._index.mark_deleted(label)
+        self._matrix = None
+    
+    def _quantize(self, vector: np.ndarray) -> np.ndarray:
+        """Symmetric int8 quantization of a unit vector (components lie in [-1, 1])"""
+        if not self.quantize:
+            return vector
+        return np.clip(np.rint(vector * self.INT8_SCALE), -127, 127).astype(np.int8)
+    
+    def _dequantize(self, vector: np.ndarray) -> np.ndarray:
+        if vector.dtype == np.int8:
+            return vector.astype(np.float32) / self.INT8_SCALE
+        return vector
+    
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
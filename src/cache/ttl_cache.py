@@ -0,0 +1,51 @@
+"""
+Small in-process exact-key cache with LRU eviction and TTL
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Exact-match cache (e.g. for API responses) bounded by size and age"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        """
+        Initialize cache
+        
+        Args:
+            maxsize: Maximum number of entries (least recently used are evicted)
+            ttl: Time-to-live of an entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing/expired"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store value under key"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def clear(self):
+        """Remove all entries"""
+        self._data.clear()
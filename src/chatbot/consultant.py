@@ -3,20 +3,65 @@ AI Consultant Chatbot with RAG
 Provides AI/ML/DL/RL recommendations based on business problems
 """
 import sys
+import queue
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Callable, Iterator, List, Dict, Optional, Tuple
 import logging
 
+import httpx
+
 from embeddings.vector_store import VectorStore
+from cache.semantic_cache import SemanticCache
+from cache.llm_cache import get_response_cache
+from cache.ttl_cache import TTLCache
 from chatbot.impact_analyzer import BusinessImpactAnalyzer
+from chatbot.llm_clients import (
+    DEFAULT_MODELS, anthropic_system, get_llm_client, get_async_llm_client, warm_llm_client
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Static instructions, sent as the system prompt so the provider can reuse its
+# cached prefix across requests; the problem and retrieved cases come after
+CONSULTANT_SYSTEM_PROMPT = """You are an expert AI/ML consultant. A client has described a business problem, and you need to recommend appropriate AI/ML/DL/RL techniques and approaches.
+
+Based on the client's problem and similar use cases from the knowledge base, provide a structured recommendation:
+
+1. PROBLEM ANALYSIS
+   - Restate the problem in technical terms
+   - Identify the type of problem (classification, regression, generation, optimization, etc.)
+   - Identify the data types involved
+
+2. RECOMMENDED APPROACH
+   - Should this use ML, DL, RL, or a combination?
+   - Why is this approach appropriate?
+   - What are the key requirements (data, compute, expertise)?
+
+3. SPECIFIC TECHNIQUES & MODELS
+   - List specific algorithms, architectures, or models
+   - For each, explain why it's suitable
+   - Mention any proven alternatives
+
+4. IMPLEMENTATION CONSIDERATIONS
+   - Data requirements (quantity, quality, labeling)
+   - Potential challenges or limitations
+   - ROI and feasibility factors
+
+5. SIMILAR SUCCESS STORIES
+   - Reference the most relevant example from the knowledge base
+   - Explain how it relates to this problem
+
+BE SPECIFIC AND PRACTICAL. Don't just say "use deep learning" - explain which architecture and why.
+If the problem is NOT suitable for AI/ML, say so and explain why a traditional approach might be better."""
+
 
 class AIConsultant:
     """
@@ -28,7 +73,14 @@ class AIConsultant:
         self, 
         vector_store: Optional[VectorStore] = None,
         llm_provider: str = "groq",  # or "anthropic", "openai"
-        enable_impact_analysis: bool = True
+        enable_impact_analysis: bool = True,
+        enable_cache: bool = True,
+        cache_threshold: float = 0.92,
+        cache_directory: Optional[str] = "data/cache",
+        response_cache_dir: Optional[str] = None,
+        warmup: bool = True,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_tokens: int = 1200
     ):
         """
         Initialize AI Consultant
@@ -37,34 +89,70 @@ class AIConsultant:
             vector_store: Pre-initialized vector store (creates new if None)
             llm_provider: LLM provider to use ('groq', 'anthropic', or 'openai')
             enable_impact_analysis: Whether to enable business impact analysis
+            enable_cache: Whether to reuse answers for semantically similar problems
+            cache_threshold: Minimum cosine similarity for a semantic cache hit
+            cache_directory: Where the semantic cache is persisted (None = memory only)
+            response_cache_dir: Where LLM responses are cached on disk, for fast dev reruns
+                (None = off; entries never expire, so keep it out of production)
+            warmup: Pre-warm the embedding model and vector index, and open the LLM
+                connection in the background, before the first query
+            http_client: Shared connection pool for async LLM calls (e.g. owned by the API server)
+            max_tokens: Default cap on generated tokens per recommendation (~P95 answer length)
         """
         self.vector_store = vector_store or VectorStore()
+        if warmup:
+            self.vector_store.warmup()
         self.llm_provider = llm_provider
+        self.max_tokens = max_tokens
         self.enable_impact_analysis = enable_impact_analysis
+        self.semantic_cache = SemanticCache(
+            threshold=cache_threshold,
+            persist_directory=cache_directory
+        ) if enable_cache else None
         
-        # Initialize LLM client
-        if llm_provider == "groq":
-            from groq import Groq
-            import os
-            self.llm_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-            self.model = "llama-3.3-70b-versatile"  # Fast and powerful
-        elif llm_provider == "anthropic":
-            from anthropic import Anthropic
-            import os
-            self.llm_client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-            self.model = "claude-3-5-sonnet-20241022"
-        elif llm_provider == "openai":
-            from openai import OpenAI
-            import os
-            self.llm_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            self.model = "gpt-4-turbo-preview"
-        else:
+        # Retrieval results per (index generation, problem, n_examples) - repeated
+        # problems skip both the embedding and the vector search
+        self._search_cache = TTLCache(maxsize=512, ttl=3600)
+        self._search_lock = threading.Lock()
+        
+        # Exact-match disk cache of LLM responses (checked before calling the API)
+        self.response_cache = get_response_cache(response_cache_dir) if enable_cache and response_cache_dir else None
+        
+        # Initialize LLM client (shared per provider across the process)
+        if llm_provider not in DEFAULT_MODELS:
             raise ValueError(f"Unsupported LLM provider: {llm_provider}")
         
+        self.llm_client = get_llm_client(llm_provider)
+        self.async_llm_client = get_async_llm_client(llm_provider, http_client)
+        self.model = DEFAULT_MODELS[llm_provider]
+        
+        # Bind the provider's implementations once instead of branching on every call
+        api = "anthropic" if llm_provider == "anthropic" else "chat"
+        self._call_llm = getattr(self, f"_call_{api}")
+        self._acall_llm = getattr(self, f"_acall_{api}")
+        self._stream_llm = getattr(self, f"_stream_{api}")
+        self._astream_llm = getattr(self, f"_astream_{api}")
+        
+        # Handshake with the provider off the calling thread (the impact analyzer shares the pool)
+        if warmup:
+            threading.Thread(
+                target=warm_llm_client,
+                args=(llm_provider, self.llm_client, self.model),
+                daemon=True
+            ).start()
+        
         # Initialize business impact analyzer
         if self.enable_impact_analysis:
             try:
-                self.impact_analyzer = BusinessImpactAnalyzer(llm_provider=llm_provider)
+                # Reuse our clients, so both LLM calls of a suggestion share one pool
+                self.impact_analyzer = BusinessImpactAnalyzer(
+                    llm_provider=llm_provider,
+                    model=self.model,
+                    response_cache_dir=response_cache_dir if enable_cache else None,
+                    client=self.llm_client,
+                    async_client=self.async_llm_client,
+                    warmup=False
+                )
                 logger.info("✅ Business Impact Analyzer enabled")
             except Exception as e:
                 logger.warning(f"Could not initialize impact analyzer: {e}")
@@ -82,7 +170,10 @@ class AIConsultant:
         n_examples: int = 5,
         include_impact: bool = True,
         industry: Optional[str] = None,
-        company_size: Optional[str] = None
+        company_size: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
     ) -> Dict:
         """
         Suggest AI/ML/DL/RL techniques for a business problem
@@ -95,20 +186,207 @@ class AIConsultant:
             include_impact: Whether to include business impact analysis
             industry: Industry context for impact analysis
             company_size: Company size for impact analysis
+            on_token: Called with each chunk of recommendation text as the LLM
+                streams it (the full text is still returned in the dict)
+            bypass_cache: Generate fresh answers instead of reading the semantic/disk
+                caches (the new answers still replace the cached ones)
+            max_tokens: Cap on generated recommendation tokens (default: self.max_tokens)
         
         Returns:
             Dict with recommendations, reasoning, and optional impact analysis
         """
         logger.info(f"Processing suggestion request for: {problem}")
         
+        # Step 0: Reuse the answer to a semantically similar problem
+        cache_namespace = (data_type, n_examples, include_impact, industry, company_size)
+        cache_embedding = None
+        if self.semantic_cache is not None:
+            cache_embedding, cached = self._cache_lookup(problem, context, cache_namespace)
+            if cached is not None and not bypass_cache:
+                return cached
+        
         # Step 1: Retrieve similar use cases
-        similar_cases = self.vector_store.search(
-            query=problem,
-            n_results=n_examples
+        similar_cases = self._search(problem, n_examples)
+        
+        # Steps 2-6: Prompt the LLM and assemble the result
+        result = self._respond(
+            problem, context, similar_cases, include_impact, industry, company_size,
+            on_token, bypass_cache, max_tokens
+        )
+        
+        if cache_embedding is not None:
+            self.semantic_cache.set(cache_embedding, result, namespace=cache_namespace)
+        
+        return result
+    
+    async def asuggest(
+        self, 
+        problem: str, 
+        context: Optional[str] = None,
+        data_type: Optional[str] = None,
+        n_examples: int = 5,
+        include_impact: bool = True,
+        industry: Optional[str] = None,
+        company_size: Optional[str] = None,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> Dict:
+        """
+        Async variant of suggest() - awaits the LLM with the provider's async
+        client so several consultations can run concurrently (asyncio.gather)
+        
+        Takes the same arguments (except on_token) and returns the same dict as suggest().
+        """
+        logger.info(f"Processing async suggestion request for: {problem}")
+        
+        cache_namespace = (data_type, n_examples, include_impact, industry, company_size)
+        cache_embedding = None
+        if self.semantic_cache is not None:
+            query_text = f"{problem}\n{context}" if context else problem
+            cache_embedding = await self.vector_store.aencode_query(query_text)
+            # The cache lock may be held by a background save - keep it off the event loop
+            cached = await asyncio.to_thread(self.semantic_cache.get, cache_embedding, namespace=cache_namespace)
+            if cached is not None and not bypass_cache:
+                return cached
+        
+        # Query encodes are batched with concurrent requests; ChromaDB runs in a thread
+        similar_cases = await self._asearch(problem, n_examples)
+        
+        result = await self._arespond(
+            problem, context, similar_cases, include_impact, industry, company_size,
+            bypass_cache, max_tokens
+        )
+        
+        if cache_embedding is not None:
+            await asyncio.to_thread(self.semantic_cache.set, cache_embedding, result, namespace=cache_namespace)
+        
+        return result
+    
+    async def astream_suggest(
+        self,
+        problem: str,
+        context: Optional[str] = None,
+        n_examples: int = 5,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the recommendation text token by token as the LLM generates it
+        
+        Retrieval runs as in suggest(); only the generation step streams.
+        No impact analysis or caching is applied.
+        
+        Args:
+            problem: Business problem description
+            context: Additional context (industry, scale, constraints)
+            n_examples: Number of similar examples to retrieve
+            max_tokens: Cap on generated tokens (default: self.max_tokens)
+        
+        Yields:
+            Chunks of recommendation text
+        """
+        logger.info(f"Processing streaming suggestion request for: {problem}")
+        
+        similar_cases = await self._asearch(problem, n_examples)
+        
+        prompt = self._create_consultation_prompt(
+            problem=problem,
+            context=context,
+            retrieved_cases=self._format_retrieved_context(similar_cases)[0]
         )
         
+        async for token in self._astream_llm(prompt, max_tokens or self.max_tokens):
+            yield token
+    
+    def suggest_batch(
+        self,
+        problems: List[str],
+        context: Optional[str] = None,
+        n_examples: int = 5,
+        include_impact: bool = True,
+        industry: Optional[str] = None,
+        company_size: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> List[Dict]:
+        """
+        Suggest techniques for several problems (e.g. evaluation sweeps)
+        
+        Retrieval for all problems is one embedding pass and one vector query;
+        the LLM calls then run concurrently on a thread pool.
+        
+        Args:
+            problems: Business problem descriptions
+            context: Additional context shared by all problems
+            n_examples: Number of similar examples to retrieve per problem
+            include_impact: Whether to include business impact analysis
+            industry: Industry context for impact analysis
+            company_size: Company size for impact analysis
+            max_concurrency: Maximum number of problems in flight at once
+        
+        Returns:
+            One result dict (as returned by suggest()) per problem, in order
+        """
+        logger.info(f"Processing batch suggestion request for {len(problems)} problems")
+        
+        all_cases = self.vector_store.search_batch(problems, n_results=n_examples)
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(
+                lambda problem, similar_cases: self._respond(
+                    problem, context, similar_cases, include_impact, industry, company_size
+                ),
+                problems,
+                all_cases
+            ))
+    
+    async def asuggest_batch(
+        self,
+        problems: List[str],
+        context: Optional[str] = None,
+        n_examples: int = 5,
+        include_impact: bool = True,
+        industry: Optional[str] = None,
+        company_size: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> List[Dict]:
+        """
+        Async variant of suggest_batch() - LLM calls are gathered on the event loop
+        
+        Takes the same arguments and returns the same list as suggest_batch().
+        """
+        logger.info(f"Processing async batch suggestion request for {len(problems)} problems")
+        
+        all_cases = await asyncio.to_thread(
+            self.vector_store.search_batch, problems, n_examples
+        )
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def respond(problem: str, similar_cases: List[Dict]) -> Dict:
+            async with semaphore:
+                return await self._arespond(
+                    problem, context, similar_cases, include_impact, industry, company_size
+                )
+        
+        return await asyncio.gather(*(
+            respond(problem, similar_cases)
+            for problem, similar_cases in zip(problems, all_cases)
+        ))
+    
+    def _respond(
+        self,
+        problem: str,
+        context: Optional[str],
+        similar_cases: List[Dict],
+        include_impact: bool,
+        industry: Optional[str],
+        company_size: Optional[str],
+        on_token: Optional[Callable[[str], None]] = None,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> Dict:
+        """Build the prompt from retrieved cases, query the LLM(s) and assemble the result"""
         # Step 2: Build context from retrieved examples
-        retrieved_context = self._format_retrieved_context(similar_cases)
+        retrieved_context, avg_distance = self._format_retrieved_context(similar_cases)
         
         # Step 3: Create prompt for LLM
         prompt = self._create_consultation_prompt(
@@ -117,30 +395,28 @@ class AIConsultant:
             retrieved_cases=retrieved_context
         )
         
-        # Step 4: Get LLM response
-        response = self._query_llm(prompt)
-        
-        # Step 5: Add business impact analysis
+        # Step 4 + 5: Get LLM response and business impact analysis in parallel.
+        # The impact analysis works from the approaches of the retrieved cases,
+        # so it doesn't have to wait for the recommendation text.
         impact_analysis = None
         if include_impact and self.impact_analyzer:
-            try:
-                logger.info("Generating business impact analysis...")
-                impact_obj = self.impact_analyzer.analyze(
-                    problem=problem,
-                    ai_solution=response,
-                    industry=industry,
-                    company_size=company_size
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                impact_future = pool.submit(
+                    self._analyze_impact,
+                    problem, self._solution_outline(similar_cases), industry, company_size,
+                    bypass_cache
                 )
-                impact_analysis = impact_obj.to_dict()
-            except Exception as e:
-                logger.warning(f"Could not generate impact analysis: {e}")
+                response = self._query_llm(prompt, on_token, bypass_cache, max_tokens)
+                impact_analysis = impact_future.result()
+        else:
+            response = self._query_llm(prompt, on_token, bypass_cache, max_tokens)
         
         # Step 6: Format final response
         result = {
             'problem': problem,
             'recommendations': response,
             'similar_cases': similar_cases,
-            'confidence': self._calculate_confidence(similar_cases)
+            'confidence': self._calculate_confidence(avg_distance)
         }
         
         if impact_analysis:
@@ -148,24 +424,176 @@ class AIConsultant:
         
         return result
     
-    def _format_retrieved_context(self, similar_cases: List[Dict]) -> str:
-        """Format retrieved use cases into context string"""
+    async def _arespond(
+        self,
+        problem: str,
+        context: Optional[str],
+        similar_cases: List[Dict],
+        include_impact: bool,
+        industry: Optional[str],
+        company_size: Optional[str],
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> Dict:
+        """Async version of _respond"""
+        retrieved_context, avg_distance = self._format_retrieved_context(similar_cases)
+        prompt = self._create_consultation_prompt(
+            problem=problem,
+            context=context,
+            retrieved_cases=retrieved_context
+        )
+        
+        # Both LLM round-trips are in flight at once
+        impact_analysis = None
+        if include_impact and self.impact_analyzer:
+            response, impact_analysis = await asyncio.gather(
+                self._aquery_llm(prompt, bypass_cache, max_tokens),
+                self._aanalyze_impact(
+                    problem, self._solution_outline(similar_cases), industry, company_size,
+                    bypass_cache
+                )
+            )
+        else:
+            response = await self._aquery_llm(prompt, bypass_cache, max_tokens)
+        
+        result = {
+            'problem': problem,
+            'recommendations': response,
+            'similar_cases': similar_cases,
+            'confidence': self._calculate_confidence(avg_distance)
+        }
+        
+        if impact_analysis:
+            result['business_impact'] = impact_analysis
+        
+        return result
+    
+    def _search(self, problem: str, n_examples: int) -> List[Dict]:
+        """Retrieve similar use cases, reusing results for repeated problems"""
+        key = (self.vector_store.generation, problem, n_examples)
+        with self._search_lock:
+            similar_cases = self._search_cache.get(key)
+        
+        if similar_cases is None:
+            similar_cases = self.vector_store.search(query=problem, n_results=n_examples)
+            with self._search_lock:
+                self._search_cache.set(key, similar_cases)
+        
+        return similar_cases
+    
+    async def _asearch(self, problem: str, n_examples: int) -> List[Dict]:
+        """Async _search"""
+        key = (self.vector_store.generation, problem, n_examples)
+        with self._search_lock:
+            similar_cases = self._search_cache.get(key)
+        
+        if similar_cases is None:
+            similar_cases = await self.vector_store.asearch(query=problem, n_results=n_examples)
+            with self._search_lock:
+                self._search_cache.set(key, similar_cases)
+        
+        return similar_cases
+    
+    def _cache_lookup(self, problem: str, context: Optional[str], namespace: tuple):
+        """Embed the problem (plus context) and check the semantic cache"""
+        query_text = f"{problem}\n{context}" if context else problem
+        embedding = self.vector_store.encode_query(query_text)
+        return embedding, self.semantic_cache.get(embedding, namespace=namespace)
+    
+    def _solution_outline(self, similar_cases: List[Dict]) -> str:
+        """Summarize the technologies/models of the retrieved cases as the solution to assess"""
+        techs: List[str] = []
+        models: List[str] = []
+        for case in similar_cases:
+            metadata = case['metadata']
+            for field, seen in (('recommended_tech', techs), ('models', models)):
+                for item in str(metadata.get(field) or '').split(','):
+                    item = item.strip()
+                    if item and item not in seen:
+                        seen.append(item)
+        
+        if not techs and not models:
+            return "An AI/ML solution tailored to the problem (approach to be finalized)"
+        
+        outline = "Candidate approaches drawn from similar proven use cases."
+        if techs:
+            outline += f"\nTechnologies: {', '.join(techs[:8])}"
+        if models:
+            outline += f"\nModels/approaches: {', '.join(models[:8])}"
+        return outline
+    
+    def _analyze_impact(
+        self,
+        problem: str,
+        ai_solution: str,
+        industry: Optional[str],
+        company_size: Optional[str],
+        bypass_cache: bool = False
+    ) -> Optional[Dict]:
+        """Run the business impact analysis; None if it fails"""
+        try:
+            logger.info("Generating business impact analysis...")
+            return self.impact_analyzer.analyze(
+                problem=problem,
+                ai_solution=ai_solution,
+                industry=industry,
+                company_size=company_size,
+                bypass_cache=bypass_cache
+            ).to_dict()
+        except Exception as e:
+            logger.warning(f"Could not generate impact analysis: {e}")
+            return None
+    
+    async def _aanalyze_impact(
+        self,
+        problem: str,
+        ai_solution: str,
+        industry: Optional[str],
+        company_size: Optional[str],
+        bypass_cache: bool = False
+    ) -> Optional[Dict]:
+        """Async version of _analyze_impact"""
+        try:
+            logger.info("Generating business impact analysis...")
+            impact = await self.impact_analyzer.aanalyze(
+                problem=problem,
+                ai_solution=ai_solution,
+                industry=industry,
+                company_size=company_size,
+                bypass_cache=bypass_cache
+            )
+            return impact.to_dict()
+        except Exception as e:
+            logger.warning(f"Could not generate impact analysis: {e}")
+            return None
+    
+    def _format_retrieved_context(self, similar_cases: List[Dict]) -> Tuple[str, Optional[float]]:
+        """
+        Format retrieved use cases into context string
+        
+        Returns:
+            (context string, average distance of the cases or None if there are none)
+        """
         
         context_parts = []
+        total_distance = 0.0
         
         for i, case in enumerate(similar_cases, 1):
             metadata = case['metadata']
             doc = case['document']
+            distance = case.get('distance')
+            total_distance += 1.0 if distance is None else distance
             
             context_parts.append(f"""
 Example {i}:
 {doc}
 
 Source: {metadata.get('source', 'Unknown')}
-Relevance Score: {1 - case.get('distance', 0):.2f}
+Relevance Score: {1 - (distance or 0):.2f}
 """)
         
-        return "\n".join(context_parts)
+        avg_distance = total_distance / len(similar_cases) if similar_cases else None
+        return "\n".join(context_parts), avg_distance
     
     def _create_consultation_prompt(
         self, 
@@ -173,11 +601,9 @@ Relevance Score: {1 - case.get('distance', 0):.2f}
         context: Optional[str],
         retrieved_cases: str
     ) -> str:
-        """Create prompt for LLM consultation"""
+        """Create the per-request part of the consultation prompt (the rubric is in CONSULTANT_SYSTEM_PROMPT)"""
         
-        prompt = f"""You are an expert AI/ML consultant. A client has described a business problem, and you need to recommend appropriate AI/ML/DL/RL techniques and approaches.
-
-CLIENT'S PROBLEM:
+        prompt = f"""CLIENT'S PROBLEM:
 {problem}
 """
         
@@ -191,81 +617,196 @@ ADDITIONAL CONTEXT:
 SIMILAR USE CASES FROM KNOWLEDGE BASE:
 {retrieved_cases}
 
-Based on the client's problem and similar use cases, provide a structured recommendation:
-
-1. PROBLEM ANALYSIS
-   - Restate the problem in technical terms
-   - Identify the type of problem (classification, regression, generation, optimization, etc.)
-   - Identify the data types involved
-
-2. RECOMMENDED APPROACH
-   - Should this use ML, DL, RL, or a combination?
-   - Why is this approach appropriate?
-   - What are the key requirements (data, compute, expertise)?
-
-3. SPECIFIC TECHNIQUES & MODELS
-   - List specific algorithms, architectures, or models
-   - For each, explain why it's suitable
-   - Mention any proven alternatives
-
-4. IMPLEMENTATION CONSIDERATIONS
-   - Data requirements (quantity, quality, labeling)
-   - Potential challenges or limitations
-   - ROI and feasibility factors
-
-5. SIMILAR SUCCESS STORIES
-   - Reference the most relevant example from the knowledge base
-   - Explain how it relates to this problem
-
-BE SPECIFIC AND PRACTICAL. Don't just say "use deep learning" - explain which architecture and why.
-If the problem is NOT suitable for AI/ML, say so and explain why a traditional approach might be better.
-"""
+Based on the client's problem and similar use cases, provide the structured recommendation."""
         
         return prompt
     
-    def _query_llm(self, prompt: str) -> str:
-        """Query the LLM with the constructed prompt"""
-        
-        if self.llm_provider == "groq":
-            response = self.llm_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert AI/ML consultant."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.7
-            )
-            return response.choices[0].message.content
-        
-        elif self.llm_provider == "anthropic":
-            response = self.llm_client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return response.content[0].text
-        
-        elif self.llm_provider == "openai":
-            response = self.llm_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert AI/ML consultant."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000
-            )
-            return response.choices[0].message.content
+    def _response_key(self, prompt: str, max_tokens: int) -> str:
+        """Disk cache key for a consultation prompt"""
+        return self.response_cache.make_key(
+            provider=self.llm_provider,
+            model=self.model,
+            system=CONSULTANT_SYSTEM_PROMPT,
+            prompt=prompt,
+            temperature=0.7,
+            max_tokens=max_tokens
+        )
+    
+    def _query_llm(
+        self,
+        prompt: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Query the LLM, answering repeated prompts from the disk cache
+        
+        With on_token the response is streamed and each chunk forwarded as it arrives.
+        With bypass_cache a fresh response is generated (and replaces the cached one).
+        """
+        max_tokens = max_tokens or self.max_tokens
+        key = self._response_key(prompt, max_tokens) if self.response_cache is not None else None
+        response = self.response_cache.get(key) if key and not bypass_cache else None
+        
+        if response is not None:
+            if on_token:
+                on_token(response)
+            return response
+        
+        if on_token:
+            parts = []
+            for token in self._stream_llm(prompt, max_tokens):
+                parts.append(token)
+                on_token(token)
+            response = "".join(parts)
+        else:
+            response = self._call_llm(prompt, max_tokens)
+        
+        if key:
+            self.response_cache.set(key, response)
+        return response
+    
+    async def _aquery_llm(
+        self,
+        prompt: str,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Async version of _query_llm"""
+        max_tokens = max_tokens or self.max_tokens
+        if self.response_cache is None:
+            return await self._acall_llm(prompt, max_tokens)
+        
+        key = self._response_key(prompt, max_tokens)
+        # SQLite reads/writes under the cache lock - keep them off the event loop
+        response = None if bypass_cache else await asyncio.to_thread(self.response_cache.get, key)
+        if response is None:
+            response = await self._acall_llm(prompt, max_tokens)
+            await asyncio.to_thread(self.response_cache.set, key, response)
+        return response
+    
+    # Provider implementations - __init__ binds _call_llm/_acall_llm/_stream_llm/_astream_llm
+    # to one of these. Groq and OpenAI share the OpenAI-compatible chat API.
+    
+    def _call_chat(self, prompt: str, max_tokens: int) -> str:
+        """Query a Groq/OpenAI chat model with the constructed prompt"""
+        response = self.llm_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": CONSULTANT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7
+        )
+        return response.choices[0].message.content
+    
+    def _call_anthropic(self, prompt: str, max_tokens: int) -> str:
+        """Query an Anthropic model with the constructed prompt"""
+        response = self.llm_client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            system=anthropic_system(CONSULTANT_SYSTEM_PROMPT),
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7
+        )
+        return response.content[0].text
+    
+    async def _acall_chat(self, prompt: str, max_tokens: int) -> str:
+        """Async version of _call_chat"""
+        response = await self.async_llm_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": CONSULTANT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7
+        )
+        return response.choices[0].message.content
+    
+    async def _acall_anthropic(self, prompt: str, max_tokens: int) -> str:
+        """Async version of _call_anthropic"""
+        response = await self.async_llm_client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            system=anthropic_system(CONSULTANT_SYSTEM_PROMPT),
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7
+        )
+        return response.content[0].text
+    
+    def _stream_chat(self, prompt: str, max_tokens: int) -> Iterator[str]:
+        """Stream a Groq/OpenAI chat response for the constructed prompt"""
+        stream = self.llm_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": CONSULTANT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _stream_anthropic(self, prompt: str, max_tokens: int) -> Iterator[str]:
+        """Stream an Anthropic response for the constructed prompt"""
+        with self.llm_client.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens,
+            system=anthropic_system(CONSULTANT_SYSTEM_PROMPT),
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
     
-    def _calculate_confidence(self, similar_cases: List[Dict]) -> str:
-        """Calculate confidence level based on similarity scores"""
+    async def _astream_chat(self, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        """Async version of _stream_chat"""
+        stream = await self.async_llm_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": CONSULTANT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def _astream_anthropic(self, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        """Async version of _stream_anthropic"""
+        async with self.async_llm_client.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens,
+            system=anthropic_system(CONSULTANT_SYSTEM_PROMPT),
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
+    def _calculate_confidence(self, avg_distance: Optional[float]) -> str:
+        """Calculate confidence level from the average distance of the retrieved cases"""
         
-        if not similar_cases:
+        if avg_distance is None:
             return "Low"
         
-        avg_distance = sum(case.get('distance', 1.0) for case in similar_cases) / len(similar_cases)
         avg_similarity = 1 - avg_distance
         
         if avg_similarity > 0.8:
@@ -284,10 +825,20 @@ If the problem is NOT suitable for AI/ML, say so and explain why a traditional a
         print("Describe your business problem, and I'll suggest AI/ML/DL/RL solutions.")
         print("Type 'quit' or 'exit' to stop.\n")
         
+        # Answers are generated and streamed on a worker thread so the next
+        # problem can be typed (and queued) while the previous one streams
+        work: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        worker = threading.Thread(target=self._interactive_worker, args=(work,), daemon=True)
+        worker.start()
+        
         while True:
             problem = input("\n💼 Your problem: ").strip()
             
             if problem.lower() in ['quit', 'exit', 'q']:
+                if work.unfinished_tasks:
+                    print("⏳ Finishing queued problems...")
+                work.put(None)
+                worker.join()
                 print("👋 Goodbye!")
                 break
             
@@ -296,20 +847,58 @@ If the problem is NOT suitable for AI/ML, say so and explain why a traditional a
             
             context = input("📝 Additional context (optional, press Enter to skip): ").strip()
             
-            print("\n🔍 Analyzing problem and searching knowledge base...")
-            
-            result = self.suggest(
-                problem=problem,
-                context=context if context else None
-            )
+            if work.unfinished_tasks:
+                print(f"📥 Queued ({work.unfinished_tasks} ahead)")
+            work.put((problem, context if context else None))
+    
+    def _interactive_worker(self, work: "queue.Queue[Optional[tuple]]"):
+        """Drain interactive_mode's work queue, streaming each answer (None stops the worker)"""
+        while True:
+            item = work.get()
+            if item is None:
+                work.task_done()
+                return
             
+            problem, context = item
+            try:
+                self._print_suggestion(problem, context)
+            except Exception as e:
+                logger.error(f"❌ Error answering '{problem}': {e}")
+            finally:
+                work.task_done()
+    
+    def _print_suggestion(self, problem: str, context: Optional[str]):
+        """Run one interactive consultation and print it as it streams"""
+        print(f"\n🔍 Analyzing '{problem}' and searching knowledge base...")
+        
+        streamed = False
+        
+        def print_token(token: str):
+            nonlocal streamed
+            if not streamed:
+                print("\n" + "="*60)
+                print("📊 RECOMMENDATION")
+                print("="*60)
+                streamed = True
+            print(token, end='', flush=True)
+        
+        # Tokens are printed as the LLM generates them
+        result = self.suggest(
+            problem=problem,
+            context=context,
+            on_token=print_token
+        )
+        
+        if streamed:
+            print()
+        else:
+            # Semantic cache hit - nothing was streamed
             print("\n" + "="*60)
             print("📊 RECOMMENDATION")
             print("="*60)
             print(result['recommendations'])
-            print(f"\n🎯 Confidence: {result['confidence']}")
-            print(f"📚 Based on {len(result['similar_cases'])} similar use cases")
-
+        print(f"\n🎯 Confidence: {result['confidence']}")
+        print(f"📚 Based on {len(result['similar_cases'])} similar use cases")
 
 def main():
     """Main entry point"""
@@ -337,6 +926,17 @@ def main():
         default='groq',
         help='LLM provider'
     )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.92,
+        help='Cosine similarity threshold for semantic cache hits'
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Ignore cached answers and query the LLM again (API mode)'
+    )
     
     args = parser.parse_args()
     
@@ -358,7 +958,7 @@ def main():
         return
     
     # Initialize consultant
-    consultant = AIConsultant(llm_provider=args.provider)
+    consultant = AIConsultant(llm_provider=args.provider, cache_threshold=args.threshold)
     
     if args.mode == 'interactive':
         consultant.interactive_mode()
@@ -368,7 +968,7 @@ def main():
             print("Error: --problem required for API mode")
             return
         
-        result = consultant.suggest(problem=args.problem)
+        result = consultant.suggest(problem=args.problem, bypass_cache=args.fresh)
         
         print("\n" + "="*60)
         print("📊 RECOMMENDATION")
@@ -5,35 +5,108 @@ Analyzes and quantifies the business impact of AI solutions.
 Provides ROI estimates, cost savings, revenue opportunities, and implementation insights.
 """
 
-import os
+import asyncio
+import io
+import re
+import sys
+import json
+import time
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from dotenv import load_dotenv
+import httpx
 
-# Try different LLM providers
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
-
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from chatbot.llm_clients import (
+    DEFAULT_MODELS, anthropic_system, get_llm_client, get_async_llm_client, warm_llm_client
+)
+from cache.llm_cache import get_response_cache
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Section headings the analysis prompt asks for
+IMPACT_SECTIONS = (
+    "COST SAVINGS", "REVENUE POTENTIAL", "TIME SAVINGS", "ROI ESTIMATE",
+    "RISK REDUCTION", "COMPETITIVE ADVANTAGE", "IMPLEMENTATION TIMELINE",
+    "RESOURCE REQUIREMENTS", "KEY METRICS", "SUCCESS FACTORS", "POTENTIAL CHALLENGES",
+)
+
+# Sections parsed into lists of items rather than prose
+LIST_SECTIONS = frozenset({"KEY METRICS", "SUCCESS FACTORS", "POTENTIAL CHALLENGES"})
+
+# JSON keys the LLM is asked to return (= BusinessImpact fields)
+IMPACT_FIELDS = {name: name.lower().replace(" ", "_") for name in IMPACT_SECTIONS}
+
+# Static instructions, sent as the system prompt so the provider can reuse
+# its cached prefix across requests; only the problem/solution context varies
+IMPACT_SYSTEM_PROMPT = """You are a business impact analyst with expertise in AI/ML ROI and implementation.
+
+Provide a comprehensive business impact analysis covering:
+
+1. COST SAVINGS: Quantify potential cost reductions (labor, operations, errors, etc.). Use specific percentages and examples.
+
+2. REVENUE POTENTIAL: Identify new revenue opportunities or growth potential. Be specific about mechanisms.
+
+3. TIME SAVINGS: Estimate time saved in processes, decision-making, or operations. Use concrete numbers.
+
+4. ROI ESTIMATE: Provide realistic ROI timeline and percentage. Consider implementation costs.
+
+5. RISK REDUCTION: Explain how AI reduces business risks (compliance, errors, fraud, etc.).
+
+6. COMPETITIVE ADVANTAGE: Describe strategic advantages gained through AI adoption.
+
+7. IMPLEMENTATION TIMELINE: Realistic timeline from planning to full deployment (weeks/months).
+
+8. RESOURCE REQUIREMENTS: Team size, skills needed, infrastructure, budget estimates.
+
+9. KEY METRICS: List 5-7 specific KPIs to track success.
+
+10. SUCCESS FACTORS: List 4-6 critical factors for successful implementation.
+
+11. POTENTIAL CHALLENGES: List 4-6 realistic challenges and risks to consider.
+
+Be specific, quantitative where possible, and realistic.
+
+Return ONLY a JSON object with these keys: cost_savings, revenue_potential, time_savings, roi_estimate, risk_reduction, competitive_advantage, implementation_timeline, resource_requirements (strings), and key_metrics, success_factors, potential_challenges (arrays of strings)."""
+
+# Anthropic has no JSON mode - a forced tool call returns the same object
+IMPACT_TOOL = {
+    "name": "record_business_impact",
+    "description": "Record the structured business impact analysis",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            field: {"type": "array", "items": {"type": "string"}} if name in LIST_SECTIONS else {"type": "string"}
+            for name, field in IMPACT_FIELDS.items()
+        },
+        "required": list(IMPACT_FIELDS.values()),
+    },
+}
+
+# A section heading line in any of the styles the LLM uses:
+# "### 1. COST SAVINGS", "## KEY METRICS (KPIs)", "**COST SAVINGS:**", "COST SAVINGS: text..."
+_HEADING_RE = re.compile(
+    r"^\s*(?:#{1,4}\s*)?(?:\d+[.)]\s*)?\*{0,2}(?:\d+[.)]\s*)?"
+    r"(" + "|".join(IMPACT_SECTIONS) + r")"  # plain words, no escaping needed
+    r"(?:\s*\([^)]*\))?\*{0,2}\s*(?::\s*\*{0,2}|$)(.*)$",
+    re.IGNORECASE
+)
+_LEADING_BULLET_RE = re.compile(r'^[-*•]\s*')
+# One character class for bullet/emoji markers (optional U+FE0F emoji presentation selector) plus "1." / "1)"
+_BULLET_RE = re.compile(r'^(?:[-•*⚠⚡✅]\ufe0f?|\d+[.)])\s+')
+_INLINE_BULLET_RE = re.compile(r'\s+([-•*⚠⚡✅]\ufe0f?)\s+')
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_SYMBOLS_ONLY_RE = re.compile(r'^[⚠⚠️:.]+$')
+_SENTENCE_SPLIT_RE = re.compile(r'[.;]')
+
 
 @dataclass
 class BusinessImpact:
@@ -68,52 +141,54 @@ class BusinessImpact:
     
     def format_report(self) -> str:
         """Format as readable report"""
-        report = "\n" + "="*80 + "\n"
-        report += "📊 BUSINESS IMPACT ANALYSIS\n"
-        report += "="*80 + "\n\n"
+        buf = io.StringIO()
+        w = buf.write
+        
+        w("\n" + "="*80 + "\n")
+        w("📊 BUSINESS IMPACT ANALYSIS\n")
+        w("="*80 + "\n\n")
         
-        report += "💰 COST SAVINGS\n"
-        report += f"{self.cost_savings}\n\n"
+        w("💰 COST SAVINGS\n")
+        w(f"{self.cost_savings}\n\n")
         
-        report += "📈 REVENUE POTENTIAL\n"
-        report += f"{self.revenue_potential}\n\n"
+        w("📈 REVENUE POTENTIAL\n")
+        w(f"{self.revenue_potential}\n\n")
         
-        report += "⏱️ TIME SAVINGS\n"
-        report += f"{self.time_savings}\n\n"
+        w("⏱️ TIME SAVINGS\n")
+        w(f"{self.time_savings}\n\n")
         
-        report += "💵 ROI ESTIMATE\n"
-        report += f"{self.roi_estimate}\n\n"
+        w("💵 ROI ESTIMATE\n")
+        w(f"{self.roi_estimate}\n\n")
         
-        report += "🛡️ RISK REDUCTION\n"
-        report += f"{self.risk_reduction}\n\n"
+        w("🛡️ RISK REDUCTION\n")
+        w(f"{self.risk_reduction}\n\n")
         
-        report += "🚀 COMPETITIVE ADVANTAGE\n"
-        report += f"{self.competitive_advantage}\n\n"
+        w("🚀 COMPETITIVE ADVANTAGE\n")
+        w(f"{self.competitive_advantage}\n\n")
         
-        report += "📅 IMPLEMENTATION TIMELINE\n"
-        report += f"{self.implementation_timeline}\n\n"
+        w("📅 IMPLEMENTATION TIMELINE\n")
+        w(f"{self.implementation_timeline}\n\n")
         
-        report += "👥 RESOURCE REQUIREMENTS\n"
-        report += f"{self.resource_requirements}\n\n"
+        w("👥 RESOURCE REQUIREMENTS\n")
+        w(f"{self.resource_requirements}\n\n")
         
-        report += "📊 KEY METRICS TO TRACK\n"
+        w("📊 KEY METRICS TO TRACK\n")
         for metric in self.key_metrics:
-            report += f"  • {metric}\n"
-        report += "\n"
+            w(f"  • {metric}\n")
+        w("\n")
         
-        report += "✅ SUCCESS FACTORS\n"
+        w("✅ SUCCESS FACTORS\n")
         for factor in self.success_factors:
-            report += f"  • {factor}\n"
-        report += "\n"
+            w(f"  • {factor}\n")
+        w("\n")
         
-        report += "⚠️ POTENTIAL CHALLENGES\n"
+        w("⚠️ POTENTIAL CHALLENGES\n")
         for challenge in self.potential_challenges:
-            report += f"  • {challenge}\n"
+            w(f"  • {challenge}\n")
         
-        report += "\n" + "="*80 + "\n"
+        w("\n" + "="*80 + "\n")
         
-        return report
-
+        return buf.getvalue()
 
 class BusinessImpactAnalyzer:
     """
@@ -130,7 +205,13 @@ class BusinessImpactAnalyzer:
     def __init__(
         self,
         llm_provider: str = "groq",
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        response_cache_dir: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        client=None,
+        async_client=None,
+        max_tokens: int = 1800,
+        warmup: bool = True
     ):
         """
         Initialize the business impact analyzer.
@@ -138,23 +219,42 @@ class BusinessImpactAnalyzer:
         Args:
             llm_provider: LLM provider to use ("groq", "anthropic", or "openai")
             model: Specific model to use (optional, uses defaults)
+            response_cache_dir: Where LLM responses are cached on disk, for fast dev reruns (None = off)
+            http_client: Shared connection pool for async LLM calls
+            client: Existing sync provider client to reuse (e.g. the consultant's)
+            async_client: Existing async provider client to reuse
+            max_tokens: Default cap on generated tokens per analysis (~P95 JSON length)
+            warmup: Open the LLM connection in the background right away
         """
         self.llm_provider = llm_provider.lower()
         self.model = model
+        self.max_tokens = max_tokens
         
-        # Initialize LLM client
-        if self.llm_provider == "groq" and GROQ_AVAILABLE:
-            self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-            self.model = model or "llama-3.3-70b-versatile"
-        elif self.llm_provider == "anthropic" and ANTHROPIC_AVAILABLE:
-            self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-            self.model = model or "claude-3-5-sonnet-20241022"
-        elif self.llm_provider == "openai" and OPENAI_AVAILABLE:
-            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            self.model = model or "gpt-4-turbo-preview"
-        else:
+        # Initialize LLM client - only the selected provider's SDK is imported
+        if self.llm_provider not in DEFAULT_MODELS:
             raise ValueError(f"LLM provider '{llm_provider}' not available or not supported")
         
+        # Clients are shared per provider across the process
+        try:
+            self.client = client or get_llm_client(self.llm_provider)
+            self.async_client = async_client or get_async_llm_client(self.llm_provider, http_client)
+        except ImportError as e:
+            raise ValueError(f"LLM provider '{llm_provider}' not available or not supported") from e
+        self.model = model or DEFAULT_MODELS[self.llm_provider]
+        self.response_cache = get_response_cache(response_cache_dir) if response_cache_dir else None
+        
+        # Bind the provider's implementation once instead of branching on every call
+        api = "anthropic" if self.llm_provider == "anthropic" else "chat"
+        self._call_provider = getattr(self, f"_call_{api}")
+        self._acall_provider = getattr(self, f"_acall_{api}")
+        
+        if warmup:
+            threading.Thread(
+                target=warm_llm_client,
+                args=(self.llm_provider, self.client, self.model),
+                daemon=True
+            ).start()
+        
         logger.info(f"✅ Initialized BusinessImpactAnalyzer with {self.llm_provider} ({self.model})")
     
     def analyze(
@@ -162,7 +262,9 @@ class BusinessImpactAnalyzer:
         problem: str,
         ai_solution: str,
         industry: Optional[str] = None,
-        company_size: Optional[str] = None
+        company_size: Optional[str] = None,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
     ) -> BusinessImpact:
         """
         Analyze business impact of an AI solution.
@@ -172,6 +274,8 @@ class BusinessImpactAnalyzer:
             ai_solution: The proposed AI solution
             industry: Industry context (optional)
             company_size: Company size (optional, e.g., "startup", "SMB", "enterprise")
+            bypass_cache: Generate a fresh analysis instead of reading the disk cache
+            max_tokens: Cap on generated tokens (default: self.max_tokens)
         
         Returns:
             BusinessImpact object with detailed analysis
@@ -179,224 +283,482 @@ class BusinessImpactAnalyzer:
         logger.info("Analyzing business impact...")
         
         # Build context
-        context = f"Business Problem: {problem}\n\n"
-        context += f"Proposed AI Solution: {ai_solution}\n\n"
-        if industry:
-            context += f"Industry: {industry}\n\n"
-        if company_size:
-            context += f"Company Size: {company_size}\n\n"
+        context = self._build_context(problem, ai_solution, industry, company_size)
         
         # Create analysis prompt
         prompt = self._create_analysis_prompt(context)
         
         # Query LLM
-        response = self._query_llm(prompt)
+        response = self._query_llm(prompt, bypass_cache, max_tokens)
         
         # Debug output
-        logger.info(f"\\n\\nLLM RESPONSE:\\n{response}\\n\\n")
+        logger.debug("LLM response:\n%s", response)
         
         # Parse response
         impact = self._parse_impact_response(response)
         
         return impact
     
-    def _create_analysis_prompt(self, context: str) -> str:
-        """Create detailed analysis prompt"""
-        prompt = f"""You are a business impact analyst specializing in AI/ML implementations.
-
-{context}
-
-Provide a comprehensive business impact analysis covering:
-
-1. COST SAVINGS: Quantify potential cost reductions (labor, operations, errors, etc.). Use specific percentages and examples.
-
-2. REVENUE POTENTIAL: Identify new revenue opportunities or growth potential. Be specific about mechanisms.
-
-3. TIME SAVINGS: Estimate time saved in processes, decision-making, or operations. Use concrete numbers.
-
-4. ROI ESTIMATE: Provide realistic ROI timeline and percentage. Consider implementation costs.
-
-5. RISK REDUCTION: Explain how AI reduces business risks (compliance, errors, fraud, etc.).
-
-6. COMPETITIVE ADVANTAGE: Describe strategic advantages gained through AI adoption.
-
-7. IMPLEMENTATION TIMELINE: Realistic timeline from planning to full deployment (weeks/months).
-
-8. RESOURCE REQUIREMENTS: Team size, skills needed, infrastructure, budget estimates.
-
-9. KEY METRICS: List 5-7 specific KPIs to track success.
-
-10. SUCCESS FACTORS: List 4-6 critical factors for successful implementation.
-
-11. POTENTIAL CHALLENGES: List 4-6 realistic challenges and risks to consider.
-
-Format your response as structured sections with clear headings. Be specific, quantitative where possible, and realistic."""
-
-        return prompt
-    
-    def _query_llm(self, prompt: str) -> str:
-        """Query the LLM"""
-        try:
-            if self.llm_provider == "groq":
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a business impact analyst with expertise in AI/ML ROI and implementation."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=3000
-                )
-                return response.choices[0].message.content
-            
-            elif self.llm_provider == "anthropic":
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=3000,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7
-                )
-                return response.content[0].text
+    def analyze_batch(
+        self,
+        items: List[Tuple[str, str, Optional[str], Optional[str]]],
+        use_batch_api: bool = True,
+        poll_interval: float = 30.0,
+        max_concurrency: int = 16
+    ) -> List[BusinessImpact]:
+        """
+        Analyze many (problem, solution) pairs, e.g. for evaluation sweeps.
+        
+        OpenAI and Anthropic requests are submitted as one batch job (lower
+        cost, much higher throughput, but completes asynchronously - this call
+        polls until it ends). Groq, or use_batch_api=False, runs the requests
+        concurrently instead. Cached prompts are never resubmitted.
+        
+        Args:
+            items: (problem, ai_solution, industry, company_size) tuples
+            use_batch_api: Use the provider's batch endpoint when it has one
+            poll_interval: Seconds between batch status checks
+            max_concurrency: Parallel requests when not using a batch endpoint
+        
+        Returns:
+            One BusinessImpact per item, in order
+        """
+        prompts = [
+            self._create_analysis_prompt(self._build_context(*item))
+            for item in items
+        ]
+        responses: Dict[int, str] = {}
+        
+        if self.response_cache is not None:
+            for i, prompt in enumerate(prompts):
+                cached = self.response_cache.get(self._response_key(prompt, self.max_tokens))
+                if cached is not None:
+                    responses[i] = cached
+        
+        pending = {i: prompt for i, prompt in enumerate(prompts) if i not in responses}
+        logger.info(f"Analyzing business impact for {len(items)} items ({len(pending)} uncached)...")
+        
+        if pending and use_batch_api and self.llm_provider in ("openai", "anthropic"):
+            submit = self._openai_batch if self.llm_provider == "openai" else self._anthropic_batch
+            try:
+                batch_results = submit(pending, poll_interval)
+            except Exception as e:
+                logger.warning(f"Batch job failed, falling back to individual requests: {e}")
+                batch_results = {}
             
-            elif self.llm_provider == "openai":
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a business impact analyst with expertise in AI/ML ROI and implementation."},
+            for i, response in batch_results.items():
+                responses[i] = response
+                if self.response_cache is not None:
+                    self.response_cache.set(self._response_key(pending[i], self.max_tokens), response)
+        
+        # Anything left (Groq, no batch API, failed batch entries) goes out concurrently
+        remaining = [i for i in pending if i not in responses]
+        if remaining:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+                for i, response in zip(remaining, pool.map(lambda i: self._query_llm(prompts[i]), remaining)):
+                    responses[i] = response
+        
+        return [self._parse_impact_response(responses[i]) for i in range(len(prompts))]
+    
+    def _openai_batch(self, prompts: Dict[int, str], poll_interval: float) -> Dict[int, str]:
+        """Run prompts through the OpenAI Batch API; returns {index: response text}"""
+        lines = [
+            json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": IMPACT_SYSTEM_PROMPT},
                         {"role": "user", "content": prompt}
                     ],
-                    temperature=0.7,
-                    max_tokens=3000
-                )
-                return response.choices[0].message.content
+                    "temperature": 0.7,
+                    "max_tokens": self.max_tokens,
+                    "response_format": {"type": "json_object"}
+                }
+            })
+            for i, prompt in prompts.items()
+        ]
+        
+        batch_file = self.client.files.create(
+            file=("impact_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} ({len(prompts)} requests)")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status '{batch.status}'")
         
+        results = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            entry = json.loads(line)
+            body = (entry.get("response") or {}).get("body") or {}
+            if body.get("choices"):
+                results[int(entry["custom_id"])] = body["choices"][0]["message"]["content"]
+        return results
+    
+    def _anthropic_batch(self, prompts: Dict[int, str], poll_interval: float) -> Dict[int, str]:
+        """Run prompts through the Anthropic Message Batches API; returns {index: response text}"""
+        batch = self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": str(i),
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": self.max_tokens,
+                        "system": anthropic_system(IMPACT_SYSTEM_PROMPT),
+                        "messages": [
+                            {"role": "user", "content": prompt}
+                        ],
+                        "temperature": 0.7,
+                        "tools": [IMPACT_TOOL],
+                        "tool_choice": {"type": "tool", "name": IMPACT_TOOL["name"]}
+                    }
+                }
+                for i, prompt in prompts.items()
+            ]
+        )
+        logger.info(f"Submitted Anthropic batch {batch.id} ({len(prompts)} requests)")
+        
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+        
+        results = {}
+        for entry in self.client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                results[int(entry.custom_id)] = self._tool_result(entry.result.message)
+        return results
+    
+    async def aanalyze(
+        self,
+        problem: str,
+        ai_solution: str,
+        industry: Optional[str] = None,
+        company_size: Optional[str] = None,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> BusinessImpact:
+        """
+        Async variant of analyze() using the provider's async client.
+        
+        Lets several analyses run concurrently with asyncio.gather.
+        Takes the same arguments and returns the same BusinessImpact as analyze().
+        """
+        logger.info("Analyzing business impact (async)...")
+        
+        context = self._build_context(problem, ai_solution, industry, company_size)
+        prompt = self._create_analysis_prompt(context)
+        response = await self._aquery_llm(prompt, bypass_cache, max_tokens)
+        
+        logger.debug("LLM response:\n%s", response)
+        
+        return self._parse_impact_response(response)
+    
+    def _build_context(
+        self,
+        problem: str,
+        ai_solution: str,
+        industry: Optional[str],
+        company_size: Optional[str]
+    ) -> str:
+        """Build the problem/solution context block for the analysis prompt"""
+        context = f"Business Problem: {problem}\n\n"
+        context += f"Proposed AI Solution: {ai_solution}\n\n"
+        if industry:
+            context += f"Industry: {industry}\n\n"
+        if company_size:
+            context += f"Company Size: {company_size}\n\n"
+        return context
+    
+    def _create_analysis_prompt(self, context: str) -> str:
+        """Create the per-request part of the analysis prompt (instructions live in IMPACT_SYSTEM_PROMPT)"""
+        return f"""{context}
+Provide the business impact analysis for this problem and solution as the JSON object described."""
+    
+    def _response_key(self, prompt: str, max_tokens: int) -> str:
+        """Disk cache key for an analysis prompt"""
+        return self.response_cache.make_key(
+            provider=self.llm_provider,
+            model=self.model,
+            system=IMPACT_SYSTEM_PROMPT,
+            prompt=prompt,
+            temperature=0.7,
+            max_tokens=max_tokens,
+            response_format="json"
+        )
+    
+    def _query_llm(
+        self,
+        prompt: str,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Query the LLM, answering repeated prompts from the disk cache (unless bypass_cache)"""
+        max_tokens = max_tokens or self.max_tokens
+        if self.response_cache is None:
+            return self._call_llm(prompt, max_tokens)
+        
+        key = self._response_key(prompt, max_tokens)
+        response = None if bypass_cache else self.response_cache.get(key)
+        if response is None:
+            response = self._call_llm(prompt, max_tokens)
+            self.response_cache.set(key, response)
+        return response
+    
+    async def _aquery_llm(
+        self,
+        prompt: str,
+        bypass_cache: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Async version of _query_llm"""
+        max_tokens = max_tokens or self.max_tokens
+        if self.response_cache is None:
+            return await self._acall_llm(prompt, max_tokens)
+        
+        key = self._response_key(prompt, max_tokens)
+        # SQLite reads/writes under the cache lock - keep them off the event loop
+        response = None if bypass_cache else await asyncio.to_thread(self.response_cache.get, key)
+        if response is None:
+            response = await self._acall_llm(prompt, max_tokens)
+            await asyncio.to_thread(self.response_cache.set, key, response)
+        return response
+    
+    def _call_llm(self, prompt: str, max_tokens: int) -> str:
+        """Query the LLM"""
+        try:
+            return self._call_provider(prompt, max_tokens)
+        except Exception as e:
+            logger.error(f"Error querying LLM: {str(e)}")
+            raise
+    
+    async def _acall_llm(self, prompt: str, max_tokens: int) -> str:
+        """Query the LLM (async client)"""
+        try:
+            return await self._acall_provider(prompt, max_tokens)
         except Exception as e:
             logger.error(f"Error querying LLM: {str(e)}")
             raise
     
+    # Provider implementations - __init__ binds _call_provider/_acall_provider to
+    # one pair. Groq and OpenAI share the OpenAI-compatible chat API.
+    
+    def _call_chat(self, prompt: str, max_tokens: int) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": IMPACT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        return response.choices[0].message.content
+    
+    def _call_anthropic(self, prompt: str, max_tokens: int) -> str:
+        response = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            system=anthropic_system(IMPACT_SYSTEM_PROMPT),
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            tools=[IMPACT_TOOL],
+            tool_choice={"type": "tool", "name": IMPACT_TOOL["name"]}
+        )
+        return self._tool_result(response)
+    
+    async def _acall_chat(self, prompt: str, max_tokens: int) -> str:
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": IMPACT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        return response.choices[0].message.content
+    
+    async def _acall_anthropic(self, prompt: str, max_tokens: int) -> str:
+        response = await self.async_client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            system=anthropic_system(IMPACT_SYSTEM_PROMPT),
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            tools=[IMPACT_TOOL],
+            tool_choice={"type": "tool", "name": IMPACT_TOOL["name"]}
+        )
+        return self._tool_result(response)
+    
+    @staticmethod
+    def _tool_result(response) -> str:
+        """JSON text of the forced tool call in an Anthropic response"""
+        for block in response.content:
+            if getattr(block, "type", None) == "tool_use":
+                return json.dumps(block.input, ensure_ascii=False)
+        return response.content[0].text
+    
     def _parse_impact_response(self, response: str) -> BusinessImpact:
         """Parse LLM response into structured BusinessImpact"""
         
         # Debug: log the response
         logger.debug(f"Parsing response (first 500 chars): {response[:500]}")
         
-        # Helper function to extract section content
-        def extract_section(text: str, section_name: str) -> str:
-            # Try multiple patterns with case-insensitive matching
-            import re
-            
-            patterns = [
-                rf"###\s*\d+\.\s*{re.escape(section_name)}[:\s]*\n(.*?)(?=\n###|\n##|\Z)",  # ### 1. SECTION
-                rf"##\s*{re.escape(section_name)}[:\s]*\n(.*?)(?=\n###|\n##|\Z)",  # ## SECTION
-                rf"###\s*{re.escape(section_name)}[:\s]*\n(.*?)(?=\n###|\n##|\Z)",  # ### SECTION
-                rf"\*\*{re.escape(section_name)}\*\*[:\s]*\n(.*?)(?=\n\*\*|\n##|\n###|\Z)",  # **SECTION**
-                rf"{re.escape(section_name)}[:\s]*\n(.*?)(?=\n\n[A-Z]|\n##|\n###|\Z)",  # SECTION:\n
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-                if match:
-                    content = match.group(1).strip()
-                    if content:
-                        # Remove bullet points at the start if present
-                        content = re.sub(r'^[-*•]\s*', '', content)
-                        return content
-            
-            return "Analysis not available"
+        impact = self._parse_json_response(response)
+        if impact is not None:
+            return impact
         
-        # Helper to extract list items
-        def extract_list_items(text: str, section_name: str) -> List[str]:
-            import re
-            
-            section_text = extract_section(text, section_name)
-            if section_text == "Analysis not available":
-                return ["To be determined during detailed analysis"]
-            
-            # Pre-processing: Handle inline lists by inserting newlines before bullets
-            # e.g. "Intro: * Item 1 * Item 2" -> "Intro:\n* Item 1\n* Item 2"
-            # Matches space followed by bullet followed by space
-            section_text = re.sub(r'(\s+)([-•*]|\u26a0|\u26a1|\u2705|⚠|⚠️)(\s+)', r'\n\2\3', section_text)
-            
-            items = []
-            
-            # Split by newlines
-            lines = section_text.split('\n')
-            current_item = ""
+        # Fallback: free-form headings (model ignored JSON mode, or an old cached response)
+        sections = self._split_sections(response)
+        
+        fields = {}
+        for name in IMPACT_SECTIONS:
+            field = name.lower().replace(" ", "_")
+            text = sections.get(name, "")
+            if name in LIST_SECTIONS:
+                fields[field] = self._extract_list_items(text)
+            else:
+                fields[field] = text or "Analysis not available"
+        
+        return BusinessImpact(**fields)
+    
+    def _parse_json_response(self, response: str) -> Optional[BusinessImpact]:
+        """Build a BusinessImpact from a JSON response; None if it isn't a JSON object"""
+        text = response.strip()
+        if text.startswith("```"):
+            text = text.strip("`").removeprefix("json").strip()
+        
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        
+        fields = {}
+        for name, field in IMPACT_FIELDS.items():
+            value = data.get(field)
+            if name in LIST_SECTIONS:
+                if isinstance(value, str):
+                    fields[field] = self._extract_list_items(value)
+                elif isinstance(value, list) and value:
+                    fields[field] = [str(item).strip() for item in value if str(item).strip()]
+                else:
+                    fields[field] = ["To be determined during detailed analysis"]
+            else:
+                if isinstance(value, list):
+                    value = "\n".join(f"- {item}" for item in value)
+                elif isinstance(value, dict):
+                    value = "\n".join(f"{k}: {v}" for k, v in value.items())
+                fields[field] = str(value).strip() if value else "Analysis not available"
+        
+        return BusinessImpact(**fields)
+    
+    @staticmethod
+    def _split_sections(response: str) -> Dict[str, str]:
+        """
+        Split the response into {section name: content} in one pass over its lines
+        
+        A known heading starts a section (text after 'HEADING:' on the same line
+        belongs to it); any other markdown heading ends the current one.
+        """
+        sections: Dict[str, List[str]] = {}
+        current = None
+        
+        for line in response.splitlines():
+            heading = _HEADING_RE.match(line)
+            if heading:
+                current = heading.group(1).upper()
+                lines = sections.setdefault(current, [])
+                if heading.group(2).strip():
+                    lines.append(heading.group(2))
+            elif line.lstrip().startswith("#"):
+                current = None
+            elif current is not None:
+                sections[current].append(line)
+        
+        # Remove bullet points at the start if present
+        return {
+            name: _LEADING_BULLET_RE.sub('', "\n".join(lines).strip())
+            for name, lines in sections.items()
+        }
+    
+    @staticmethod
+    def _extract_list_items(section_text: str) -> List[str]:
+        """Split a list section into items (bullets, numbers or emoji markers)"""
+        if not section_text:
+            return ["To be determined during detailed analysis"]
+        
+        # Pre-processing: Handle inline lists by inserting newlines before bullets
+        # e.g. "Intro: * Item 1 * Item 2" -> "Intro:\n* Item 1\n* Item 2"
+        # Matches space followed by bullet followed by space
+        section_text = _INLINE_BULLET_RE.sub(r'\n\1 ', section_text)
+        
+        items = []
+        current_item = ""
+        
+        for line in section_text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
             
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
+            # Check if this is a new list item
+            # Matches generic bullets, numbers, and common emojis
+            if _BULLET_RE.match(line):
+                # Save previous item if valid
+                if current_item:
+                    items.append(current_item.strip())
                 
-                # Check if this is a new list item
-                # Matches generic bullets, numbers, and common emojis
-                is_new_item = re.match(r'^([-•*\d]+[.)]|\u26a0|\u26a1|\u2705|⚠|⚠️)\s+', line)
+                # Start new item: remove the bullet/number/emoji and ** markers
+                current_item = _BOLD_RE.sub(r'\1', _BULLET_RE.sub('', line))
+            else:
+                # Continuation of previous item OR content following a standalone bullet
+                # Filter out purely intro sentences if we haven't started items yet
+                is_intro = line.endswith(':') or "metrics are" in line.lower() or "factors are" in line.lower()
                 
-                if is_new_item:
-                    # Save previous item if valid
-                    if current_item:
-                        items.append(current_item.strip())
-                    
-                    # Start new item
-                    # Remove the bullet/number/emoji
-                    cleaned = re.sub(r'^([-•*\d]+[.)]|\u26a0|\u26a1|\u2705|⚠|⚠️)\s+', '', line)
-                    # Remove ** markers
-                    cleaned = re.sub(r'\*\*([^*]+)\*\*', r'\1', cleaned)
-                    current_item = cleaned
-                else:
-                    # Continuation of previous item OR content following a standalone bullet
-                    # Filter out purely intro sentences if we haven't started items yet
-                    is_intro = line.strip().endswith(':') or "metrics are" in line.lower() or "factors are" in line.lower()
-                    
-                    if not current_item and is_intro:
-                        continue
-                        
-                    if current_item:
-                        current_item += " " + line
-                    else:
-                        # Case: No bullet yet, but not an intro. Treat as item if substantial.
-                        # Exclude isolated emojis or symbols
-                        if len(line) > 3 and not re.match(r'^[⚠⚠️:.]+$', line):
-                            current_item = line
-            
-            # Don't forget the last item
-            if current_item:
-                items.append(current_item.strip())
-            
-            # Filter out empty items or items that are just short symbols/garbage
-            items = [i for i in items if len(i) > 3 and not re.match(r'^[⚠⚠️:.]+$', i)]
-            
-            # Fallback to sentence splitting if we didn't find structured items
-            if not items:
-                sentences = [s.strip() for s in re.split(r'[.;]', section_text) if len(s.strip()) > 20]
-                items = sentences[:5] if sentences else ["To be determined during detailed analysis"]
-            
-            return items
-        
-        # Extract all sections
-        impact = BusinessImpact(
-            cost_savings=extract_section(response, "COST SAVINGS"),
-            revenue_potential=extract_section(response, "REVENUE POTENTIAL"),
-            time_savings=extract_section(response, "TIME SAVINGS"),
-            roi_estimate=extract_section(response, "ROI ESTIMATE"),
-            risk_reduction=extract_section(response, "RISK REDUCTION"),
-            competitive_advantage=extract_section(response, "COMPETITIVE ADVANTAGE"),
-            implementation_timeline=extract_section(response, "IMPLEMENTATION TIMELINE"),
-            resource_requirements=extract_section(response, "RESOURCE REQUIREMENTS"),
-            key_metrics=extract_list_items(response, "KEY METRICS"),
-            success_factors=extract_list_items(response, "SUCCESS FACTORS"),
-            potential_challenges=extract_list_items(response, "POTENTIAL CHALLENGES")
-        )
+                if not current_item and is_intro:
+                    continue
+                
+                if current_item:
+                    current_item += " " + line
+                elif len(line) > 3 and not _SYMBOLS_ONLY_RE.match(line):
+                    # Case: No bullet yet, but not an intro. Treat as item if substantial.
+                    current_item = line
         
-        return impact
-
+        # Don't forget the last item
+        if current_item:
+            items.append(current_item.strip())
+        
+        # Filter out empty items or items that are just short symbols/garbage
+        items = [i for i in items if len(i) > 3 and not _SYMBOLS_ONLY_RE.match(i)]
+        
+        # Fallback to sentence splitting if we didn't find structured items
+        if not items:
+            sentences = [s.strip() for s in _SENTENCE_SPLIT_RE.split(section_text) if len(s.strip()) > 20]
+            items = sentences[:5] if sentences else ["To be determined during detailed analysis"]
+        
+        return items
 
 def main():
     """Demo the business impact analyzer"""
-    import sys
-    
     # Example usage
     analyzer = BusinessImpactAnalyzer(llm_provider="groq")
     
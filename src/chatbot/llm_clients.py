@@ -0,0 +1,143 @@
+"""
+Shared LLM client factories
+Clients are created once per provider and reused by every
+AIConsultant / BusinessImpactAnalyzer in the process
+"""
+import os
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import httpx
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Default model per provider
+DEFAULT_MODELS = {
+    "groq": "llama-3.3-70b-versatile",  # Fast and powerful
+    "anthropic": "claude-3-5-sonnet-20241022",
+    "openai": "gpt-4-turbo-preview",
+}
+
+
+def create_http_client(
+    max_connections: int = 32,
+    max_keepalive_connections: int = 16,
+    timeout: Optional[float] = None
+) -> httpx.Client:
+    """Sync keep-alive (HTTP/2 when available) pool shared by a provider's calls"""
+    kwargs = {} if timeout is None else {"timeout": timeout}
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        ),
+        **kwargs
+    )
+
+
+@lru_cache(maxsize=4)
+def get_llm_client(provider: str):
+    """Get the (cached) sync client for an LLM provider"""
+    if provider == "groq":
+        from groq import Groq
+        return Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=create_http_client())
+    elif provider == "anthropic":
+        from anthropic import Anthropic
+        return Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), http_client=create_http_client())
+    elif provider == "openai":
+        from openai import OpenAI
+        return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=create_http_client())
+    
+    raise ValueError(f"Unsupported LLM provider: {provider}")
+
+
+def create_async_http_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    timeout: Optional[float] = None
+) -> httpx.AsyncClient:
+    """Keep-alive (HTTP/2 when available) pool so concurrent calls reuse TCP/TLS"""
+    kwargs = {} if timeout is None else {"timeout": timeout}
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        ),
+        **kwargs
+    )
+
+
+@lru_cache(maxsize=8)
+def get_async_llm_client(provider: str, http_client: Optional[httpx.AsyncClient] = None):
+    """
+    Get the (cached) async client for an LLM provider
+    
+    Args:
+        provider: 'groq', 'anthropic' or 'openai'
+        http_client: Connection pool to send requests through (a private one if None)
+    """
+    http_client = http_client or create_async_http_client()
+    
+    if provider == "groq":
+        from groq import AsyncGroq
+        return AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=http_client)
+    elif provider == "anthropic":
+        from anthropic import AsyncAnthropic
+        return AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), http_client=http_client)
+    elif provider == "openai":
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+    
+    raise ValueError(f"Unsupported LLM provider: {provider}")
+
+
+def anthropic_system(text: str) -> List[Dict]:
+    """System prompt as a cacheable content block (Anthropic prompt caching)"""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+def warm_llm_client(provider: str, client, model: str):
+    """
+    Open the provider connection (DNS + TCP + TLS) before the first real call
+    
+    Cheap request: a model listing, or a 1-token completion for Anthropic.
+    The keep-alive pool then hands the open connection to the next call.
+    """
+    try:
+        if provider == "anthropic":
+            client.messages.create(
+                model=model,
+                max_tokens=1,
+                messages=[{"role": "user", "content": "ping"}]
+            )
+        else:
+            client.models.list()
+        logger.info(f"✅ {provider} connection warmed up")
+    except Exception as e:
+        logger.warning(f"LLM warmup failed: {e}")
+
+
+async def awarm_llm_client(provider: str, client, model: str):
+    """Async version of warm_llm_client (for the async clients' pool)"""
+    try:
+        if provider == "anthropic":
+            await client.messages.create(
+                model=model,
+                max_tokens=1,
+                messages=[{"role": "user", "content": "ping"}]
+            )
+        else:
+            await client.models.list()
+        logger.info(f"✅ {provider} async connection warmed up")
+    except Exception as e:
+        logger.warning(f"LLM warmup failed: {e}")
@@ -2,26 +2,117 @@
 Vector database manager using ChromaDB
 Handles embedding creation and similarity search
 """
-import json
+import os
+import asyncio
+import atexit
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import logging
 
+import numpy as np
+import orjson
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 
+# ONNX Runtime is optional - query encoding falls back to the PyTorch model
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Set bits per byte, for Hamming distances on NumPy < 2.0 (no np.bitwise_count)
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def select_device() -> str:
+    """Best available torch device: cuda, then mps, then cpu"""
+    import torch
+    
+    if torch.cuda.is_available():
+        return "cuda"
+    if getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+@lru_cache(maxsize=4)
+def get_embedder(model_name: str) -> SentenceTransformer:
+    """
+    Load a sentence-transformer once per process and share it between VectorStores
+    
+    On a GPU (CUDA/MPS) the model runs in FP16; on CPU torch gets half the
+    cores, leaving the rest for tokenization and the server.
+    """
+    import torch
+    
+    device = select_device()
+    logger.info(f"Loading HuggingFace embedding model: {model_name} ({device})")
+    model = SentenceTransformer(model_name, device=device)
+    
+    if device != "cpu":
+        model.half()
+    else:
+        torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+    
+    return model
+
+
+def export_onnx_encoder(model_name: str, output_dir: str) -> Path:
+    """
+    Export a sentence-transformer to ONNX and dynamic-quantize it to INT8
+    (needs optimum[onnxruntime]; only run once, offline)
+    
+    Returns:
+        Path of the INT8 model, usable as VectorStore(onnx_model_path=...)
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoTokenizer
+    
+    output_dir = Path(output_dir)
+    ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+    
+    int8_path = output_dir / "model_int8.onnx"
+    quantize_dynamic(str(output_dir / "model.onnx"), str(int8_path), weight_type=QuantType.QInt8)
+    logger.info(f"✅ Exported INT8 ONNX encoder to {int8_path}")
+    return int8_path
+
 
 class VectorStore:
     """Manages embeddings and retrieval using ChromaDB"""
     
+    QUERY_CACHE_FILE = "qcache.npz"
+    EMBEDDING_CACHE_FILE = "embeddings_cache.f32"
+    EMBEDDING_INDEX_FILE = "embeddings_cache.json"
+    # Memory-mapped float32 matrix embed_and_store encodes into (deleted afterwards)
+    SCRATCH_FILE = "corpus_embeddings.f32"
+    ENCODE_BLOCK_SIZE = 8192
+    # Most queries aencode_query encodes in one model call
+    QUERY_BATCH_SIZE = 32
+    
     def __init__(
         self, 
         persist_directory: str = "data/vectordb",
-        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        hnsw_space: str = "cosine",
+        hnsw_m: int = 32,
+        hnsw_construction_ef: int = 200,
+        hnsw_search_ef: int = 64,
+        hnsw_num_threads: Optional[int] = None,
+        query_cache_size: int = 1024,
+        onnx_model_path: Optional[str] = None
     ):
         """
         Initialize vector store
@@ -29,6 +120,14 @@ class VectorStore:
         Args:
             persist_directory: Directory to persist the database
             embedding_model: Sentence transformer model for embeddings
+            hnsw_space: Distance function - "cosine", "ip" or "l2" (applied when the collection is created)
+            hnsw_m: HNSW graph out-degree (on creation)
+            hnsw_construction_ef: HNSW build-time candidate list size (on creation)
+            hnsw_search_ef: HNSW query-time candidate list size (on creation)
+            hnsw_num_threads: Threads for index builds (default: one per CPU core)
+            query_cache_size: Number of query embeddings kept (LRU, persisted across restarts)
+            onnx_model_path: INT8 ONNX export of embedding_model (see export_onnx_encoder)
+                used for query encoding; bulk embedding keeps the PyTorch model
         """
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(parents=True, exist_ok=True)
@@ -38,86 +137,397 @@ class VectorStore:
             path=str(self.persist_directory)
         )
         
-        # Initialize embedding model
-        logger.info(f"Loading HuggingFace embedding model: {embedding_model}")
-        self.embedding_model = SentenceTransformer(embedding_model)
+        # Initialize embedding model (cached across instances)
+        self.embedding_model = get_embedder(embedding_model)
         self.model_name = embedding_model
         
-        # Create or get ChromaDB collection
+        # Create or get ChromaDB collection. Searches go through Chroma's HNSW
+        # (approximate) index; search(..., exact=True) does a flat scan instead.
         self.collection = self.client.get_or_create_collection(
             name="ai_use_cases",
             metadata={
                 "description": "AI/ML/DL/RL use cases and solutions",
                 "embedding_model": embedding_model,
-                "vector_db": "ChromaDB"
+                "vector_db": "ChromaDB",
+                "hnsw:space": hnsw_space,
+                "hnsw:M": hnsw_m,
+                "hnsw:construction_ef": hnsw_construction_ef,
+                "hnsw:search_ef": hnsw_search_ef,
+                "hnsw:num_threads": hnsw_num_threads or os.cpu_count() or 1
             }
         )
         
+        # Bumped whenever documents are added, so callers can invalidate cached searches
+        self.generation = 0
+        
+        # 1-bit/dim codes for search(..., binary=True): (generation, ids, thresholds, packed codes)
+        self._binary_index = None
+        
+        # Exact-text query embedding cache, saved to QUERY_CACHE_FILE at exit
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_size = query_cache_size
+        self._query_cache_lock = threading.Lock()
+        self._load_query_cache()
+        atexit.register(self.save_query_cache)
+        
+        # (session, tokenizer, normalize), loaded on first query; False if unavailable
+        self.onnx_model_path = onnx_model_path
+        self._onnx_encoder = None
+        
+        # aencode_query's micro-batcher, created on first use in an event loop
+        self._encode_queue: Optional[asyncio.Queue] = None
+        self._encode_loop = None
+        self._encode_worker = None
+        
         logger.info(f"✅ ChromaDB initialized with {self.collection.count()} documents")
         logger.info(f"✅ Using HuggingFace model: {embedding_model}")
     
-    def embed_and_store(self, chunks_file: str = "data/processed/chunks.jsonl"):
-        """Embed chunks and store in vector database"""
+    def embed_and_store(self, chunks_file: str = "data/processed/chunks.jsonl", quantize: bool = True):
+        """
+        Embed chunks and store in vector database
+        
+        Args:
+            chunks_file: JSONL file written by UseChaseChunker.save_chunks
+            quantize: Keep embeddings as 8-bit codes until insert (small, <1% recall cost)
+        """
         
         chunks_path = Path(chunks_file)
         if not chunks_path.exists():
             raise FileNotFoundError(f"Chunks file not found: {chunks_file}")
         
-        # Load chunks
-        chunks = []
-        with open(chunks_path, 'r', encoding='utf-8') as f:
+        # Load chunks straight into the columns ChromaDB takes, in one pass,
+        # streaming lines so the raw file is never held in memory as a whole
+        documents, ids, metadatas = [], [], []
+        list_keys: Dict[str, frozenset] = {}
+        with open(chunks_path, 'rb') as f:
             for line in f:
-                chunks.append(json.loads(line))
+                chunk = orjson.loads(line)
+                documents.append(chunk['text'])
+                ids.append(chunk['chunk_id'])
+                metadatas.append(self._chroma_metadata(chunk, list_keys))
         
-        logger.info(f"Loaded {len(chunks)} chunks")
+        logger.info(f"Loaded {len(documents)} chunks")
         
-        # Prepare data for ChromaDB
-        documents = [chunk['text'] for chunk in chunks]
-        ids = [chunk['chunk_id'] for chunk in chunks]
-        metadatas = []
+        # Create embeddings using HuggingFace model (only for texts not embedded before).
+        # The matrix is a memory-mapped scratch file, so only the pages in use stay resident
+        logger.info(f"Creating embeddings with HuggingFace model: {self.model_name}...")
+        embeddings = self._encode_with_cache(documents)
+        calibration = None
         
-        # Prepare metadata (ChromaDB only accepts str, int, float, bool, None)
-        for chunk in chunks:
-            metadata = chunk['metadata'].copy()
-            metadata['chunk_type'] = chunk['chunk_type']
+        try:
+            if quantize:
+                # Swap the float32 scratch matrix for 8-bit codes (4x less RAM) before the
+                # insert - dropping the last reference unmaps it so the file can go
+                embeddings, vmin, scale = self._quantize_8bit(embeddings)
+                (self.persist_directory / self.SCRATCH_FILE).unlink(missing_ok=True)
+                calibration = (vmin, scale)
+                logger.info("✅ Quantized embeddings to 8 bits per dimension")
             
-            # Convert lists to comma-separated strings
-            for key, value in metadata.items():
-                if isinstance(value, list):
-                    metadata[key] = ', '.join(str(v) for v in value)
+            self._store(documents, ids, metadatas, embeddings, calibration=calibration)
+        finally:
+            del embeddings
+            (self.persist_directory / self.SCRATCH_FILE).unlink(missing_ok=True)
+    
+    def _encode_with_cache(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts, reusing embeddings of identical texts from earlier runs
+        
+        Embeddings are kept in EMBEDDING_CACHE_FILE (raw float32 rows, append-only)
+        + EMBEDDING_INDEX_FILE (text hash -> row) in persist_directory, so re-running
+        the pipeline only encodes new or changed chunks.
+        """
+        cached, rows = self._load_embedding_cache()
+        keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest() for text in texts]
+        
+        hits = [i for i, key in enumerate(keys) if key in rows]
+        misses = [i for i, key in enumerate(keys) if key not in rows]
+        logger.info(f"♻️  Reusing {len(hits)} cached embeddings, encoding {len(misses)}")
+        
+        dim = cached.shape[1] if cached is not None else self.embedding_model.get_sentence_embedding_dimension()
+        embeddings = np.memmap(
+            self.persist_directory / self.SCRATCH_FILE,
+            dtype=np.float32,
+            mode='w+',
+            shape=(max(len(texts), 1), dim)
+        )[:len(texts)]
+        
+        for start in range(0, len(hits), self.ENCODE_BLOCK_SIZE):
+            block = hits[start:start + self.ENCODE_BLOCK_SIZE]
+            embeddings[block] = cached[[rows[keys[i]] for i in block]]
+        
+        # Unmap before the file is appended to (Windows refuses to resize a mapped file)
+        reset = cached is None
+        del cached
+        
+        if not misses:
+            return embeddings
+        
+        self._encode_corpus([texts[i] for i in misses], out=embeddings, out_rows=misses)
+        
+        # Append the new rows (a text repeated within this run is stored once)
+        new_keys = {}
+        for i in misses:
+            new_keys.setdefault(keys[i], i)
+        self._append_embedding_cache(embeddings, new_keys, rows, dim, reset=reset)
+        
+        return embeddings
+    
+    def _load_embedding_cache(self) -> Tuple[Optional[np.ndarray], Dict[str, int]]:
+        matrix_path = self.persist_directory / self.EMBEDDING_CACHE_FILE
+        index_path = self.persist_directory / self.EMBEDDING_INDEX_FILE
+        if not matrix_path.exists() or not index_path.exists():
+            return None, {}
+        
+        try:
+            index = orjson.loads(index_path.read_bytes())
+            if index.get('model') != self.model_name or 'dim' not in index:
+                return None, {}
             
-            metadatas.append(metadata)
+            dim = index['dim']
+            n_rows = matrix_path.stat().st_size // (dim * 4)
+            if n_rows == 0:
+                return None, {}
+            rows = {key: row for key, row in index['rows'].items() if row < n_rows}
+            return np.memmap(matrix_path, dtype=np.float32, mode='r', shape=(n_rows, dim)), rows
+        except Exception as e:
+            logger.warning(f"Could not load embedding cache: {e}")
+            return None, {}
+    
+    def _append_embedding_cache(
+        self,
+        embeddings: np.ndarray,
+        new_keys: Dict[str, int],
+        rows: Dict[str, int],
+        dim: int,
+        reset: bool = False
+    ):
+        """
+        Append embeddings[new_keys.values()] to the matrix file, then swap in the new index
         
-        # Create embeddings using HuggingFace model
-        logger.info(f"Creating embeddings with HuggingFace model: {self.model_name}...")
-        embeddings = self.embedding_model.encode(
-            documents, 
-            show_progress_bar=True,
-            convert_to_numpy=True,
-            batch_size=32
+        The matrix is written (and fsynced) before the index, and new rows are numbered
+        from the file's actual length - a crash in between only leaves unreferenced rows.
+        """
+        matrix_path = self.persist_directory / self.EMBEDDING_CACHE_FILE
+        index_path = self.persist_directory / self.EMBEDDING_INDEX_FILE
+        row_bytes = dim * 4
+        
+        matrix_path.touch(exist_ok=True)
+        with open(matrix_path, 'r+b') as f:
+            # Drop stale rows (other model) or a partially written trailing row
+            n_rows = 0 if reset else os.fstat(f.fileno()).st_size // row_bytes
+            f.truncate(n_rows * row_bytes)
+            f.seek(n_rows * row_bytes)
+            
+            positions = list(new_keys.values())
+            for start in range(0, len(positions), self.ENCODE_BLOCK_SIZE):
+                block = positions[start:start + self.ENCODE_BLOCK_SIZE]
+                f.write(np.ascontiguousarray(embeddings[block], dtype=np.float32).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        
+        for offset, key in enumerate(new_keys):
+            rows[key] = n_rows + offset
+        
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        tmp_path.write_bytes(orjson.dumps({'model': self.model_name, 'dim': dim, 'rows': rows}))
+        os.replace(tmp_path, index_path)
+    
+    def _encode_corpus(
+        self,
+        texts: List[str],
+        out: Optional[np.ndarray] = None,
+        out_rows: Optional[List[int]] = None,
+        min_per_process: int = 2000
+    ) -> np.ndarray:
+        """
+        Bulk-encode documents, spreading the work over one process per CPU core
+        
+        Tokenization and batch assembly hold the GIL, so a single process can't
+        keep every core busy. GPU models and small corpora stay single-process
+        (worker start-up costs a model load per process).
+        
+        Texts are encoded shortest-first so every batch (and every worker's
+        chunk) pads to a similar length, in blocks of ENCODE_BLOCK_SIZE that
+        are written straight to their rows of out (e.g. a np.memmap).
+        
+        Args:
+            texts: Documents to encode
+            out: Destination matrix (a new in-memory array if None)
+            out_rows: Row of out for each text (default: row i for texts[i])
+            min_per_process: Use worker processes only with this many texts per worker
+        """
+        if out is None:
+            out = np.empty((len(texts), self.embedding_model.get_sentence_embedding_dimension()), dtype=np.float32)
+        out_rows = np.arange(len(texts)) if out_rows is None else np.asarray(out_rows)
+        
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        
+        with self._corpus_encoder(len(texts), min_per_process) as encode:
+            for start in range(0, len(texts), self.ENCODE_BLOCK_SIZE):
+                block = order[start:start + self.ENCODE_BLOCK_SIZE]
+                out[out_rows[block]] = encode([texts[i] for i in block])
+                if isinstance(out, np.memmap):
+                    out.flush()
+                logger.info(f"Encoded {start + len(block)}/{len(texts)} texts")
+        
+        return out
+    
+    @contextmanager
+    def _corpus_encoder(self, n_texts: int, min_per_process: int) -> Iterator[Callable[[List[str]], np.ndarray]]:
+        """Yield an encode(texts) function, backed by a process pool for large CPU jobs"""
+        n_workers = min(os.cpu_count() or 1, n_texts // min_per_process)
+        
+        if self.embedding_model.device.type != "cpu" or n_workers < 2:
+            # Short-first batches are cheap, so they can be bigger
+            yield lambda texts: self.embedding_model.encode(
+                texts,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                batch_size=128
+            )
+            return
+        
+        logger.info(f"Encoding with {n_workers} worker processes")
+        
+        # Workers inherit the environment at spawn: one torch thread each, so
+        # n_workers processes don't oversubscribe the cores
+        previous = os.environ.get("OMP_NUM_THREADS")
+        os.environ["OMP_NUM_THREADS"] = "1"
+        try:
+            pool = self.embedding_model.start_multi_process_pool(target_devices=["cpu"] * n_workers)
+        finally:
+            if previous is None:
+                os.environ.pop("OMP_NUM_THREADS")
+            else:
+                os.environ["OMP_NUM_THREADS"] = previous
+        
+        try:
+            yield lambda texts: self.embedding_model.encode_multi_process(
+                texts, pool, batch_size=64, chunk_size=500
+            )
+        finally:
+            self.embedding_model.stop_multi_process_pool(pool)
+    
+    @staticmethod
+    def _quantize_8bit(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-dimension min/max scalar quantization
+        
+        Returns:
+            (uint8 codes, per-dimension minimum, per-dimension scale);
+            codes * scale + vmin approximately reconstructs embeddings
+        """
+        vmin = np.asarray(embeddings.min(axis=0), dtype=np.float32)
+        scale = (np.asarray(embeddings.max(axis=0), dtype=np.float32) - vmin) / 255.0
+        scale[scale == 0] = 1.0  # constant dimension - every code is 0
+        
+        # Blockwise, so a memory-mapped input never gets a full float32 temporary
+        codes = np.empty(embeddings.shape, dtype=np.uint8)
+        for start in range(0, len(embeddings), 65536):
+            block = np.asarray(embeddings[start:start + 65536], dtype=np.float32)
+            codes[start:start + 65536] = np.rint((block - vmin) / scale).astype(np.uint8)
+        
+        return codes, vmin, scale.astype(np.float32)
+    
+    def add_with_embeddings(
+        self,
+        chunks: List[Dict],
+        embeddings,
+        calibration: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ):
+        """
+        Store chunks with precomputed embeddings (skips re-embedding)
+        
+        Args:
+            chunks: Chunk dicts as produced by UseChaseChunker
+            embeddings: Array of shape (len(chunks), dim), row i embeds chunks[i]['text']
+            calibration: (vmin, scale) if embeddings are 8-bit codes from _quantize_8bit;
+                each batch is dequantized to float32 just before insert
+        """
+        if len(chunks) != len(embeddings):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(chunks)} chunks")
+        
+        list_keys: Dict[str, frozenset] = {}
+        self._store(
+            documents=[chunk['text'] for chunk in chunks],
+            ids=[chunk['chunk_id'] for chunk in chunks],
+            metadatas=[self._chroma_metadata(chunk, list_keys) for chunk in chunks],
+            embeddings=embeddings,
+            calibration=calibration
         )
+    
+    @staticmethod
+    def _chroma_metadata(chunk: Dict, list_keys: Dict[str, frozenset]) -> Dict:
+        """
+        Chunk metadata plus chunk_type, lists flattened (ChromaDB only accepts str, int, float, bool, None)
+        
+        Args:
+            chunk: Chunk dict
+            list_keys: chunk_type -> metadata keys holding lists, filled from the
+                first chunk of each type (every chunk of a type has the same shape)
+        """
+        metadata = chunk['metadata']
+        chunk_type = chunk['chunk_type']
+        
+        keys = list_keys.get(chunk_type)
+        if keys is None:
+            keys = list_keys[chunk_type] = frozenset(k for k, v in metadata.items() if type(v) is list)
+        
+        # Convert lists to comma-separated strings
+        return {
+            **metadata,
+            'chunk_type': chunk_type,
+            **{k: ', '.join(map(str, metadata[k])) for k in keys if type(metadata.get(k)) is list}
+        }
+    
+    def _store(
+        self,
+        documents: List[str],
+        ids: List[str],
+        metadatas: List[Dict],
+        embeddings,
+        calibration: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ):
+        """Add prepared columns to the collection in batches"""
+        n = len(documents)
         
-        # Store in ChromaDB (batch processing for large datasets)
-        batch_size = 100
-        for i in range(0, len(chunks), batch_size):
-            batch_end = min(i + batch_size, len(chunks))
+        # Store in ChromaDB in large batches (bounded by what the client accepts)
+        batch_size = 5000
+        if hasattr(self.client, "get_max_batch_size"):
+            batch_size = min(batch_size, self.client.get_max_batch_size())
+        for i in range(0, n, batch_size):
+            batch_end = min(i + batch_size, n)
+            
+            if calibration is not None:
+                vmin, scale = calibration
+                batch_embeddings = embeddings[i:batch_end] * scale + vmin
+            else:
+                batch_embeddings = np.array(embeddings[i:batch_end], dtype=np.float32)
             
+            # Unit vectors: cosine distance is then a plain dot product in the index
+            batch_embeddings /= np.maximum(np.linalg.norm(batch_embeddings, axis=1, keepdims=True), 1e-12)
+            
+            # Chroma takes the float32 array as is - no per-float Python objects
             self.collection.add(
                 documents=documents[i:batch_end],
-                embeddings=embeddings[i:batch_end].tolist(),
+                embeddings=batch_embeddings,
                 ids=ids[i:batch_end],
                 metadatas=metadatas[i:batch_end]
             )
             
-            logger.info(f"Stored batch {i//batch_size + 1} ({batch_end}/{len(chunks)} chunks)")
+            logger.info(f"Stored batch {i//batch_size + 1} ({batch_end}/{n} chunks)")
         
-        logger.info(f"✅ Stored {len(chunks)} chunks in vector database")
+        self.generation += 1
+        logger.info(f"✅ Stored {n} chunks in vector database")
     
     def search(
         self, 
         query: str, 
         n_results: int = 5,
-        filter_dict: Optional[Dict] = None
+        filter_dict: Optional[Dict] = None,
+        exact: bool = False,
+        binary: bool = False,
+        overfetch: int = 5
     ) -> List[Dict]:
         """
         Search for similar use cases
@@ -126,12 +536,51 @@ class VectorStore:
             query: User's problem description
             n_results: Number of results to return
             filter_dict: Optional metadata filters
+            exact: Scan every stored embedding instead of using the HNSW index
+            binary: Hamming-distance prefilter over 1-bit codes, then rerank the
+                overfetch * n_results candidates with their float embeddings
+            overfetch: Candidate multiplier for binary search
         
         Returns:
             List of relevant use cases with metadata
         """
-        # Create query embedding with HuggingFace model
-        query_embedding = self.embedding_model.encode(query).tolist()
+        # Create query embedding with HuggingFace model (cached per query text)
+        query_embedding = self.encode_query(query).tolist()
+        return self._search_embedding(query_embedding, n_results, filter_dict, exact, binary, overfetch)
+    
+    async def asearch(
+        self,
+        query: str,
+        n_results: int = 5,
+        filter_dict: Optional[Dict] = None,
+        exact: bool = False,
+        binary: bool = False,
+        overfetch: int = 5
+    ) -> List[Dict]:
+        """
+        Async search() - the query embedding goes through aencode_query, so
+        concurrent searches share encoder calls; the ChromaDB query runs in a thread
+        """
+        query_embedding = (await self.aencode_query(query)).tolist()
+        return await asyncio.to_thread(
+            self._search_embedding, query_embedding, n_results, filter_dict, exact, binary, overfetch
+        )
+    
+    def _search_embedding(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        filter_dict: Optional[Dict],
+        exact: bool,
+        binary: bool,
+        overfetch: int
+    ) -> List[Dict]:
+        if exact:
+            return self._exact_search(query_embedding, n_results, filter_dict)
+        
+        # Filtered searches stay on the HNSW path - the prefilter can't see metadata
+        if binary and not filter_dict:
+            return self._binary_search(query_embedding, n_results, overfetch)
         
         # Search in ChromaDB using vector similarity
         results = self.collection.query(
@@ -153,6 +602,345 @@ class VectorStore:
         
         return formatted_results
     
+    def search_batch(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        filter_dict: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """
+        Search for several queries with one embedding pass and one ChromaDB query
+        
+        Args:
+            queries: Problem descriptions
+            n_results: Number of results per query
+            filter_dict: Optional metadata filters
+        
+        Returns:
+            One result list (same format as search()) per query
+        """
+        if not queries:
+            return []
+        
+        # Only encode the queries that aren't cached
+        vectors = [self._cached_query(query) for query in queries]
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        if misses:
+            encoded = self._encode_queries([queries[i] for i in misses])
+            for i, vector in zip(misses, encoded):
+                vectors[i] = vector
+                self._remember_query(queries[i], vector)
+        
+        results = self.collection.query(
+            query_embeddings=np.vstack(vectors).tolist(),
+            n_results=n_results,
+            where=filter_dict if filter_dict else None
+        )
+        
+        distances = results.get('distances')
+        return [
+            [
+                {
+                    'chunk_id': results['ids'][q][i],
+                    'document': results['documents'][q][i],
+                    'metadata': results['metadatas'][q][i],
+                    'distance': distances[q][i] if distances else None
+                }
+                for i in range(len(results['ids'][q]))
+            ]
+            for q in range(len(queries))
+        ]
+    
+    def encode_query(self, query: str) -> np.ndarray:
+        """Embed a query, reusing the embedding of an identical earlier query"""
+        vector = self._cached_query(query)
+        if vector is None:
+            vector = self._encode_queries([query])[0]
+            self._remember_query(query, vector)
+        return vector
+    
+    async def aencode_query(self, query: str) -> np.ndarray:
+        """
+        Async encode_query - queries that arrive while the encoder is busy are
+        queued and encoded together in one batch; a lone query is encoded right away
+        """
+        vector = self._cached_query(query)
+        if vector is not None:
+            return vector
+        
+        loop = asyncio.get_running_loop()
+        if self._encode_loop is not loop:
+            self._encode_loop = loop
+            self._encode_queue = asyncio.Queue()
+            self._encode_worker = loop.create_task(self._batch_encode_worker(self._encode_queue))
+        
+        future = loop.create_future()
+        self._encode_queue.put_nowait((query, future))
+        return await future
+    
+    async def _batch_encode_worker(self, queue: asyncio.Queue):
+        """Encode queued queries, batching everything that queued up during the previous encode"""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.QUERY_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            queries = [query for query, _ in batch]
+            try:
+                vectors = await asyncio.to_thread(self._encode_queries, queries)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (query, future), vector in zip(batch, vectors):
+                self._remember_query(query, vector)
+                if not future.done():
+                    future.set_result(vector)
+    
+    def _encode_queries(self, queries: List[str]) -> List[np.ndarray]:
+        """Encode uncached queries with the ONNX encoder if loaded, else in one model batch"""
+        encoder = self._get_onnx_encoder()
+        if encoder:
+            return [self._encode_query_onnx(query, *encoder) for query in queries]
+        
+        return list(self.embedding_model.encode(
+            queries,
+            batch_size=self.QUERY_BATCH_SIZE,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ))
+    
+    def _get_onnx_encoder(self):
+        if self._onnx_encoder is not None:
+            return self._onnx_encoder
+        
+        if not self.onnx_model_path or not ONNXRUNTIME_AVAILABLE:
+            self._onnx_encoder = False
+            return False
+        
+        try:
+            model_path = Path(self.onnx_model_path)
+            session = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+            tokenizer = AutoTokenizer.from_pretrained(str(model_path.parent))
+            normalize = any(type(module).__name__ == "Normalize" for module in self.embedding_model)
+            self._onnx_encoder = (session, tokenizer, normalize)
+            logger.info(f"✅ Using ONNX Runtime query encoder: {model_path}")
+        except Exception as e:
+            logger.warning(f"Could not load ONNX encoder, using PyTorch: {e}")
+            self._onnx_encoder = False
+        
+        return self._onnx_encoder
+    
+    def _encode_query_onnx(self, query: str, session, tokenizer, normalize: bool) -> np.ndarray:
+        """Encode one query with the ONNX model, mean-pooled like the sentence-transformer"""
+        tokens = tokenizer(
+            [query],
+            truncation=True,
+            max_length=self.embedding_model.max_seq_length,
+            return_tensors="np"
+        )
+        feeds = {
+            inp.name: tokens[inp.name].astype(np.int64)
+            for inp in session.get_inputs() if inp.name in tokens
+        }
+        hidden = session.run(None, feeds)[0]  # (1, seq_len, dim)
+        
+        mask = tokens["attention_mask"][..., np.newaxis].astype(np.float32)
+        vector = ((hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9))[0]
+        
+        if normalize:
+            vector /= max(np.linalg.norm(vector), 1e-12)
+        return vector.astype(np.float32)
+    
+    def _cached_query(self, query: str) -> Optional[np.ndarray]:
+        with self._query_cache_lock:
+            vector = self._query_cache.get(query)
+            if vector is not None:
+                self._query_cache.move_to_end(query)
+            return vector
+    
+    def _remember_query(self, query: str, vector: np.ndarray):
+        with self._query_cache_lock:
+            self._query_cache[query] = vector
+            self._query_cache.move_to_end(query)
+            while len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+    
+    def save_query_cache(self):
+        """Write the query embedding cache to persist_directory (also runs at exit)"""
+        with self._query_cache_lock:
+            if not self._query_cache:
+                return
+            texts = list(self._query_cache.keys())
+            vectors = np.vstack(list(self._query_cache.values()))
+        
+        try:
+            np.savez(
+                self.persist_directory / self.QUERY_CACHE_FILE,
+                model=np.array(self.model_name),
+                texts=np.array(texts),
+                vectors=vectors
+            )
+        except Exception as e:
+            logger.warning(f"Could not save query cache: {e}")
+    
+    def _load_query_cache(self):
+        """Warm the query embedding cache from a previous run (same embedding model only)"""
+        path = self.persist_directory / self.QUERY_CACHE_FILE
+        if not path.exists():
+            return
+        
+        try:
+            with np.load(path) as data:
+                if str(data['model']) != self.model_name:
+                    return
+                texts = data['texts'].tolist()
+                vectors = data['vectors']
+        except Exception as e:
+            logger.warning(f"Could not load query cache from {path}: {e}")
+            return
+        
+        for text, vector in zip(texts[-self._query_cache_size:], vectors[-self._query_cache_size:]):
+            self._query_cache[text] = vector
+        logger.info(f"✅ Loaded {len(self._query_cache)} cached query embeddings")
+    
+    def _exact_search(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        filter_dict: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Flat (exact) nearest-neighbour search, same distance space as the collection"""
+        data = self.collection.get(
+            where=filter_dict if filter_dict else None,
+            include=['embeddings', 'documents', 'metadatas']
+        )
+        if not data['ids']:
+            return []
+        
+        distances = self._distances(data['embeddings'], query_embedding)
+        top = np.argsort(distances)[:n_results]
+        return [
+            {
+                'chunk_id': data['ids'][i],
+                'document': data['documents'][i],
+                'metadata': data['metadatas'][i],
+                'distance': float(distances[i])
+            }
+            for i in top
+        ]
+    
+    def _binary_search(self, query_embedding: List[float], n_results: int, overfetch: int) -> List[Dict]:
+        """Two-stage search: Hamming distance on 1-bit codes, then float rerank of the candidates"""
+        ids, thresholds, codes = self._get_binary_index()
+        if not ids:
+            return []
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_code = np.packbits(query > thresholds)
+        
+        # Popcount of XOR = number of differing bits
+        diff = np.bitwise_xor(codes, query_code)
+        counts = np.bitwise_count(diff) if hasattr(np, "bitwise_count") else _POPCOUNT8[diff]
+        hamming = counts.sum(axis=1, dtype=np.int32)
+        
+        n_candidates = min(len(ids), n_results * overfetch)
+        candidates = np.argpartition(hamming, n_candidates - 1)[:n_candidates]
+        
+        data = self.collection.get(
+            ids=[ids[i] for i in candidates],
+            include=['embeddings', 'documents', 'metadatas']
+        )
+        
+        distances = self._distances(data['embeddings'], query_embedding)
+        top = np.argsort(distances)[:n_results]
+        return [
+            {
+                'chunk_id': data['ids'][i],
+                'document': data['documents'][i],
+                'metadata': data['metadatas'][i],
+                'distance': float(distances[i])
+            }
+            for i in top
+        ]
+    
+    def _get_binary_index(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Build (once per generation) the packed 1-bit codes of every stored embedding"""
+        index = self._binary_index
+        if index is not None and index[0] == self.generation:
+            return index[1:]
+        
+        data = self.collection.get(include=['embeddings'])
+        if not data['ids']:
+            return [], None, None
+        
+        matrix = np.asarray(data['embeddings'], dtype=np.float32)
+        
+        # Thresholding at the per-dimension mean keeps the bits balanced even
+        # though MiniLM dimensions aren't centred on zero
+        thresholds = matrix.mean(axis=0)
+        codes = np.packbits(matrix > thresholds, axis=1)  # (N, dim / 8) uint8
+        
+        self._binary_index = (self.generation, data['ids'], thresholds, codes)
+        logger.info(f"✅ Built binary index over {len(data['ids'])} embeddings ({codes.nbytes} bytes)")
+        return data['ids'], thresholds, codes
+    
+    def _distances(self, embeddings, query_embedding) -> np.ndarray:
+        """Distances from query to each embedding, in the collection's distance space"""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        if space == "cosine":
+            norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+            return 1.0 - (matrix @ query) / np.maximum(norms, 1e-12)
+        if space == "ip":
+            return 1.0 - matrix @ query
+        
+        diff = matrix - query
+        return np.einsum('ij,ij->i', diff, diff)  # squared L2, as Chroma reports it
+    
+    def optimize_for_inference(self):
+        """
+        Switch the embedder to reduced precision for serving
+        
+        GPU models already run in FP16 (see get_embedder); on CPU the Linear
+        layers are dynamically quantized to INT8. The model is shared
+        (get_embedder cache), so this affects every VectorStore using it.
+        Call once at server startup, before warmup().
+        """
+        import torch
+        
+        model = self.embedding_model
+        if getattr(model, "_inference_optimized", False):
+            return
+        
+        try:
+            if model.device.type != "cpu":
+                logger.info(f"✅ Embedding model running in FP16 on {model.device.type.upper()}")
+            else:
+                torch.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                )
+                logger.info("✅ Embedding model quantized to INT8 for CPU")
+            model._inference_optimized = True
+        except Exception as e:
+            logger.warning(f"Could not optimize embedding model, keeping FP32: {e}")
+        
+        # Seed kernels/allocations for a short and a long query
+        model.encode(["warmup " * 16, "warmup " * 64], show_progress_bar=False)
+    
+    def warmup(self):
+        """
+        Run one throwaway encode + query so the first real search doesn't pay
+        for lazy weight loading, kernel setup and index page-in
+        """
+        embedding = self.embedding_model.encode(["warmup"], show_progress_bar=False)
+        if self.collection.count() > 0:
+            self.collection.query(query_embeddings=embedding.tolist(), n_results=1)
+    
     def search_by_problem_type(self, problem: str, data_type: str = None) -> List[Dict]:
         """Search for use cases matching a specific problem and data type"""
         
@@ -166,25 +954,21 @@ class VectorStore:
         """Get statistics about the vector store"""
         count = self.collection.count()
         
-        # Get sample to analyze metadata
-        sample = self.collection.get(limit=min(count, 100))
+        # Get sample to analyze metadata (metadata only - no documents/embeddings over the wire)
+        sample = self.collection.get(limit=min(count, 100), include=['metadatas'])
+        metadatas = sample['metadatas']
         
         # Count chunk types
-        chunk_types = {}
-        data_types = {}
-        
-        for metadata in sample['metadatas']:
-            chunk_type = metadata.get('chunk_type', 'unknown')
-            chunk_types[chunk_type] = chunk_types.get(chunk_type, 0) + 1
-            
-            data_type = metadata.get('data_type', 'unknown')
-            if data_type:
-                data_types[data_type] = data_types.get(data_type, 0) + 1
+        chunk_types = Counter(metadata.get('chunk_type', 'unknown') for metadata in metadatas)
+        data_types = Counter(
+            metadata.get('data_type', 'unknown') for metadata in metadatas
+            if metadata.get('data_type', 'unknown')
+        )
         
         return {
             'total_chunks': count,
-            'chunk_types': chunk_types,
-            'data_types': data_types
+            'chunk_types': dict(chunk_types),
+            'data_types': dict(data_types)
         }
 
 
@@ -195,7 +979,7 @@ def main():
     parser = argparse.ArgumentParser(description='Vector Store Manager')
     parser.add_argument(
         '--action',
-        choices=['embed', 'search', 'stats'],
+        choices=['embed', 'search', 'stats', 'export-onnx'],
         default='embed',
         help='Action to perform'
     )
@@ -205,8 +989,19 @@ def main():
         help='Search query (for search action)'
     )
     
+    parser.add_argument(
+        '--onnx-dir',
+        type=str,
+        default='data/onnx_model',
+        help='Output directory (for export-onnx action)'
+    )
+    
     args = parser.parse_args()
     
+    if args.action == 'export-onnx':
+        export_onnx_encoder("sentence-transformers/all-MiniLM-L6-v2", args.onnx_dir)
+        return
+    
     # Initialize vector store
     vector_store = VectorStore()
     
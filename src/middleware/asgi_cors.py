@@ -0,0 +1,132 @@
+"""
+Minimal pure-ASGI CORS middleware
+Answers preflight requests directly and adds Access-Control-* headers to
+responses by editing the raw ASGI header list - no Request/Response objects
+are built per request
+"""
+from typing import Dict, Iterable, List, Tuple
+
+Headers = List[Tuple[bytes, bytes]]
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+
+
+class PureASGICORS:
+    """CORS for the FastAPI apps, usable via app.add_middleware(PureASGICORS, ...)"""
+    
+    def __init__(
+        self,
+        app,
+        allow_origins: Iterable[str] = (),
+        allow_methods: Iterable[str] = ("GET",),
+        allow_headers: Iterable[str] = (),
+        allow_credentials: bool = False,
+        max_age: int = 600
+    ):
+        """
+        Initialize CORS middleware
+        
+        Args:
+            app: ASGI app to wrap
+            allow_origins: Allowed origins ("*" allows any)
+            allow_methods: Allowed methods ("*" allows all)
+            allow_headers: Allowed request headers ("*" echoes whatever the browser asks for)
+            allow_credentials: Send Access-Control-Allow-Credentials
+            max_age: Seconds browsers may cache a preflight response
+        """
+        self.app = app
+        self._origins = frozenset(allow_origins)
+        self._allow_all_origins = "*" in self._origins
+        self._allow_all_headers = "*" in allow_headers
+        self._allow_credentials = allow_credentials
+        
+        methods = ALL_METHODS if "*" in allow_methods else allow_methods
+        
+        # Origin-independent headers, built once
+        self._simple_headers: Headers = [(b"vary", b"Origin")]
+        if allow_credentials:
+            self._simple_headers.append((b"access-control-allow-credentials", b"true"))
+        
+        self._preflight_headers: Headers = self._simple_headers + [
+            (b"access-control-allow-methods", ", ".join(methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+        ]
+        if allow_headers and not self._allow_all_headers:
+            self._preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1"))
+            )
+        
+        # Complete header lists per configured origin, so a request from a known
+        # origin reuses a prebuilt list instead of allocating one
+        self._simple_by_origin: Dict[bytes, Headers] = {}
+        self._preflight_by_origin: Dict[bytes, Headers] = {}
+        for origin in self._origins - {"*"}:
+            key = origin.encode("latin-1")
+            allow_origin = [(b"access-control-allow-origin", self._allow_origin_value(key))]
+            self._simple_by_origin[key] = allow_origin + self._simple_headers
+            self._preflight_by_origin[key] = allow_origin + self._preflight_headers
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        origin = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        
+        # Not a cross-origin request
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        
+        allowed = self._allow_all_origins or origin.decode("latin-1") in self._origins
+        
+        if scope["method"] == "OPTIONS" and any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        ):
+            await self._preflight(origin, allowed, request_headers, send)
+            return
+        
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+        
+        cors_headers = self._simple_by_origin.get(origin)
+        if cors_headers is None:
+            cors_headers = [(b"access-control-allow-origin", self._allow_origin_value(origin))]
+            cors_headers += self._simple_headers
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    async def _preflight(self, origin: bytes, allowed: bool, request_headers, send):
+        """Answer an OPTIONS preflight without calling the app"""
+        if not allowed:
+            await send({"type": "http.response.start", "status": 400, "headers": [(b"content-type", b"text/plain")]})
+            await send({"type": "http.response.body", "body": b"Disallowed CORS origin"})
+            return
+        
+        headers = self._preflight_by_origin.get(origin)
+        if headers is None:
+            headers = [(b"access-control-allow-origin", self._allow_origin_value(origin))]
+            headers += self._preflight_headers
+        if self._allow_all_headers and request_headers:
+            headers = headers + [(b"access-control-allow-headers", request_headers)]
+        
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+    
+    def _allow_origin_value(self, origin: bytes) -> bytes:
+        # Credentialed responses can't use the wildcard
+        if self._allow_all_origins and not self._allow_credentials:
+            return b"*"
+        return origin
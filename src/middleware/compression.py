@@ -0,0 +1,129 @@
+"""
+Pure-ASGI response compression
+Brotli when the client accepts it and the brotli package is installed,
+gzip otherwise. Only complete (single-message) bodies are compressed -
+streamed responses such as the SSE consultation pass through untouched.
+"""
+import gzip
+from typing import Iterable, List, Tuple
+
+# Brotli is optional - falls back to gzip
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+Headers = List[Tuple[bytes, bytes]]
+
+COMPRESSIBLE_TYPES = (b"application/json", b"text/")
+
+
+class CompressionMiddleware:
+    """Compress JSON/text responses, usable via app.add_middleware(CompressionMiddleware, ...)"""
+    
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        brotli_quality: int = 4,
+        gzip_level: int = 6,
+        compressible_types: Iterable[bytes] = COMPRESSIBLE_TYPES
+    ):
+        """
+        Initialize compression middleware
+        
+        Args:
+            app: ASGI app to wrap
+            minimum_size: Bodies smaller than this (bytes) are sent as-is
+            brotli_quality: Brotli quality (0-11); 4 is fast with a good ratio on prose
+            gzip_level: gzip compression level (1-9)
+            compressible_types: Content-type prefixes worth compressing
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.brotli_quality = brotli_quality
+        self.gzip_level = gzip_level
+        self.compressible_types = tuple(compressible_types)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = self._choose_encoding(scope["headers"])
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        passthrough = False
+        
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            
+            if passthrough:
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                # Hold the headers back until we know what the body looks like
+                start_message = message
+                return
+            
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            headers = list(start_message.get("headers", []))
+            body = message.get("body", b"")
+            
+            if message.get("more_body", False) or not self._should_compress(headers, body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            
+            body = self._compress(body, encoding)
+            headers = [(k, v) for k, v in headers if k != b"content-length"]
+            headers += [
+                (b"content-encoding", encoding),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            
+            passthrough = True
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    def _choose_encoding(self, headers: Headers):
+        """Pick br/gzip from the request's Accept-Encoding (None = don't compress)"""
+        for name, value in headers:
+            if name == b"accept-encoding":
+                accepted = {part.split(b";")[0].strip() for part in value.lower().split(b",")}
+                if BROTLI_AVAILABLE and b"br" in accepted:
+                    return b"br"
+                if b"gzip" in accepted:
+                    return b"gzip"
+                return None
+        return None
+    
+    def _should_compress(self, headers: Headers, body: bytes) -> bool:
+        if len(body) < self.minimum_size:
+            return False
+        
+        content_type = b""
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False  # already encoded
+            if name == b"content-type":
+                content_type = value
+        
+        return content_type.startswith(self.compressible_types)
+    
+    def _compress(self, body: bytes, encoding: bytes) -> bytes:
+        if encoding == b"br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
@@ -2,10 +2,13 @@
 Embedding and chunking utilities for RAG
 """
 import json
+import hashlib
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional, Tuple
 import logging
 
+import orjson
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -13,103 +16,183 @@ logger = logging.getLogger(__name__)
 class UseChaseChunker:
     """Create embeddings-friendly chunks from use cases"""
     
-    def __init__(self, use_cases_file: str = "data/processed/use_cases.json"):
+    # Bump when the chunk texts/metadata change, so cached chunk files are rebuilt
+    CHUNK_FORMAT = 1
+    
+    def __init__(
+        self,
+        use_cases_file: str = "data/processed/use_cases.json",
+        chunks_file: str = "data/processed/chunks.jsonl"
+    ):
         self.use_cases_file = Path(use_cases_file)
+        self.chunks_file = Path(chunks_file)
         self.chunks = []
+        self._source_hash = None
+        self._reused = False
+    
+    def create_chunks(self, use_cache: bool = True) -> List[Dict]:
+        """
+        Convert use cases into chunks optimized for retrieval
+        
+        Args:
+            use_cache: Reuse chunks_file if it was built from identical use cases
+        """
+        self._source_hash = self._hash_source()
+        
+        if use_cache and self._read_hash(self.chunks_file) == self._source_hash:
+            self.chunks = self.load_chunks(self.chunks_file)
+            self._reused = True
+            logger.info(f"♻️  Use cases unchanged, reusing {len(self.chunks)} chunks from {self.chunks_file}")
+            return self.chunks
+        
+        for batch in self.iter_chunks():
+            self.chunks.extend(batch)
+        
+        logger.info(f"Created {len(self.chunks)} chunks")
+        return self.chunks
+    
+    @staticmethod
+    def load_chunks(chunks_file: Path) -> List[Dict]:
+        """Read chunks written by save_chunks"""
+        with open(chunks_file, 'rb') as f:
+            return [orjson.loads(line) for line in f]
+    
+    def _hash_source(self) -> str:
+        digest = hashlib.sha256(self.use_cases_file.read_bytes())
+        digest.update(str(self.CHUNK_FORMAT).encode())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _hash_path(chunks_file: Path) -> Path:
+        return chunks_file.with_name(chunks_file.name + ".hash")
     
-    def create_chunks(self) -> List[Dict]:
-        """Convert use cases into chunks optimized for retrieval"""
+    def _read_hash(self, chunks_file: Path) -> Optional[str]:
+        hash_path = self._hash_path(chunks_file)
+        if not chunks_file.exists() or not hash_path.exists():
+            return None
+        return hash_path.read_text().strip()
+    
+    def iter_chunks(
+        self,
+        batch_size: int = 32,
+        use_cases: Optional[List[Dict]] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Yield chunks in batches instead of materializing them all
+        
+        Args:
+            batch_size: Number of chunks per batch
+            use_cases: Use cases to chunk (loaded from use_cases_file if None)
         
-        with open(self.use_cases_file, 'r', encoding='utf-8') as f:
-            use_cases = json.load(f)
+        Yields:
+            Lists of at most batch_size chunks
+        """
+        if use_cases is None:
+            with open(self.use_cases_file, 'r', encoding='utf-8') as f:
+                use_cases = json.load(f)
         
         logger.info(f"Creating chunks from {len(use_cases)} use cases")
         
+        batch = []
         for i, uc in enumerate(use_cases):
-            # Create multiple chunk variations for better retrieval
-            
-            # Chunk 1: Problem-focused
-            problem_chunk = {
-                'chunk_id': f"{i}_problem",
-                'chunk_type': 'problem',
-                'text': self._create_problem_text(uc),
-                'metadata': {
-                    'business_problem': uc['business_problem'],
-                    'data_type': uc['data_type'],
-                    'source': uc.get('source', ''),
-                    'url': uc.get('url', '')
-                }
-            }
-            self.chunks.append(problem_chunk)
-            
-            # Chunk 2: Solution-focused
-            solution_chunk = {
-                'chunk_id': f"{i}_solution",
-                'chunk_type': 'solution',
-                'text': self._create_solution_text(uc),
-                'metadata': {
-                    'recommended_tech': uc['recommended_tech'],
-                    'models': uc['models'],
-                    'reasoning': uc['reasoning'],
-                    'source': uc.get('source', ''),
-                    'url': uc.get('url', '')
-                }
+            for chunk in self._chunks_for(i, uc):
+                batch.append(chunk)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+        
+        if batch:
+            yield batch
+    
+    def _chunks_for(self, i: int, uc: Dict) -> Iterator[Dict]:
+        """Create multiple chunk variations of one use case for better retrieval"""
+        problem_text, solution_text, complete_text = self._build_texts(uc)
+        
+        # Chunk 1: Problem-focused
+        yield {
+            'chunk_id': f"{i}_problem",
+            'chunk_type': 'problem',
+            'text': problem_text,
+            'metadata': {
+                'business_problem': uc['business_problem'],
+                'data_type': uc['data_type'],
+                'source': uc.get('source', ''),
+                'url': uc.get('url', '')
             }
-            self.chunks.append(solution_chunk)
-            
-            # Chunk 3: Complete use case (for comprehensive context)
-            complete_chunk = {
-                'chunk_id': f"{i}_complete",
-                'chunk_type': 'complete',
-                'text': self._create_complete_text(uc),
-                'metadata': uc
+        }
+        
+        # Chunk 2: Solution-focused
+        yield {
+            'chunk_id': f"{i}_solution",
+            'chunk_type': 'solution',
+            'text': solution_text,
+            'metadata': {
+                'recommended_tech': uc['recommended_tech'],
+                'models': uc['models'],
+                'reasoning': uc['reasoning'],
+                'source': uc.get('source', ''),
+                'url': uc.get('url', '')
             }
-            self.chunks.append(complete_chunk)
+        }
         
-        logger.info(f"Created {len(self.chunks)} chunks")
-        return self.chunks
-    
-    def _create_problem_text(self, uc: Dict) -> str:
-        """Create problem-focused text for embedding"""
-        return f"""Business Problem: {uc['business_problem']}
-Data Type: {uc['data_type']}
-Context: This problem involves {uc['data_type']} data and requires AI/ML solutions."""
+        # Chunk 3: Complete use case (for comprehensive context)
+        yield {
+            'chunk_id': f"{i}_complete",
+            'chunk_type': 'complete',
+            'text': complete_text,
+            'metadata': uc
+        }
     
-    def _create_solution_text(self, uc: Dict) -> str:
-        """Create solution-focused text for embedding"""
+    def _build_texts(self, uc: Dict) -> Tuple[str, str, str]:
+        """Create the (problem, solution, complete) texts for embedding, sharing the joined lists"""
+        business_problem = uc['business_problem']
+        data_type = uc['data_type']
+        reasoning = uc['reasoning']
         tech_str = ', '.join(uc['recommended_tech'])
         models_str = ', '.join(uc['models']) if uc['models'] else 'Various models'
         
-        return f"""Recommended Technologies: {tech_str}
+        problem_text = f"""Business Problem: {business_problem}
+Data Type: {data_type}
+Context: This problem involves {data_type} data and requires AI/ML solutions."""
+        
+        solution_text = f"""Recommended Technologies: {tech_str}
 Specific Models/Approaches: {models_str}
-Reasoning: {uc['reasoning']}
-This solution is appropriate for problems involving {uc['data_type']} data."""
-    
-    def _create_complete_text(self, uc: Dict) -> str:
-        """Create complete use case text for embedding"""
-        tech_str = ', '.join(uc['recommended_tech'])
-        models_str = ', '.join(uc['models']) if uc['models'] else 'Various models'
+Reasoning: {reasoning}
+This solution is appropriate for problems involving {data_type} data."""
         
-        return f"""USE CASE: {uc['business_problem']}
+        complete_text = f"""USE CASE: {business_problem}
 
-DATA TYPE: {uc['data_type']}
+DATA TYPE: {data_type}
 
 RECOMMENDED AI/ML TECHNOLOGIES: {tech_str}
 
 SPECIFIC MODELS AND APPROACHES: {models_str}
 
-REASONING: {uc['reasoning']}
+REASONING: {reasoning}
 
-This is a proven approach for {uc['business_problem'].lower()} problems."""
+This is a proven approach for {business_problem.lower()} problems."""
+        
+        return problem_text, solution_text, complete_text
     
-    def save_chunks(self, output_file: str = "data/processed/chunks.jsonl"):
-        """Save chunks to file"""
-        output_path = Path(output_file)
+    def save_chunks(self, output_file: Optional[str] = None):
+        """Save chunks to file (chunks_file by default), with the hash of the use cases they came from"""
+        output_path = Path(output_file) if output_file else self.chunks_file
+        
+        if self._reused and output_path == self.chunks_file:
+            return  # already on disk
+        
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
+        # Invalidate the old hash first, so a crash mid-write never leaves it vouching for a partial file
+        hash_path = self._hash_path(output_path)
+        hash_path.unlink(missing_ok=True)
+        
+        with open(output_path, 'wb') as f:
             for chunk in self.chunks:
-                f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+                f.write(orjson.dumps(chunk) + b'\n')
+        
+        if self._source_hash:
+            hash_path.write_text(self._source_hash)
         
         logger.info(f"Saved {len(self.chunks)} chunks to {output_path}")
 
@@ -2,18 +2,37 @@
 Data processing and chunking system
 Converts raw scraped data into structured problem->solution mappings
 """
+import os
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
 import logging
 
+import orjson
+
+# Aho-Corasick is optional - falls back to one substring test per keyword
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sentences (a trailing one may lack end punctuation) and the words that mark one as reasoning.
+# Only the start is anchored so inflected forms ("benefits", "advantages") still count
+_SENT_RE = re.compile(r'[^.!?]+(?:[.!?]+|$)')
+_REASON_RE = re.compile(
+    r'\b(?:because|why|advantage|benefit|suitable|appropriate|effective|enables|allows)\w*',
+    re.IGNORECASE
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class AIUseCase:
     """Structured representation of an AI use case"""
     business_problem: str
@@ -27,7 +46,18 @@ class AIUseCase:
     additional_context: Optional[Dict] = None
     
     def to_dict(self):
-        return asdict(self)
+        # Plain literal - dataclasses.asdict deep-copies recursively, which the flat fields don't need
+        return {
+            'business_problem': self.business_problem,
+            'data_type': self.data_type,
+            'recommended_tech': self.recommended_tech,
+            'models': self.models,
+            'reasoning': self.reasoning,
+            'industry': self.industry,
+            'source': self.source,
+            'url': self.url,
+            'additional_context': self.additional_context
+        }
 
 
 class DataProcessor:
@@ -59,19 +89,115 @@ class DataProcessor:
         'unstructured': ['unstructured', 'raw', 'mixed']
     }
     
+    # Common models and architectures
+    MODEL_NAMES = [
+        'bert', 'gpt', 'transformer', 'resnet', 'vgg', 'yolo',
+        'lstm', 'gru', 'cnn', 'rnn', 'unet', 'gan', 'vae',
+        'xgboost', 'random forest', 'svm', 'decision tree',
+        'linear regression', 'logistic regression', 'k-means',
+        'dbscan', 'pca', 'autoencoder', 'attention'
+    ]
+    
+    # Section headings that describe a use case
+    USE_CASE_INDICATORS = [
+        'use case', 'solution', 'application', 'example', 
+        'scenario', 'problem', 'challenge', 'implementation'
+    ]
+    
     def __init__(self, raw_data_dir: str = "data/raw", output_dir: str = "data/processed"):
         self.raw_data_dir = Path(raw_data_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Every (category, label) owns one bit; a keyword maps to the OR of the
+        # bits it signals, so one scan of a text yields a single hits mask
+        self._keyword_masks, self._category_bits = self._build_keyword_masks()
+        self._category_masks = {
+            category: sum(bit for bit, _ in bits) for category, bits in self._category_bits.items()
+        }
+        
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, mask in self._keyword_masks.items():
+                self._automaton.add_word(keyword, mask)
+            self._automaton.make_automaton()
+    
+    @classmethod
+    def _build_keyword_masks(cls) -> Tuple[Dict[str, int], Dict[str, List[Tuple[int, str]]]]:
+        """Return (keyword -> bitmask, category -> [(bit, label)] in definition order)"""
+        masks: Dict[str, int] = {}
+        category_bits: Dict[str, List[Tuple[int, str]]] = {}
+        bit_of: Dict[Tuple[str, str], int] = {}
+        
+        def add(keyword: str, category: str, label: str):
+            bit = bit_of.get((category, label))
+            if bit is None:
+                bit = bit_of[(category, label)] = 1 << len(bit_of)
+                category_bits.setdefault(category, []).append((bit, label))
+            masks[keyword] = masks.get(keyword, 0) | bit
+        
+        for tech, keywords in cls.TECH_KEYWORDS.items():
+            for kw in keywords:
+                add(kw, 'tech', tech)
+        for data_type, keywords in cls.DATA_TYPE_KEYWORDS.items():
+            for kw in keywords:
+                add(kw, 'data_type', data_type)
+        for model in cls.MODEL_NAMES:
+            add(model, 'model', model.upper() if len(model) <= 4 else model.title())
+        for indicator in cls.USE_CASE_INDICATORS:
+            add(indicator, 'use_case', indicator)
+        for kw in ('ai', 'artificial intelligence'):
+            add(kw, 'ai', kw)
+        
+        return masks, category_bits
+    
+    def _keyword_hits(self, text_lower: str) -> int:
+        """Bitmask of every (category, label) whose keyword occurs (as a substring) in text_lower"""
+        hits = 0
+        if self._automaton is not None:
+            for _, mask in self._automaton.iter(text_lower):
+                hits |= mask
+        else:
+            for keyword, mask in self._keyword_masks.items():
+                if keyword in text_lower:
+                    hits |= mask
+        return hits
     
-    def process_all(self):
-        """Process all raw data files"""
+    def _labels(self, hits: int, category: str) -> List[str]:
+        """Labels of a category set in hits, in definition order"""
+        return [label for bit, label in self._category_bits[category] if hits & bit]
+    
+    def process_all(self, max_workers: Optional[int] = None, min_files_per_worker: int = 8):
+        """
+        Process all raw data files
+        
+        Args:
+            max_workers: Worker processes (default: one per CPU core)
+            min_files_per_worker: Below this many files per worker, process serially
+        """
         use_cases = []
         
+        paths = []
         for source_dir in self.raw_data_dir.iterdir():
-            if source_dir.is_dir():
+            if source_dir.is_dir() and not source_dir.name.startswith('.'):
                 logger.info(f"Processing source: {source_dir.name}")
-                use_cases.extend(self._process_source_dir(source_dir))
+                paths.extend(source_dir.glob("*.json"))
+                paths.extend(source_dir.glob("*.jsonl"))
+        
+        # Files are independent - spread keyword extraction over the cores
+        workers = min(max_workers or os.cpu_count() or 1, len(paths) // min_files_per_worker)
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(str(self.raw_data_dir), str(self.output_dir))
+            ) as executor:
+                for extracted in executor.map(_process_single_file, paths, chunksize=8):
+                    use_cases.extend(extracted)
+        else:
+            for file_path in paths:
+                use_cases.extend(self._process_file(file_path))
         
         # Save all use cases
         self._save_use_cases(use_cases)
@@ -79,23 +205,26 @@ class DataProcessor:
         logger.info(f"✅ Processed {len(use_cases)} use cases")
         return use_cases
     
-    def _process_source_dir(self, source_dir: Path) -> List[AIUseCase]:
-        """Process all files from a single source"""
-        use_cases = []
-        
-        for file_path in source_dir.glob("*.json"):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Extract use cases based on source type
-                extracted = self._extract_use_cases(data)
-                use_cases.extend(extracted)
-                
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-        
-        return use_cases
+    def _process_file(self, file_path: Path) -> List[AIUseCase]:
+        """Extract the use cases of one raw JSON/JSONL file (errors are logged, not raised)"""
+        try:
+            if file_path.suffix == '.jsonl':
+                # One scraped page per line
+                use_cases = []
+                with open(file_path, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            use_cases.extend(self._extract_use_cases(orjson.loads(line)))
+                return use_cases
+            
+            data = orjson.loads(file_path.read_bytes())
+            
+            # Extract use cases based on source type
+            return self._extract_use_cases(data)
+            
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            return []
     
     def _extract_use_cases(self, data: Dict) -> List[AIUseCase]:
         """Extract use cases from raw scraped data"""
@@ -137,13 +266,7 @@ class DataProcessor:
     
     def _is_use_case_section(self, heading: str, content: List[str]) -> bool:
         """Check if a section describes a use case"""
-        use_case_indicators = [
-            'use case', 'solution', 'application', 'example', 
-            'scenario', 'problem', 'challenge', 'implementation'
-        ]
-        
-        heading_lower = heading.lower()
-        return any(indicator in heading_lower for indicator in use_case_indicators)
+        return bool(self._keyword_hits(heading.lower()) & self._category_masks['use_case'])
     
     def _create_use_case(
         self, 
@@ -161,28 +284,23 @@ class DataProcessor:
         # Extract business problem (usually in heading or first paragraph)
         business_problem = heading if heading else content[0] if content else "Unknown problem"
         
-        # Identify data types
-        data_types = []
-        for data_type, keywords in self.DATA_TYPE_KEYWORDS.items():
-            if any(kw in text_lower for kw in keywords):
-                data_types.append(data_type)
+        # One keyword scan covers data types, technologies and models
+        hits = self._keyword_hits(text_lower)
         
+        # Identify data types
+        data_types = self._labels(hits, 'data_type')
         data_type = ', '.join(data_types) if data_types else 'unstructured'
         
         # Identify recommended technologies
-        recommended_tech = []
-        for tech, keywords in self.TECH_KEYWORDS.items():
-            if any(kw in text_lower for kw in keywords):
-                if tech not in recommended_tech:
-                    recommended_tech.append(tech)
+        recommended_tech = self._labels(hits, 'tech')
         
         if not recommended_tech:
             # Default to ML if AI is mentioned
-            if 'ai' in text_lower or 'artificial intelligence' in text_lower:
+            if hits & self._category_masks['ai']:
                 recommended_tech = ['ML']
         
         # Extract specific models/architectures
-        models = self._extract_models(full_text)
+        models = self._extract_models(full_text, hits)
         
         # Extract reasoning
         reasoning = self._extract_reasoning(content)
@@ -201,40 +319,26 @@ class DataProcessor:
         
         return None
     
-    def _extract_models(self, text: str) -> List[str]:
-        """Extract specific model names and architectures"""
-        models = []
-        text_lower = text.lower()
-        
-        # Common models and architectures
-        model_names = [
-            'bert', 'gpt', 'transformer', 'resnet', 'vgg', 'yolo',
-            'lstm', 'gru', 'cnn', 'rnn', 'unet', 'gan', 'vae',
-            'xgboost', 'random forest', 'svm', 'decision tree',
-            'linear regression', 'logistic regression', 'k-means',
-            'dbscan', 'pca', 'autoencoder', 'attention'
-        ]
-        
-        for model in model_names:
-            if model in text_lower:
-                models.append(model.upper() if len(model) <= 4 else model.title())
-        
-        return list(set(models))
+    def _extract_models(self, text: str, hits: Optional[int] = None) -> List[str]:
+        """Extract specific model names and architectures (hits: precomputed _keyword_hits of text)"""
+        if hits is None:
+            hits = self._keyword_hits(text.lower())
+        
+        return self._labels(hits, 'model')
     
     def _extract_reasoning(self, content: List[str]) -> str:
-        """Extract reasoning or explanation for why this approach works"""
-        reasoning_keywords = ['because', 'why', 'advantage', 'benefit', 'suitable', 
-                             'appropriate', 'effective', 'enables', 'allows']
-        
+        """Extract reasoning or explanation for why this approach works (first 3 matching sentences)"""
         reasoning_sentences = []
         
         for paragraph in content:
-            sentences = re.split(r'[.!?]+', paragraph)
-            for sentence in sentences:
-                if any(kw in sentence.lower() for kw in reasoning_keywords):
+            for match in _SENT_RE.finditer(paragraph):
+                sentence = match.group(0)
+                if _REASON_RE.search(sentence):
                     reasoning_sentences.append(sentence.strip())
+                    if len(reasoning_sentences) == 3:
+                        return ' '.join(reasoning_sentences)
         
-        return ' '.join(reasoning_sentences[:3]) if reasoning_sentences else "Appropriate for this use case"
+        return ' '.join(reasoning_sentences) if reasoning_sentences else "Appropriate for this use case"
     
     def _extract_from_patterns(
         self, 
@@ -290,6 +394,20 @@ class DataProcessor:
         logger.info(f"Saved JSONL format to {jsonl_file}")
 
 
+# Per-process DataProcessor for process_all's worker pool
+_worker_processor: Optional[DataProcessor] = None
+
+
+def _init_worker(raw_data_dir: str, output_dir: str):
+    global _worker_processor
+    _worker_processor = DataProcessor(raw_data_dir, output_dir)
+
+
+def _process_single_file(file_path: Path) -> List[AIUseCase]:
+    """Module-level (picklable) entry point for process_all's workers"""
+    return _worker_processor._process_file(file_path)
+
+
 def main():
     """Main entry point"""
     processor = DataProcessor()
@@ -1,27 +1,68 @@
 """
 API-specific scrapers for structured data sources
 """
+import re
+import asyncio
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from http_cache import HTTPCache
 
 logger = logging.getLogger(__name__)
 
+# Every markdown heading line and the text up to the next heading
+HEADING_SECTION_RE = re.compile(r'^(#[^\n]*)\n(.*?)(?=^#|\Z)', re.MULTILINE | re.DOTALL)
+
+# Model card heading keyword -> capability field
+CARD_SECTIONS = {
+    'description': 'description',
+    'intended uses': 'use_cases',
+    'limitations': 'limitations',
+    'training data': 'training_data'
+}
+
 
 class HuggingFaceScraper:
     """Scraper for Hugging Face model catalog"""
     
-    def __init__(self):
+    MAX_CONCURRENCY = 64
+    
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 50,
+        http_cache: Optional[HTTPCache] = None
+    ):
+        """
+        Initialize scraper
+        
+        Args:
+            pool_connections: Number of host pools to cache
+            pool_maxsize: Keep-alive connections kept per host
+            http_cache: ETag/Last-Modified cache for model cards (loaded from data/raw if None)
+        """
         self.base_url = "https://huggingface.co/api"
+        self.http_cache = http_cache or HTTPCache()
+        
+        # One pooled session so repeat calls skip the DNS/TCP/TLS handshake
+        self.session = requests.Session()
+        self.session.mount(
+            "https://huggingface.co",
+            HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        )
     
     def scrape_tasks(self) -> List[Dict]:
         """Get all tasks and their associated models"""
         tasks_url = f"{self.base_url}/tasks"
         
         try:
-            response = requests.get(tasks_url, timeout=30)
+            response = self.session.get(tasks_url, timeout=30)
             response.raise_for_status()
-            tasks_data = response.json()
+            tasks_data = orjson.loads(response.content)
             
             logger.info(f"Fetched {len(tasks_data)} tasks from Hugging Face")
             return tasks_data
@@ -40,9 +81,9 @@ class HuggingFaceScraper:
         }
         
         try:
-            response = requests.get(models_url, params=params, timeout=30)
+            response = self.session.get(models_url, params=params, timeout=30)
             response.raise_for_status()
-            models = response.json()
+            models = orjson.loads(response.content)
             
             logger.info(f"Fetched {len(models)} models for task: {task}")
             return models
@@ -51,51 +92,132 @@ class HuggingFaceScraper:
             logger.error(f"Error fetching models for {task}: {e}")
             return []
     
+    def scrape_models_bulk(
+        self,
+        tasks: List[str],
+        per_task: int = 20,
+        page_size: int = 1000,
+        max_pages: int = 3
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get top models for many tasks from one sweep of the most-downloaded models
+        
+        Args:
+            tasks: Task names (pipeline tags)
+            per_task: Models to keep per task
+            page_size: Models per API page
+            max_pages: Pages to sweep before falling back to per-task queries
+        
+        Returns:
+            Dict of task -> models, most downloaded first
+        """
+        models_by_task = {task: [] for task in tasks}
+        pending = set(tasks)
+        
+        url = f"{self.base_url}/models"
+        params = {'sort': 'downloads', 'limit': page_size}
+        
+        for _ in range(max_pages):
+            if not url or not pending:
+                break
+            
+            try:
+                response = self.session.get(url, params=params, timeout=30)
+                response.raise_for_status()
+                page = orjson.loads(response.content)
+            except Exception as e:
+                logger.error(f"Error fetching model page: {e}")
+                break
+            
+            for model in page:
+                task = model.get('pipeline_tag')
+                if task in pending:
+                    models_by_task[task].append(model)
+                    if len(models_by_task[task]) >= per_task:
+                        pending.discard(task)
+            
+            # Cursor pagination: the next page URL already carries the query
+            url = response.links.get('next', {}).get('url')
+            params = None
+        
+        # Long-tail tasks the sweep didn't fill get their own query
+        for task in pending:
+            models_by_task[task] = self.scrape_models_for_task(task, limit=per_task)
+        
+        logger.info(f"Fetched models for {len(tasks)} tasks ({len(pending)} needed a per-task query)")
+        return models_by_task
+    
     def extract_model_capabilities(self, model_id: str) -> Dict:
         """Extract detailed information about a model"""
-        model_url = f"https://huggingface.co/{model_id}"
+        return asyncio.run(self.extract_model_capabilities_many([model_id]))[0]
+    
+    async def extract_model_capabilities_many(
+        self,
+        model_ids: List[str],
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> List[Dict]:
+        """
+        Extract model card information for many models concurrently
         
-        try:
-            # Get model card
+        Args:
+            model_ids: Hugging Face model IDs
+            session: Shared aiohttp session (a pooled one is created if None)
+        
+        Returns:
+            One capability dict per model ID, in order ({} when the card couldn't be fetched)
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        timeout = aiohttp.ClientTimeout(total=30)
+        
+        async def extract(session: aiohttp.ClientSession, model_id: str) -> Dict:
             card_url = f"https://huggingface.co/{model_id}/raw/main/README.md"
-            response = requests.get(card_url, timeout=30)
             
-            if response.status_code == 200:
-                readme = response.text
-                
-                # Extract key sections
-                capability = {
-                    'model_id': model_id,
-                    'description': self._extract_section(readme, 'description'),
-                    'use_cases': self._extract_section(readme, 'intended uses'),
-                    'limitations': self._extract_section(readme, 'limitations'),
-                    'training_data': self._extract_section(readme, 'training data')
-                }
-                
-                return capability
+            try:
+                async with semaphore:
+                    headers = self.http_cache.conditional_headers(card_url)
+                    async with session.get(card_url, headers=headers, timeout=timeout) as response:
+                        readme = None
+                        if response.status == 304:
+                            readme = self.http_cache.load_body(card_url)
+                        elif response.status == 200:
+                            readme = await response.text()
+                            self.http_cache.store(card_url, response.headers, readme)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error extracting model capabilities for {model_id}: {e}")
+                return {}
             
-        except Exception as e:
-            logger.error(f"Error extracting model capabilities for {model_id}: {e}")
+            if readme is None:
+                return {}
+            
+            # Extract key sections
+            return {'model_id': model_id, **self._extract_card_sections(readme)}
         
-        return {}
+        if session is not None:
+            capabilities = await asyncio.gather(*[extract(session, m) for m in model_ids])
+        else:
+            connector = aiohttp.TCPConnector(limit_per_host=self.MAX_CONCURRENCY)
+            async with aiohttp.ClientSession(connector=connector) as own_session:
+                capabilities = await asyncio.gather(*[extract(own_session, m) for m in model_ids])
+        
+        self.http_cache.save()
+        logger.info(f"Extracted {sum(1 for c in capabilities if c)}/{len(model_ids)} model cards")
+        return list(capabilities)
     
-    def _extract_section(self, text: str, section_name: str) -> str:
-        """Extract content under a specific section heading"""
-        lines = text.split('\n')
-        section_content = []
-        in_section = False
-        
-        for line in lines:
-            if section_name.lower() in line.lower() and line.startswith('#'):
-                in_section = True
-                continue
-            
-            if in_section:
-                if line.startswith('#'):
-                    break
-                section_content.append(line)
+    def _extract_card_sections(self, text: str) -> Dict[str, str]:
+        """Extract all CARD_SECTIONS in one pass (first heading mentioning a keyword wins)"""
+        sections = {field: '' for field in CARD_SECTIONS.values()}
+        found = set()
+        
+        for match in HEADING_SECTION_RE.finditer(text):
+            heading = match.group(1).lower()
+            for keyword, field in CARD_SECTIONS.items():
+                if keyword in heading and field not in found:
+                    found.add(field)
+                    sections[field] = match.group(2).strip()
+            if len(found) == len(CARD_SECTIONS):
+                break
         
-        return '\n'.join(section_content).strip()
+        return sections
 
 
 class PapersWithCodeScraper:
@@ -2,14 +2,40 @@
 Base scraper interface and utilities
 """
 import time
-import json
-import requests
+import random
+import asyncio
+import aiohttp
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
 from bs4 import BeautifulSoup
-from pathlib import Path
 import logging
 
+from http_cache import HTTPCache
+
+# lxml's C parser is optional - falls back to the pure-Python html.parser
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Aho-Corasick is optional - falls back to one str.find per keyword
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Playwright is only needed for dynamic sources
+try:
+    from playwright.async_api import async_playwright, Browser
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    Browser = None
+    PLAYWRIGHT_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -17,62 +43,183 @@ logger = logging.getLogger(__name__)
 class BaseScraper(ABC):
     """Abstract base class for all scrapers"""
     
-    def __init__(self, config: Dict):
+    # Decorrelated-jitter backoff bounds (seconds) and the responses worth retrying
+    BACKOFF_BASE = 0.5
+    BACKOFF_CAP = 30.0
+    MAX_RETRY_AFTER = 120.0
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    # Pages past this size are mostly inlined JS/CSS we throw away
+    MAX_PAGE_BYTES = 2 * 1024 * 1024
+    
+    def __init__(
+        self,
+        config: Dict,
+        session: Optional[aiohttp.ClientSession] = None,
+        http_cache: Optional[HTTPCache] = None
+    ):
+        """
+        Initialize scraper
+        
+        Args:
+            config: Source config merged with the global scraping config
+            session: Shared aiohttp session (one connection pool for the whole run)
+            http_cache: Shared ETag/Last-Modified cache (loaded from data/raw if None)
+        """
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': config.get('scraping_config', {}).get(
-                'user_agent', 
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
-        })
+        self.session = session
+        self.http_cache = http_cache or HTTPCache()
+        self.user_agent = config.get('scraping_config', {}).get(
+            'user_agent', 
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        )
         self.timeout = config.get('scraping_config', {}).get('timeout', 30)
         self.retry_attempts = config.get('scraping_config', {}).get('retry_attempts', 3)
-        self.delay = config.get('scraping_config', {}).get('delay_between_requests', 2)
     
     @abstractmethod
-    def scrape(self, url: str) -> Dict:
+    async def scrape(self, url: str) -> Dict:
         """Scrape content from a URL"""
         pass
     
-    def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch HTML content with retry logic"""
+    async def fetch_page(self, url: str) -> Optional[str]:
+        """Fetch HTML content, retrying transient failures with jittered backoff"""
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        backoff = self.BACKOFF_BASE
+        
         for attempt in range(self.retry_attempts):
+            retry_after = None
             try:
                 logger.info(f"Fetching {url} (attempt {attempt + 1}/{self.retry_attempts})")
-                response = self.session.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                time.sleep(self.delay)
-                return response.text
-            except requests.RequestException as e:
+                headers = self.http_cache.conditional_headers(url)
+                async with self.session.get(url, timeout=timeout, headers=headers) as response:
+                    if response.status == 304:
+                        logger.info(f"Not modified, reusing cached body: {url}")
+                        return self.http_cache.load_body(url)
+                    
+                    if response.status in self.RETRY_STATUSES:
+                        retry_after = self._retry_after(response.headers)
+                        logger.warning(f"HTTP {response.status} from {url}")
+                    else:
+                        response.raise_for_status()
+                        html, truncated = await self._read_capped(response, url)
+                        # A truncated body must not be replayed on a later 304
+                        if html is not None and not truncated:
+                            self.http_cache.store(url, response.headers, html)
+                        return html
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                logger.warning(f"Transient error fetching {url}: {e!r}")
+            except aiohttp.ClientError as e:
                 logger.error(f"Error fetching {url}: {e}")
-                if attempt == self.retry_attempts - 1:
+                return None
+            
+            if attempt == self.retry_attempts - 1:
+                break
+            
+            # Decorrelated jitter: spreads retries out so workers don't hit a struggling host in lockstep
+            backoff = min(self.BACKOFF_CAP, random.uniform(self.BACKOFF_BASE, backoff * 3))
+            if retry_after is not None:
+                if retry_after > self.MAX_RETRY_AFTER:
+                    logger.error(f"Giving up on {url}: server asked to retry in {retry_after:.0f}s")
                     return None
-                time.sleep(self.delay * 2)
+                backoff = retry_after
+            await asyncio.sleep(backoff)
+        
+        logger.error(f"Giving up on {url} after {self.retry_attempts} attempts")
         return None
     
-    def save_raw_data(self, data: Dict, output_dir: Path):
-        """Save scraped data to JSON"""
-        output_dir.mkdir(parents=True, exist_ok=True)
-        filename = f"{data['source']}_{data['timestamp']}.json"
-        filepath = output_dir / filename
+    async def _read_capped(
+        self,
+        response: aiohttp.ClientResponse,
+        url: str
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Stream the body, skipping oversized pages and truncating at MAX_PAGE_BYTES
+        
+        Returns:
+            (body or None if skipped, whether the body was truncated)
+        """
+        if (response.content_length or 0) > self.MAX_PAGE_BYTES:
+            logger.warning(f"Skipping {url}: {response.content_length} bytes exceeds the page cap")
+            return None, False
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        chunks = []
+        total = 0
+        async for chunk in response.content.iter_chunked(65536):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total > self.MAX_PAGE_BYTES:
+                logger.warning(f"Truncating {url} at {self.MAX_PAGE_BYTES} bytes")
+                break
         
-        logger.info(f"Saved data to {filepath}")
+        truncated = total > self.MAX_PAGE_BYTES
+        body = b''.join(chunks)[:self.MAX_PAGE_BYTES]
+        try:
+            return body.decode(response.charset or 'utf-8', errors='replace'), truncated
+        except LookupError:  # unknown charset label
+            return body.decode('utf-8', errors='replace'), truncated
+    
+    @staticmethod
+    def _retry_after(headers) -> Optional[float]:
+        """Seconds to wait according to Retry-After / X-RateLimit-Reset (None if absent)"""
+        value = headers.get('Retry-After')
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        
+        value = headers.get('X-RateLimit-Reset')
+        if value:
+            try:
+                reset = float(value)
+            except ValueError:
+                return None
+            # Either an epoch timestamp or a delta in seconds
+            return max(0.0, reset - time.time()) if reset > 1e9 else reset
+        
+        return None
 
 
 class StaticScraper(BaseScraper):
     """Scraper for static HTML pages"""
     
-    def scrape(self, url: str) -> Dict:
+    def __init__(
+        self,
+        config: Dict,
+        session: Optional[aiohttp.ClientSession] = None,
+        http_cache: Optional[HTTPCache] = None
+    ):
+        super().__init__(config, session, http_cache)
+        
+        self._keyword_lookup: Dict[str, Dict[str, str]] = {
+            pattern_type: {keyword.lower(): keyword for keyword in keywords}
+            for pattern_type, keywords in config.get('extract_patterns', {}).items()
+        }
+        
+        # One automaton over every keyword of every pattern type
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE:
+            types_by_keyword: Dict[str, List[str]] = {}
+            for pattern_type, lookup in self._keyword_lookup.items():
+                for keyword in lookup:
+                    types_by_keyword.setdefault(keyword, []).append(pattern_type)
+            
+            if types_by_keyword:
+                self._automaton = ahocorasick.Automaton()
+                for keyword, pattern_types in types_by_keyword.items():
+                    self._automaton.add_word(keyword, (keyword, pattern_types))
+                self._automaton.make_automaton()
+    
+    async def scrape(self, url: str) -> Dict:
         """Scrape content from static HTML"""
-        html = self.fetch_page(url)
+        html = await self.fetch_page(url)
         if not html:
             return None
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, HTML_PARSER)
         
         # Extract based on source configuration
         data = {
@@ -123,67 +270,119 @@ class StaticScraper(BaseScraper):
             data['content']['sections'] = sections
         
         # Extract based on patterns
-        patterns = self.config.get('extract_patterns', {})
-        extracted_patterns = {}
-        
-        for pattern_type, keywords in patterns.items():
-            extracted_patterns[pattern_type] = []
-            text = soup.get_text().lower()
-            
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    # Find context around keyword
-                    idx = text.find(keyword.lower())
-                    context_start = max(0, idx - 200)
-                    context_end = min(len(text), idx + 200)
-                    context = text[context_start:context_end].strip()
-                    extracted_patterns[pattern_type].append({
-                        'keyword': keyword,
-                        'context': context
-                    })
-        
-        data['extracted_patterns'] = extracted_patterns
+        data['extracted_patterns'] = self._extract_patterns(soup.get_text().lower())
         
         return data
+    
+    def _extract_patterns(self, text: str) -> Dict[str, List[Dict]]:
+        """First hit of every pattern keyword in (lowercased) text, with context, in page order"""
+        first_hits: Dict[str, Dict[str, int]] = {pattern_type: {} for pattern_type in self._keyword_lookup}
+        
+        if self._automaton is not None:
+            remaining = sum(len(lookup) for lookup in self._keyword_lookup.values())
+            for end_idx, (keyword, pattern_types) in self._automaton.iter(text):
+                for pattern_type in pattern_types:
+                    if keyword not in first_hits[pattern_type]:
+                        first_hits[pattern_type][keyword] = end_idx - len(keyword) + 1
+                        remaining -= 1
+                if not remaining:
+                    break
+        else:
+            # One find per keyword: keywords sharing a prefix ("machine", "machine
+            # learning") can start at the same offset, which a single alternation misses
+            for pattern_type, lookup in self._keyword_lookup.items():
+                hits = first_hits[pattern_type]
+                for keyword in lookup:
+                    idx = text.find(keyword)
+                    if idx != -1:
+                        hits[keyword] = idx
+        
+        extracted_patterns = {}
+        for pattern_type, hits in first_hits.items():
+            lookup = self._keyword_lookup[pattern_type]
+            extracted_patterns[pattern_type] = [
+                {
+                    'keyword': lookup[keyword],
+                    # Context around keyword
+                    'context': text[max(0, idx - 200):idx + 200].strip()
+                }
+                for keyword, idx in sorted(hits.items(), key=lambda hit: hit[1])
+            ]
+        
+        return extracted_patterns
 
 
 class DynamicScraper(BaseScraper):
     """Scraper for dynamic JavaScript-heavy pages using Playwright"""
     
-    def __init__(self, config: Dict):
-        super().__init__(config)
+    CONTENT_WAIT_MS = 5000
+    IDLE_WAIT_MS = 500
+    
+    def __init__(
+        self,
+        config: Dict,
+        session: Optional[aiohttp.ClientSession] = None,
+        http_cache: Optional[HTTPCache] = None,
+        browser: Optional["Browser"] = None
+    ):
+        """
+        Initialize scraper
+        
+        Args:
+            config: Source config merged with the global scraping config
+            session: Shared aiohttp session
+            http_cache: Shared ETag/Last-Modified cache
+            browser: Shared Playwright browser (setup() launches a private one if None)
+        """
+        super().__init__(config, session, http_cache)
         self.playwright = None
-        self.browser = None
+        self.browser = browser
+        self._owns_browser = browser is None
+        self.context = None
     
     async def setup(self):
-        """Initialize Playwright browser"""
-        from playwright.async_api import async_playwright
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=True
-        )
+        """Open the context shared by all pages of this source (launching a browser if needed)"""
+        if not PLAYWRIGHT_AVAILABLE:
+            raise ImportError("playwright is required for dynamic sources")
+        
+        if self.browser is None:
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(
+                headless=True
+            )
+        self.context = await self.browser.new_context(user_agent=self.user_agent)
     
     async def teardown(self):
-        """Close browser and Playwright"""
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        """Close the context, and the browser/Playwright if this scraper launched them"""
+        if self.context:
+            await self.context.close()
+        if self._owns_browser:
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
     
     async def scrape(self, url: str) -> Dict:
         """Scrape content from dynamic page"""
-        page = await self.browser.new_page()
+        page = await self.context.new_page()
+        selectors = self.config.get('selectors', {})
         
         try:
             logger.info(f"Loading dynamic page: {url}")
             await page.goto(url, wait_until='networkidle', timeout=self.timeout * 1000)
             
-            # Wait for content to load
-            await page.wait_for_timeout(3000)
+            # Wait for content to render - returns as soon as it's there
+            try:
+                await page.wait_for_selector(
+                    selectors.get('content', 'section, article, div.content'),
+                    timeout=self.CONTENT_WAIT_MS
+                )
+            except PlaywrightTimeoutError:
+                await page.wait_for_timeout(self.IDLE_WAIT_MS)
             
             # Get page content
             html = await page.content()
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, HTML_PARSER)
             
             data = {
                 'url': url,
@@ -193,9 +392,6 @@ class DynamicScraper(BaseScraper):
                 'content': {}
             }
             
-            # Extract using configured selectors
-            selectors = self.config.get('selectors', {})
-            
             # Title
             title_selector = selectors.get('title', 'h1')
             title_elem = soup.select_one(title_selector)
@@ -220,14 +416,18 @@ class DynamicScraper(BaseScraper):
             await page.close()
 
 
-def create_scraper(source_config: Dict) -> BaseScraper:
+def create_scraper(
+    source_config: Dict,
+    session: Optional[aiohttp.ClientSession] = None,
+    http_cache: Optional[HTTPCache] = None
+) -> BaseScraper:
     """Factory function to create appropriate scraper"""
     strategy = source_config.get('scraping_strategy', 'static')
     
     if strategy == 'static':
-        return StaticScraper(source_config)
+        return StaticScraper(source_config, session, http_cache)
     elif strategy == 'dynamic':
-        return DynamicScraper(source_config)
+        return DynamicScraper(source_config, session, http_cache)
     elif strategy == 'api':
         # Will implement API scraper separately
         raise NotImplementedError("API scraper not yet implemented")
@@ -0,0 +1,90 @@
+"""
+On-disk validator cache for conditional GETs
+Remembers each URL's ETag / Last-Modified and the body that came with it, so
+repeat scrapes can send If-None-Match / If-Modified-Since and reuse the stored
+body on a 304 Not Modified
+"""
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPCache:
+    """URL -> {etag, last_modified, body_path} index persisted as JSON"""
+    
+    def __init__(self, index_file: str = "data/raw/.http_cache.json"):
+        """
+        Initialize cache
+        
+        Args:
+            index_file: JSON index path; bodies live in a sibling directory
+        """
+        self.index_file = Path(index_file)
+        self.body_dir = self.index_file.with_suffix('')
+        self.index: Dict[str, Dict] = {}
+        self._dirty = False
+        
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load HTTP cache index {self.index_file}: {e}")
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers for url (empty when there is no usable cached body)"""
+        entry = self.index.get(url)
+        if not entry or not Path(entry['body_path']).exists():
+            return {}
+        
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def load_body(self, url: str) -> Optional[str]:
+        """Cached body for url (after a 304), or None if it is gone"""
+        entry = self.index.get(url)
+        if not entry:
+            return None
+        try:
+            return Path(entry['body_path']).read_text(encoding='utf-8')
+        except OSError:
+            return None
+    
+    def store(self, url: str, headers: Mapping[str, str], body: str):
+        """Remember a 200 response body and its validators"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return  # nothing to revalidate with
+        
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        body_path = self.body_dir / hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+        body_path.write_text(body, encoding='utf-8')
+        
+        self.index[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'body_path': str(body_path)
+        }
+        self._dirty = True
+    
+    def save(self):
+        """Atomically write the index if it changed"""
+        if not self._dirty:
+            return
+        
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_file.with_name(self.index_file.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_file)
+        self._dirty = False
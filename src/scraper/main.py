@@ -1,92 +1,206 @@
 """
 Main scraping orchestrator
 """
-import json
 import asyncio
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import logging
 
-from base_scraper import create_scraper, StaticScraper, DynamicScraper
+import aiohttp
+import orjson
+
+from base_scraper import create_scraper, StaticScraper, DynamicScraper, BaseScraper, PLAYWRIGHT_AVAILABLE
+from http_cache import HTTPCache
+
+if PLAYWRIGHT_AVAILABLE:
+    from playwright.async_api import async_playwright
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL for deduplication (lowercase scheme/host, sorted query, no fragment)"""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
 class ScraperOrchestrator:
     """Orchestrates scraping across multiple sources"""
     
+    MAX_CONCURRENCY = 64
+    MAX_BROWSER_PAGES = 8
+    PAGES_FILE = "pages.jsonl"
+    
     def __init__(self, config_path: str = "configs/sources.json"):
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+        self.config = orjson.loads(Path(config_path).read_bytes())
         
         self.output_dir = Path("data/raw")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.http_cache = HTTPCache(str(self.output_dir / ".http_cache.json"))
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.page_semaphore: Optional[asyncio.Semaphore] = None
+        self.write_queue: Optional[asyncio.Queue] = None
+        self.playwright = None
+        self.browser = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        
+        # Canonical URL -> in-flight/finished scrape, shared by sources that list the same page
+        self._url_cache: Dict[str, asyncio.Future] = {}
+    
+    async def __aenter__(self):
+        """Open the shared HTTP session (the browser is launched on first use)"""
+        scraping_config = self.config.get('scraping_config', {})
+        connector = aiohttp.TCPConnector(limit_per_host=self.MAX_CONCURRENCY, keepalive_timeout=75)
+        headers = {'User-Agent': scraping_config.get(
+            'user_agent',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        )}
+        
+        self.session = aiohttp.ClientSession(connector=connector, headers=headers)
+        self.semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        self.page_semaphore = asyncio.Semaphore(self.MAX_BROWSER_PAGES)
+        self._browser_lock = asyncio.Lock()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        """Close the browser and the HTTP session, and persist the HTTP cache"""
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        await self.session.close()
+        
+        self.browser = self.playwright = self.session = None
+        self.http_cache.save()
+    
+    async def _get_browser(self):
+        """One Chromium for every dynamic source of the run"""
+        async with self._browser_lock:
+            if self.browser is None:
+                if not PLAYWRIGHT_AVAILABLE:
+                    raise ImportError("playwright is required for dynamic sources")
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=True)
+            return self.browser
     
     def scrape_priority_sources(self):
         """Scrape only priority sources (minimal set)"""
         priority_sources = self.config['priority_sources']
         logger.info(f"Scraping {len(priority_sources)} priority sources")
         
-        for source_config in priority_sources:
-            self._scrape_source(source_config)
+        asyncio.run(self._scrape_sources(priority_sources))
     
     def scrape_all_sources(self):
         """Scrape all sources (priority + extended)"""
         all_sources = self.config['priority_sources'] + self.config['extended_sources']
         logger.info(f"Scraping {len(all_sources)} total sources")
         
-        for source_config in all_sources:
-            self._scrape_source(source_config)
+        asyncio.run(self._scrape_sources(all_sources))
+    
+    async def _scrape_sources(self, sources: List[Dict]):
+        """Scrape all URLs of all sources concurrently over one shared session"""
+        self.write_queue = asyncio.Queue()
+        writer = asyncio.create_task(self._writer())
+        
+        try:
+            async with self:
+                tasks = []
+                for source_config in sources:
+                    strategy = source_config.get('scraping_strategy', 'static')
+                    logger.info(f"Queued: {source_config['name']} ({strategy})")
+                    
+                    if strategy == 'static':
+                        scraper = StaticScraper({**source_config, **self.config}, self.session, self.http_cache)
+                        tasks += [self._scrape_static(scraper, source_config, url) for url in source_config.get('urls', [])]
+                    elif strategy == 'dynamic':
+                        tasks.append(self._scrape_dynamic(source_config))
+                    elif strategy == 'api':
+                        tasks.append(self._scrape_api(source_config))
+                
+                await asyncio.gather(*tasks)
+        finally:
+            await self.write_queue.put(None)
+            await writer
+    
+    async def _writer(self):
+        """Single consumer of write_queue: appends each page to its source's pages.jsonl"""
+        files = {}
+        try:
+            while (item := await self.write_queue.get()) is not None:
+                source_name, data = item
+                f = files.get(source_name)
+                if f is None:
+                    source_dir = self.output_dir / source_name.replace(' ', '_')
+                    source_dir.mkdir(parents=True, exist_ok=True)
+                    f = files[source_name] = open(source_dir / self.PAGES_FILE, 'ab')
+                f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + b'\n')
+        finally:
+            for f in files.values():
+                f.close()
+        
+        logger.info(f"Saved pages for {len(files)} sources")
+    
+    async def _scrape_static(self, scraper: StaticScraper, source_config: Dict, url: str):
+        """Scrape one static page"""
+        try:
+            data = await self._scrape_once(scraper, url, self.semaphore)
+            if data:
+                await self._save(source_config, data)
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}")
     
-    def _scrape_source(self, source_config: Dict):
-        """Scrape a single source"""
-        source_name = source_config['name']
-        logger.info(f"\n{'='*60}\nScraping: {source_name}\n{'='*60}")
+    async def _scrape_once(self, scraper: BaseScraper, url: str, semaphore: asyncio.Semaphore) -> Optional[Dict]:
+        """Scrape url unless another source already did (or is doing) so"""
+        key = canonicalize_url(url)
+        future = self._url_cache.get(key)
         
-        strategy = source_config.get('scraping_strategy', 'static')
+        if future is None:
+            async def bounded_scrape():
+                async with semaphore:
+                    return await scraper.scrape(url)
+            
+            future = self._url_cache[key] = asyncio.ensure_future(bounded_scrape())
+        else:
+            logger.info(f"Reusing scrape of {url}")
+        
+        return await asyncio.shield(future)
+    
+    async def _save(self, source_config: Dict, data: Dict):
+        """Queue a page for the writer, attributed to source_config's source"""
+        data = {**data, 'source': source_config.get('name', 'unknown'), 'category': source_config.get('category', 'general')}
+        await self.write_queue.put((source_config['name'], data))
+    
+    async def _scrape_dynamic(self, source_config: Dict):
+        """Scrape dynamic pages, several open pages at a time"""
+        try:
+            browser = await self._get_browser()
+        except Exception as e:
+            logger.error(f"Could not start browser for {source_config['name']}: {e}")
+            return
         
-        if strategy == 'static':
-            self._scrape_static(source_config)
-        elif strategy == 'dynamic':
-            asyncio.run(self._scrape_dynamic(source_config))
-        elif strategy == 'api':
-            self._scrape_api(source_config)
-    
-    def _scrape_static(self, source_config: Dict):
-        """Scrape static pages"""
-        scraper = StaticScraper({**source_config, **self.config})
-        urls = source_config.get('urls', [])
+        scraper = DynamicScraper({**source_config, **self.config}, self.session, self.http_cache, browser=browser)
+        await scraper.setup()
         
-        for url in urls:
+        async def scrape_url(url: str):
             try:
-                data = scraper.scrape(url)
+                data = await self._scrape_once(scraper, url, self.page_semaphore)
                 if data:
-                    scraper.save_raw_data(data, self.output_dir / source_config['name'].replace(' ', '_'))
+                    await self._save(source_config, data)
             except Exception as e:
                 logger.error(f"Error scraping {url}: {e}")
-    
-    async def _scrape_dynamic(self, source_config: Dict):
-        """Scrape dynamic pages"""
-        scraper = DynamicScraper({**source_config, **self.config})
-        await scraper.setup()
         
         try:
-            urls = source_config.get('urls', [])
-            for url in urls:
-                try:
-                    data = await scraper.scrape(url)
-                    if data:
-                        scraper.save_raw_data(data, self.output_dir / source_config['name'].replace(' ', '_'))
-                except Exception as e:
-                    logger.error(f"Error scraping {url}: {e}")
+            await asyncio.gather(*[scrape_url(url) for url in source_config.get('urls', [])])
         finally:
             await scraper.teardown()
     
-    def _scrape_api(self, source_config: Dict):
-        """Scrape via API (e.g., Hugging Face)"""
-        import requests
-        
+    async def _scrape_api(self, source_config: Dict):
+        """Scrape via API (e.g., Hugging Face) on the shared session"""
         api_endpoint = source_config.get('api_endpoint')
         if not api_endpoint:
             logger.warning(f"No API endpoint configured for {source_config['name']}")
@@ -94,20 +208,21 @@ class ScraperOrchestrator:
         
         try:
             logger.info(f"Fetching from API: {api_endpoint}")
-            response = requests.get(api_endpoint, timeout=30)
-            response.raise_for_status()
+            async with self.semaphore:
+                async with self.session.get(api_endpoint, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    response.raise_for_status()
+                    api_response = orjson.loads(await response.read())
             
             data = {
                 'source': source_config['name'],
                 'category': source_config['category'],
-                'api_response': response.json()
+                'api_response': api_response
             }
             
             output_file = self.output_dir / source_config['name'].replace(' ', '_') / 'api_data.json'
             output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            output_file.write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
             
             logger.info(f"Saved API data to {output_file}")
             
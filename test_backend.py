@@ -3,7 +3,7 @@ Test script to verify the backend API is working correctly
 """
 
 import requests
-import json
+import orjson
 
 def test_health():
     """Test if the server is running"""
@@ -15,7 +15,7 @@ def test_health():
         response = requests.get("http://localhost:8000/")
         print(f"✓ Server is running")
         print(f"  Status: {response.status_code}")
-        data = response.json()
+        data = orjson.loads(response.content)
         print(f"  Components:")
         for key, value in data.get("components", {}).items():
             status = "✓" if value else "✗"
@@ -56,7 +56,7 @@ def test_consultation():
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             print(f"\n✓ Success!")
             print(f"\nRecommendations Preview:")
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("bs4")
+
+from base_scraper import StaticScraper
+
+
+def test_extract_patterns_reports_keywords_sharing_a_prefix():
+    config = {'extract_patterns': {'technologies': ['Machine Learning', 'Machine']}}
+    scraper = StaticScraper(config, session=None, http_cache=object())
+    
+    patterns = scraper._extract_patterns("we use machine learning")
+    
+    assert {hit['keyword'] for hit in patterns['technologies']} == {'Machine Learning', 'Machine'}
+
+
+class _FakeContent:
+    def __init__(self, body):
+        self.body = body
+    
+    async def iter_chunked(self, size):
+        for start in range(0, len(self.body), size):
+            yield self.body[start:start + size]
+
+
+class _FakeResponse:
+    charset = 'utf-8'
+    content_length = None
+    
+    def __init__(self, body):
+        self.content = _FakeContent(body)
+
+
+def test_read_capped_reports_truncation():
+    scraper = StaticScraper({}, session=None, http_cache=object())
+    cap = scraper.MAX_PAGE_BYTES
+    
+    html, truncated = asyncio.run(scraper._read_capped(_FakeResponse(b'x' * cap), 'u'))
+    assert len(html) == cap and not truncated
+    
+    html, truncated = asyncio.run(scraper._read_capped(_FakeResponse(b'x' * (cap + 1)), 'u'))
+    assert len(html) == cap and truncated
@@ -0,0 +1,33 @@
+"""
+Tests for DataProcessor text extraction
+"""
+from processor.data_processor import DataProcessor
+
+
+def make_processor(tmp_path):
+    return DataProcessor(raw_data_dir=str(tmp_path / "raw"), output_dir=str(tmp_path / "processed"))
+
+
+def test_reasoning_matches_inflected_keywords(tmp_path):
+    processor = make_processor(tmp_path)
+    content = ['Key benefits include lower cost. Its advantages are clear! This is suitable for text. Nothing here']
+    
+    assert processor._extract_reasoning(content) == (
+        'Key benefits include lower cost. Its advantages are clear! This is suitable for text.'
+    )
+
+
+def test_reasoning_ignores_keyword_inside_other_words(tmp_path):
+    processor = make_processor(tmp_path)
+    
+    # 'benefit' and 'allows' appear only inside longer words
+    content = ['It is nonbeneficial. It disallows caching.']
+    
+    assert processor._extract_reasoning(content) == "Appropriate for this use case"
+
+
+def test_reasoning_keeps_first_three_sentences(tmp_path):
+    processor = make_processor(tmp_path)
+    content = ['Fast because cached. Cheap because shared.', 'Safe because sandboxed. Simple because small.']
+    
+    assert processor._extract_reasoning(content) == 'Fast because cached. Cheap because shared. Safe because sandboxed.'
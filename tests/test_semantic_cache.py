@@ -0,0 +1,68 @@
+"""
+Tests for the semantic response cache
+"""
+import threading
+
+import numpy as np
+
+from cache.semantic_cache import SemanticCache
+
+
+def unit(seed: int, dim: int = 32) -> np.ndarray:
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_set_defers_disk_write_until_save(tmp_path):
+    cache = SemanticCache(persist_directory=str(tmp_path), save_delay=3600)
+    cache.set(unit(0), "answer")
+    
+    assert not (tmp_path / SemanticCache.ENTRIES_FILE).exists()
+    
+    cache.save()
+    assert (tmp_path / SemanticCache.ENTRIES_FILE).exists()
+    
+    reloaded = SemanticCache(persist_directory=str(tmp_path))
+    assert reloaded.get(unit(0)) == "answer"
+
+
+def test_concurrent_set_and_get(tmp_path):
+    cache = SemanticCache(max_entries=50, persist_directory=str(tmp_path), save_delay=0.01)
+    errors = []
+    
+    def worker(offset: int):
+        try:
+            for i in range(100):
+                cache.set(unit(offset * 1000 + i), i)
+                cache.get(unit(offset * 1000 + i))
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    cache.save()
+    
+    assert not errors
+    assert len(cache) == 50
+
+
+def test_save_from_two_processes_leaves_one_consistent_cache(tmp_path):
+    # Two workers persisting to the same directory: the last save wins whole
+    first = SemanticCache(persist_directory=str(tmp_path), save_delay=3600)
+    second = SemanticCache(persist_directory=str(tmp_path), save_delay=3600)
+    for i in range(5):
+        first.set(unit(i), f"first {i}")
+    for i in range(3):
+        second.set(unit(100 + i), f"second {i}")
+    
+    first.save()
+    second.save()
+    
+    reloaded = SemanticCache(persist_directory=str(tmp_path))
+    assert len(reloaded) == 3
+    assert reloaded.get(unit(101)) == "second 1"
+    assert reloaded.get(unit(1)) is None
+    assert [p.name for p in tmp_path.iterdir()] == [SemanticCache.ENTRIES_FILE]